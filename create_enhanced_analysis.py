@@ -1,21 +1,50 @@
+import argparse
 import pandas as pd
 import numpy as np
 from pathlib import Path
 import os
 from scipy import stats
+from src.analysis.defense_scoring import score_defenses, score_segments
+from src.utils.data_cache import load_breach_data
+from src.utils.excel_writer import SheetStages, numeric_column_formats, write_frame_sheet
+from src.utils.instrumentation import stage, write_timing_report
+from src.utils.low_memory import compact_frame, low_memory_default, release_memory
+from src.utils.profiling import PROFILE_MODES, enable_profiling, profile_mode_default
+from src.utils.parallel_aggregation import AGGREGATION_ENGINES, create_aggregation_cache
+from src.utils.resampling import permutation_anova, resampling_options, subsample_note
+from src.utils.schema import CATEGORICAL_COLUMNS
 
-def create_enhanced_analysis():
+def create_enhanced_analysis(rebuildCache=False, constantMemory=False, engine=None, profile=None, lowMemory=False, resamples=None,
+                             maxGroupDraws=None):
+    # --profile ile her aşama cProfile veya örnekleyici ile profillenir, çıktılar data/profiles altına yazılır
+    enable_profiling(Path('data') / 'profiles' / 'enhanced_analysis', profile)
     # camelCase değişken adları kullanımına dikkat edelim
     dataPath = Path('data/RAW-cybersecurity_breach_data.csv')
     outputPath = 'data/enhanced_analysis_report.xlsx'
     
-    # Veri setini yükle
-    df = pd.read_csv(dataPath)
+    # Veri setini yükle (Ham Veri sayfası tüm sütunları içerdiğinden sütun seçimi yapılmaz)
+    with stage('load', 'pipeline'):
+        df = load_breach_data(dataPath, rebuildCache=rebuildCache)
     print(f"Loaded data with {len(df)} records from {dataPath}")
+    # Düşük bellek profili: sayısal sütunlar küçültülür, metinler kategoriye çevrilir, satırlar diske akıtılır
+    if lowMemory:
+        df = compact_frame(df)
+        constantMemory = True
+    # DATAFRAME_ENGINE veya --engine ile gruplama, describe ve korelasyon polars/duckdb üzerinde çalışır, --engine cube özetleri küpten yanıtlar
+    aggregates = create_aggregation_cache(df, engine=engine)
+    # Bootstrap güven aralıkları ve permütasyon testi isteğe bağlıdır (--resamples veya RESAMPLE_COUNT, varsayılan kapalı)
+    # RESAMPLE_SEED ve RESAMPLE_WORKERS ile tohum ve süreç sayısı ayarlanır
+    # Büyük gruplar en fazla --max-group-draws (RESAMPLE_MAX_GROUP_DRAWS) çekilişle örneklenir, bu durumda tabloların altına not düşülür
+    resampling = resampling_options(resamples, maxGroupDraws)
+    bootstrapping = resampling['resamples'] > 0
     
     # Excel dosyasını oluştur
-    writer = pd.ExcelWriter(outputPath, engine='xlsxwriter')
+    # constant_memory: satırlar sırayla diske yazılır, bellek kullanımı sabit kalır
+    writer = pd.ExcelWriter(outputPath, engine='xlsxwriter', engine_kwargs={'options': {'constant_memory': constantMemory}})
     workbook = writer.book
+    # Her sayfanın süresi, CPU zamanı ve bellek kullanımı ayrı ölçülür
+    # Düşük bellek profilinde her sayfadan sonra önbellekteki ara sonuçlar serbest bırakılır
+    sheetStages = SheetStages(workbook, (lambda: release_memory(aggregates)) if lowMemory else None)
     
     # Formatları tanımla
     headerFormat = workbook.add_format({
@@ -34,25 +63,9 @@ def create_enhanced_analysis():
     })
     
     # 1. RAW DATA - Ham veriyi dahil et
-    rawDataSheet = workbook.add_worksheet('Raw Data')
-    
-    # Başlıkları yaz
-    for col_idx, col_name in enumerate(df.columns):
-        rawDataSheet.write(0, col_idx, col_name, headerFormat)
-    
-    # Verileri yaz
-    for row_idx, row in df.iterrows():
-        for col_idx, value in enumerate(row):
-            if isinstance(value, (int, float)) and col_idx == df.columns.get_loc('Financial Loss (in Million $)'):
-                rawDataSheet.write(row_idx + 1, col_idx, value, currencyFormat)
-            elif isinstance(value, (int, float)):
-                rawDataSheet.write(row_idx + 1, col_idx, value, numberFormat)
-            else:
-                rawDataSheet.write(row_idx + 1, col_idx, value)
-    
-    # Sütun genişliklerini ayarla
-    for i, col in enumerate(df.columns):
-        rawDataSheet.set_column(i, i, 18)
+    # Sütun formatları set_column ile bir kez atanır, veriler satır satır toplu yazılır
+    rawFormats = numeric_column_formats(df, numberFormat, currencyFormat, ['Financial Loss (in Million $)'])
+    write_frame_sheet(workbook, 'Raw Data', df, headerFormat, rawFormats, columnWidth=18)
     
     # 2. SUMMARY STATISTICS - Özet İstatistikler
     statsSheet = workbook.add_worksheet('Summary Statistics')
@@ -66,7 +79,7 @@ def create_enhanced_analysis():
     
     # İstatistikleri hesapla ve yaz
     statMetrics = ['count', 'mean', 'std', 'min', '25%', '50%', '75%', 'max']
-    numericStats = df[numericCols].describe().T
+    numericStats = aggregates.describe(numericCols)
     
     for row_idx, metric in enumerate(statMetrics):
         statsSheet.write(row_idx + 1, 0, metric)
@@ -106,6 +119,8 @@ def create_enhanced_analysis():
     
     # Sektöre göre detaylı finansal istatistikler
     finColumns = ['Industry', 'Mean Loss', 'Median Loss', 'Std Dev', 'Min Loss', 'Max Loss', 'Total Loss', 'Count']
+    if bootstrapping:
+        finColumns += ['Mean Loss CI Lower', 'Mean Loss CI Upper']
     
     # Başlıkları yaz
     for col_idx, header in enumerate(finColumns):
@@ -114,113 +129,171 @@ def create_enhanced_analysis():
     # Grup istatistiklerini hesapla
     industries = df['Target Industry Standardized'].unique()
     
+    # Tüm sektör istatistikleri tek geçişte hesaplanır
+    finStats = aggregates.stats('Target Industry Standardized', 'Financial Loss (in Million $)').table
+    industryCounts = aggregates.groupby('Target Industry Standardized')
+    if bootstrapping:
+        finIntervals = aggregates.bootstrap_means('Target Industry Standardized', 'Financial Loss (in Million $)', **resampling)
+    
     for row_idx, industry in enumerate(industries):
-        industryData = df[df['Target Industry Standardized'] == industry]['Financial Loss (in Million $)']
-        
         finSheet.write(row_idx + 1, 0, industry)
-        finSheet.write(row_idx + 1, 1, industryData.mean(), currencyFormat)
-        finSheet.write(row_idx + 1, 2, industryData.median(), currencyFormat)
-        finSheet.write(row_idx + 1, 3, industryData.std(), currencyFormat)
-        finSheet.write(row_idx + 1, 4, industryData.min(), currencyFormat)
-        finSheet.write(row_idx + 1, 5, industryData.max(), currencyFormat)
-        finSheet.write(row_idx + 1, 6, industryData.sum(), currencyFormat)
-        finSheet.write(row_idx + 1, 7, len(industryData), numberFormat)
+        for col_idx, agg in enumerate(['mean', 'median', 'std', 'min', 'max', 'sum']):
+            finSheet.write(row_idx + 1, col_idx + 1, finStats.loc[industry, agg], currencyFormat)
+        finSheet.write(row_idx + 1, 7, industryCounts[industry], numberFormat)
+        if bootstrapping:
+            finSheet.write(row_idx + 1, 8, finIntervals.loc[industry, 'ci_lower'], currencyFormat)
+            finSheet.write(row_idx + 1, 9, finIntervals.loc[industry, 'ci_upper'], currencyFormat)
+    
+    # Örneklem sınırı uygulandıysa aralıkların yaklaşık olduğunu belirt
+    if bootstrapping and subsample_note(finIntervals['draws'], finIntervals['count']):
+        finSheet.write(len(industries) + 2, 0, subsample_note(finIntervals['draws'], finIntervals['count']))
     
     # Sütun genişliklerini ayarla
     finSheet.set_column(0, 0, 25)
-    finSheet.set_column(1, 7, 15)
+    finSheet.set_column(1, 9, 15)
     
     # 5. ATTACK ANALYSIS - Saldırı Analizi
     attackSheet = workbook.add_worksheet('Attack Analysis')
     
     # Saldırı türüne göre istatistikler
     attackColumns = ['Attack Type', 'Avg Loss', 'Total Loss', 'Avg Resolution Time', 'Count', '% of Total']
+    if bootstrapping:
+        attackColumns += ['Avg Loss CI Lower', 'Avg Loss CI Upper', 'Avg Resolution CI Lower', 'Avg Resolution CI Upper']
     
     # Başlıkları yaz
     for col_idx, header in enumerate(attackColumns):
         attackSheet.write(0, col_idx, header, headerFormat)
     
     # Grup istatistiklerini hesapla
-    attackTypes = df['Attack Type'].value_counts().index.tolist()
+    attackCounts = aggregates.value_counts('Attack Type')
+    attackTypes = attackCounts.index.tolist()
     totalIncidents = len(df)
+    attackLossStats = aggregates.stats('Attack Type', 'Financial Loss (in Million $)').table
+    attackResStats = aggregates.stats('Attack Type', 'Incident Resolution Time (in Hours)').table
+    if bootstrapping:
+        attackLossIntervals = aggregates.bootstrap_means('Attack Type', 'Financial Loss (in Million $)', **resampling)
+        attackResIntervals = aggregates.bootstrap_means('Attack Type', 'Incident Resolution Time (in Hours)', **resampling)
     
     for row_idx, attackType in enumerate(attackTypes):
-        attackData = df[df['Attack Type'] == attackType]
-        
         attackSheet.write(row_idx + 1, 0, attackType)
-        attackSheet.write(row_idx + 1, 1, attackData['Financial Loss (in Million $)'].mean(), currencyFormat)
-        attackSheet.write(row_idx + 1, 2, attackData['Financial Loss (in Million $)'].sum(), currencyFormat)
-        attackSheet.write(row_idx + 1, 3, attackData['Incident Resolution Time (in Hours)'].mean(), numberFormat)
-        attackSheet.write(row_idx + 1, 4, len(attackData), numberFormat)
-        attackSheet.write(row_idx + 1, 5, len(attackData) / totalIncidents, workbook.add_format({'num_format': '0.00%'}))
+        attackSheet.write(row_idx + 1, 1, attackLossStats.loc[attackType, 'mean'], currencyFormat)
+        attackSheet.write(row_idx + 1, 2, attackLossStats.loc[attackType, 'sum'], currencyFormat)
+        attackSheet.write(row_idx + 1, 3, attackResStats.loc[attackType, 'mean'], numberFormat)
+        attackSheet.write(row_idx + 1, 4, attackCounts[attackType], numberFormat)
+        attackSheet.write(row_idx + 1, 5, attackCounts[attackType] / totalIncidents, workbook.add_format({'num_format': '0.00%'}))
+        if bootstrapping:
+            attackSheet.write(row_idx + 1, 6, attackLossIntervals.loc[attackType, 'ci_lower'], currencyFormat)
+            attackSheet.write(row_idx + 1, 7, attackLossIntervals.loc[attackType, 'ci_upper'], currencyFormat)
+            attackSheet.write(row_idx + 1, 8, attackResIntervals.loc[attackType, 'ci_lower'], numberFormat)
+            attackSheet.write(row_idx + 1, 9, attackResIntervals.loc[attackType, 'ci_upper'], numberFormat)
+    
+    if bootstrapping and subsample_note(attackLossIntervals['draws'], attackLossIntervals['count']):
+        attackSheet.write(len(attackTypes) + 2, 0, subsample_note(attackLossIntervals['draws'], attackLossIntervals['count']))
     
     # Sütun genişliklerini ayarla
     attackSheet.set_column(0, 0, 25)
-    attackSheet.set_column(1, 5, 18)
+    attackSheet.set_column(1, 9, 18)
     
     # 6. VULNERABILITY ANALYSIS - Güvenlik Açığı Analizi
     vulnSheet = workbook.add_worksheet('Vulnerability Analysis')
     
     # Güvenlik açığı türlerine göre istatistikler
     vulnColumns = ['Vulnerability Type', 'Avg Loss', 'Total Loss', 'Avg Resolution Time', 'Count', '% of Total']
+    if bootstrapping:
+        vulnColumns += ['Avg Loss CI Lower', 'Avg Loss CI Upper', 'Avg Resolution CI Lower', 'Avg Resolution CI Upper']
     
     # Başlıkları yaz
     for col_idx, header in enumerate(vulnColumns):
         vulnSheet.write(0, col_idx, header, headerFormat)
     
     # Grup istatistiklerini hesapla
-    vulnTypes = df['Security Vulnerability Type'].value_counts().index.tolist()
+    vulnCounts = aggregates.value_counts('Security Vulnerability Type')
+    vulnTypes = vulnCounts.index.tolist()
+    vulnLossStats = aggregates.stats('Security Vulnerability Type', 'Financial Loss (in Million $)').table
+    vulnResStats = aggregates.stats('Security Vulnerability Type', 'Incident Resolution Time (in Hours)').table
+    if bootstrapping:
+        vulnLossIntervals = aggregates.bootstrap_means('Security Vulnerability Type', 'Financial Loss (in Million $)', **resampling)
+        vulnResIntervals = aggregates.bootstrap_means('Security Vulnerability Type', 'Incident Resolution Time (in Hours)', **resampling)
     
     for row_idx, vulnType in enumerate(vulnTypes):
-        vulnData = df[df['Security Vulnerability Type'] == vulnType]
-        
         vulnSheet.write(row_idx + 1, 0, vulnType)
-        vulnSheet.write(row_idx + 1, 1, vulnData['Financial Loss (in Million $)'].mean(), currencyFormat)
-        vulnSheet.write(row_idx + 1, 2, vulnData['Financial Loss (in Million $)'].sum(), currencyFormat)
-        vulnSheet.write(row_idx + 1, 3, vulnData['Incident Resolution Time (in Hours)'].mean(), numberFormat)
-        vulnSheet.write(row_idx + 1, 4, len(vulnData), numberFormat)
-        vulnSheet.write(row_idx + 1, 5, len(vulnData) / totalIncidents, workbook.add_format({'num_format': '0.00%'}))
+        vulnSheet.write(row_idx + 1, 1, vulnLossStats.loc[vulnType, 'mean'], currencyFormat)
+        vulnSheet.write(row_idx + 1, 2, vulnLossStats.loc[vulnType, 'sum'], currencyFormat)
+        vulnSheet.write(row_idx + 1, 3, vulnResStats.loc[vulnType, 'mean'], numberFormat)
+        vulnSheet.write(row_idx + 1, 4, vulnCounts[vulnType], numberFormat)
+        vulnSheet.write(row_idx + 1, 5, vulnCounts[vulnType] / totalIncidents, workbook.add_format({'num_format': '0.00%'}))
+        if bootstrapping:
+            vulnSheet.write(row_idx + 1, 6, vulnLossIntervals.loc[vulnType, 'ci_lower'], currencyFormat)
+            vulnSheet.write(row_idx + 1, 7, vulnLossIntervals.loc[vulnType, 'ci_upper'], currencyFormat)
+            vulnSheet.write(row_idx + 1, 8, vulnResIntervals.loc[vulnType, 'ci_lower'], numberFormat)
+            vulnSheet.write(row_idx + 1, 9, vulnResIntervals.loc[vulnType, 'ci_upper'], numberFormat)
+    
+    if bootstrapping and subsample_note(vulnLossIntervals['draws'], vulnLossIntervals['count']):
+        vulnSheet.write(len(vulnTypes) + 2, 0, subsample_note(vulnLossIntervals['draws'], vulnLossIntervals['count']))
     
     # Sütun genişliklerini ayarla
     vulnSheet.set_column(0, 0, 25)
-    vulnSheet.set_column(1, 5, 18)
+    vulnSheet.set_column(1, 9, 18)
     
     # 7. DEFENSE MECHANISMS - Savunma Mekanizmaları
     defenseSheet = workbook.add_worksheet('Defense Mechanisms')
     
     # Savunma mekanizmalarına göre istatistikler
     defenseColumns = ['Defense Mechanism', 'Avg Loss', 'Total Loss', 'Avg Resolution Time', 'Count', 'Effectiveness Score']
+    if bootstrapping:
+        defenseColumns += ['Avg Loss CI Lower', 'Avg Loss CI Upper', 'Avg Resolution CI Lower', 'Avg Resolution CI Upper',
+                           'Score CI Lower', 'Score CI Upper']
     
     # Başlıkları yaz
     for col_idx, header in enumerate(defenseColumns):
         defenseSheet.write(0, col_idx, header, headerFormat)
     
     # Grup istatistiklerini hesapla
-    defenseMechs = df['Defense Mechanism Used'].value_counts().index.tolist()
-    
-    # Etkinlik skoru hesaplama - daha düşük çözüm süresi ve daha düşük finansal kayıp = daha yüksek etkinlik
-    maxResTime = df['Incident Resolution Time (in Hours)'].max()
-    maxLoss = df['Financial Loss (in Million $)'].max()
+    defenseCounts = aggregates.value_counts('Defense Mechanism Used')
+    defenseMechs = defenseCounts.index.tolist()
+    defenseLossStats = aggregates.stats('Defense Mechanism Used', 'Financial Loss (in Million $)').table
+    defenseResStats = aggregates.stats('Defense Mechanism Used', 'Incident Resolution Time (in Hours)').table
+    if bootstrapping:
+        defenseLossIntervals = aggregates.bootstrap_means('Defense Mechanism Used', 'Financial Loss (in Million $)', **resampling)
+        defenseResIntervals = aggregates.bootstrap_means('Defense Mechanism Used', 'Incident Resolution Time (in Hours)', **resampling)
+    
+    # Etkinlik skoru (0-100) - Düşük çözüm süresi ve düşük kayıp = yüksek etkinlik, grafikle aynı puanlama modülü
+    scoringColumns = ['Defense Mechanism Used', 'Attack Type', 'Target Industry Standardized', 'Year',
+                      'Incident Resolution Time (in Hours)', 'Financial Loss (in Million $)']
+    defenseScores = score_defenses(aggregates.raw(scoringColumns), **resampling)
     
     for row_idx, defenseMech in enumerate(defenseMechs):
-        defenseData = df[df['Defense Mechanism Used'] == defenseMech]
-        
-        avgResTime = defenseData['Incident Resolution Time (in Hours)'].mean()
-        avgLoss = defenseData['Financial Loss (in Million $)'].mean()
-        
-        # Etkinlik skoru (0-100) - Düşük çözüm süresi ve düşük kayıp = yüksek etkinlik
-        effectivenessScore = 100 - (((avgResTime / maxResTime) * 0.5 + (avgLoss / maxLoss) * 0.5) * 100)
+        avgResTime = defenseResStats.loc[defenseMech, 'mean']
+        avgLoss = defenseLossStats.loc[defenseMech, 'mean']
+        effectivenessScore = defenseScores.loc[defenseMech, 'Effectiveness Score']
         
         defenseSheet.write(row_idx + 1, 0, defenseMech)
         defenseSheet.write(row_idx + 1, 1, avgLoss, currencyFormat)
-        defenseSheet.write(row_idx + 1, 2, defenseData['Financial Loss (in Million $)'].sum(), currencyFormat)
+        defenseSheet.write(row_idx + 1, 2, defenseLossStats.loc[defenseMech, 'sum'], currencyFormat)
         defenseSheet.write(row_idx + 1, 3, avgResTime, numberFormat)
-        defenseSheet.write(row_idx + 1, 4, len(defenseData), numberFormat)
+        defenseSheet.write(row_idx + 1, 4, defenseCounts[defenseMech], numberFormat)
         defenseSheet.write(row_idx + 1, 5, effectivenessScore, numberFormat)
+        if bootstrapping:
+            defenseSheet.write(row_idx + 1, 6, defenseLossIntervals.loc[defenseMech, 'ci_lower'], currencyFormat)
+            defenseSheet.write(row_idx + 1, 7, defenseLossIntervals.loc[defenseMech, 'ci_upper'], currencyFormat)
+            defenseSheet.write(row_idx + 1, 8, defenseResIntervals.loc[defenseMech, 'ci_lower'], numberFormat)
+            defenseSheet.write(row_idx + 1, 9, defenseResIntervals.loc[defenseMech, 'ci_upper'], numberFormat)
+            defenseSheet.write(row_idx + 1, 10, defenseScores.loc[defenseMech, 'Score CI Lower'], numberFormat)
+            defenseSheet.write(row_idx + 1, 11, defenseScores.loc[defenseMech, 'Score CI Upper'], numberFormat)
+    
+    if bootstrapping and subsample_note(defenseScores['Bootstrap Draws'], defenseScores['Count']):
+        defenseSheet.write(len(defenseMechs) + 2, 0, subsample_note(defenseScores['Bootstrap Draws'], defenseScores['Count']))
     
     # Sütun genişliklerini ayarla
     defenseSheet.set_column(0, 0, 25)
-    defenseSheet.set_column(1, 5, 18)
+    defenseSheet.set_column(1, 11, 18)
+    
+    # Saldırı türü, sektör ve yıl segmentlerinde savunma sıralaması
+    segmentSheet = workbook.add_worksheet('Defense Segments')
+    segmentScores = score_segments(aggregates.raw(scoringColumns), **resampling)
+    write_frame_sheet(workbook, 'Defense Segments', segmentScores, headerFormat,
+                      numeric_column_formats(segmentScores, numberFormat, currencyFormat, ['Financial Loss (in Million $)']), columnWidth=22,
+                      sheet=segmentSheet)
     
     # 8. YEARLY TRENDS - Yıllık Trendler
     trendSheet = workbook.add_worksheet('Yearly Trends')
@@ -233,18 +306,20 @@ def create_enhanced_analysis():
         trendSheet.write(0, col_idx, header, headerFormat)
     
     # Yılları sırala
-    years = sorted(df['Year'].unique())
+    yearCounts = aggregates.groupby('Year')
+    years = yearCounts.index.tolist()
+    yearLossStats = aggregates.stats('Year', 'Financial Loss (in Million $)').table
+    yearResStats = aggregates.stats('Year', 'Incident Resolution Time (in Hours)').table
     previousYearLoss = None
     
     for row_idx, year in enumerate(years):
-        yearData = df[df['Year'] == year]
-        totalLoss = yearData['Financial Loss (in Million $)'].sum()
+        totalLoss = yearLossStats.loc[year, 'sum']
         
         trendSheet.write(row_idx + 1, 0, year, numberFormat)
-        trendSheet.write(row_idx + 1, 1, yearData['Financial Loss (in Million $)'].mean(), currencyFormat)
+        trendSheet.write(row_idx + 1, 1, yearLossStats.loc[year, 'mean'], currencyFormat)
         trendSheet.write(row_idx + 1, 2, totalLoss, currencyFormat)
-        trendSheet.write(row_idx + 1, 3, yearData['Incident Resolution Time (in Hours)'].mean(), numberFormat)
-        trendSheet.write(row_idx + 1, 4, len(yearData), numberFormat)
+        trendSheet.write(row_idx + 1, 3, yearResStats.loc[year, 'mean'], numberFormat)
+        trendSheet.write(row_idx + 1, 4, yearCounts[year], numberFormat)
         
         # YoY büyüme oranı
         if previousYearLoss is not None and previousYearLoss != 0:
@@ -269,11 +344,11 @@ def create_enhanced_analysis():
     statsTestSheet.write_row(3, 0, ["Metric", "Value"], headerFormat)
     
     # ANOVA testini gerçekleştir
-    industryGroups = []
-    for industry in df['Target Industry Standardized'].unique():
-        industryData = df[df['Target Industry Standardized'] == industry]['Financial Loss (in Million $)']
-        if len(industryData) > 5:  # Yeterli veri olduğundan emin ol
-            industryGroups.append(industryData.values)
+    # Grup dizileri aynı tek geçişli istatistik motorundan gelir
+    industryGroups = [
+        groupValues for groupValues in aggregates.stats('Target Industry Standardized', 'Financial Loss (in Million $)').group_arrays()
+        if len(groupValues) > 5  # Yeterli veri olduğundan emin ol
+    ]
     
     if len(industryGroups) >= 2:  # En az iki grup olmalı
         fValue, pValue = stats.f_oneway(*industryGroups)
@@ -286,48 +361,53 @@ def create_enhanced_analysis():
         
         statsTestSheet.write(6, 0, "Significant at α=0.05")
         statsTestSheet.write(6, 1, "Yes" if pValue < 0.05 else "No")
+        
+        # Permütasyon testi: etiketler karıştırılarak F dağılımı varsayımı olmadan p-değeri
+        if bootstrapping:
+            _, permutationP, permutationRows = permutation_anova(industryGroups, **resampling)
+            totalRows = sum(len(groupValues) for groupValues in industryGroups)
+            rowsNote = f", {permutationRows:,} of {totalRows:,} rows" if permutationRows < totalRows else ""
+            statsTestSheet.write(7, 0, f"Permutation p-value ({resampling['resamples']} resamples{rowsNote})")
+            statsTestSheet.write(7, 1, permutationP, numberFormat)
     
     # 9.2 KORELASYON - Sayısal değişkenler arasındaki korelasyon
     statsTestSheet.write(8, 0, "Correlation Analysis: Numerical Variables", workbook.add_format({'bold': True}))
     
     # Sayısal değişkenleri seç
-    numCorrelations = df[['Financial Loss (in Million $)', 'Number of Affected Users', 
-                          'Incident Resolution Time (in Hours)']].corr()
+    numCorrelations = aggregates.corr(['Financial Loss (in Million $)', 'Number of Affected Users', 
+                                       'Incident Resolution Time (in Hours)'])
     
-    # Korelasyon matrisini yaz
+    # Korelasyon matrisini yaz (constant_memory için satırlar sırayla yazılır)
     for i, col in enumerate(numCorrelations.columns):
         statsTestSheet.write(9, i+1, col, headerFormat)
-        statsTestSheet.write(i+10, 0, col, headerFormat)
     
     for i, row in enumerate(numCorrelations.index):
+        statsTestSheet.write(i+10, 0, row, headerFormat)
         for j, col in enumerate(numCorrelations.columns):
             statsTestSheet.write(i+10, j+1, numCorrelations.loc[row, col], 
                                 workbook.add_format({'num_format': '0.000'}))
     
     # 9.3 CHI-SQUARE - Kategorik değişkenler arasındaki ilişkiler
     statsTestSheet.write(15, 0, "Chi-Square Tests: Categorical Variables", workbook.add_format({'bold': True}))
-    statsTestSheet.write_row(16, 0, ["Variable 1", "Variable 2", "Chi-Square", "p-value", "Significant"], headerFormat)
+    statsTestSheet.write_row(16, 0, ["Variable 1", "Variable 2", "Chi-Square", "p-value", "Significant", "Cramér's V"], headerFormat)
     
     # Chi-square testlerini gerçekleştir
-    catVars = ['Attack Type', 'Target Industry Standardized', 'Attack Source', 'Security Vulnerability Type']
+    # Tüm kategorik çiftlerin çapraz tabloları tamsayı kodlardan tek bincount ile kurulur, testler toplu hesaplanır
+    catVars = [col for col in CATEGORICAL_COLUMNS if col in df.columns]
+    chiResults = aggregates.chi_square(catVars)
     chiRow = 17
     
-    for i, var1 in enumerate(catVars):
-        for j, var2 in enumerate(catVars):
-            if i < j:  # Her çifti sadece bir kez test et
-                # Çapraz tablo oluştur
-                crosstab = pd.crosstab(df[var1], df[var2])
-                
-                # Chi-square testi uygula
-                chi2, p, dof, expected = stats.chi2_contingency(crosstab)
-                
-                statsTestSheet.write(chiRow, 0, var1)
-                statsTestSheet.write(chiRow, 1, var2)
-                statsTestSheet.write(chiRow, 2, chi2, numberFormat)
-                statsTestSheet.write(chiRow, 3, p, numberFormat)
-                statsTestSheet.write(chiRow, 4, "Yes" if p < 0.05 else "No")
-                
-                chiRow += 1
+    for result in chiResults.itertuples(index=False):
+        var1, var2, chi2, p = result[0], result[1], result[2], result[3]
+        
+        statsTestSheet.write(chiRow, 0, var1)
+        statsTestSheet.write(chiRow, 1, var2)
+        statsTestSheet.write(chiRow, 2, chi2, numberFormat)
+        statsTestSheet.write(chiRow, 3, p, numberFormat)
+        statsTestSheet.write(chiRow, 4, "Yes" if p < 0.05 else "No")
+        statsTestSheet.write(chiRow, 5, result[5], numberFormat)
+        
+        chiRow += 1
     
     # 10. CROSS TABULATION - Çapraz Tablolar
     crossTabSheet = workbook.add_worksheet('Cross Tabulation')
@@ -337,14 +417,12 @@ def create_enhanced_analysis():
     crossTabSheet.merge_range('A1:D1', "Sector vs Attack Type: Average Financial Loss", headerFormat)
     
     # Çapraz tablo oluştur
-    crossTab = pd.crosstab(
-        df['Target Industry Standardized'], 
-        df['Attack Type'],
-        values=df['Financial Loss (in Million $)'],
-        aggfunc='mean',
-        margins=True,
-        margins_name='Total'
-    ).fillna(0)
+    crossTab = aggregates.pivot('Target Industry Standardized', 'Attack Type', 'Financial Loss (in Million $)', 'mean')
+    crossTab = crossTab.rename(index=str, columns=str)
+    crossTab['Total'] = aggregates.groupby('Target Industry Standardized', 'Financial Loss (in Million $)', 'mean').rename(index=str)
+    crossTab.loc['Total'] = aggregates.groupby('Attack Type', 'Financial Loss (in Million $)', 'mean').rename(index=str)
+    crossTab.loc['Total', 'Total'] = aggregates.total('Financial Loss (in Million $)', 'mean')
+    crossTab = crossTab.fillna(0)
     
     # Sektörleri ve saldırı türlerini al
     sectors = list(crossTab.index[:-1])  # Son satır (Total) hariç
@@ -378,9 +456,14 @@ def create_enhanced_analysis():
     crossTabSheet.set_column(1, len(attackTypes) + 1, 15)
     
     # Excel dosyasını kaydet
-    writer.close()
+    sheetStages.finish()
+    with stage('excel_save', 'pipeline'):
+        writer.close()
     
     print(f"Enhanced analysis report created: {outputPath}")
+    aggregates.print_report()
+    # Aşama süreleri JSON/CSV olarak kaydedilir ve özet tablo yazdırılır
+    write_timing_report('data', 'enhanced_analysis_timing')
     
     # Script dosyasını trash-bin'e taşı
     scriptPath = os.path.realpath(__file__)
@@ -410,4 +493,19 @@ def create_enhanced_analysis():
         print(f"Note: Could not move script to trash-bin: {e}")
 
 if __name__ == "__main__":
-    create_enhanced_analysis()
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rebuild-cache', action='store_true', help='Re-parse the CSV and rewrite the columnar data cache')
+    parser.add_argument('--constant-memory', action='store_true', help='Stream worksheet rows to disk to keep memory bounded on large exports')
+    parser.add_argument('--engine', choices=AGGREGATION_ENGINES, default=None,
+                        help='Dataframe engine for aggregations, or cube to answer them from pre-aggregated cuboids (default: DATAFRAME_ENGINE or pandas)')
+    parser.add_argument('--profile', nargs='?', const='cprofile', choices=PROFILE_MODES, default=profile_mode_default(),
+                        help='Profile each top-level stage with cProfile (default) or a low-overhead sampler; writes .prof and collapsed-stack files (default: PROFILE_MODE)')
+    parser.add_argument('--low-memory', action='store_true', default=low_memory_default(),
+                        help='Low-memory profile: downcast numerics, category-code strings, free cached aggregations between sheets (default: LOW_MEMORY)')
+    parser.add_argument('--resamples', type=int, default=None,
+                        help='Bootstrap resamples for confidence intervals and the permutation ANOVA, e.g. 10000 (default: RESAMPLE_COUNT or 0, off)')
+    parser.add_argument('--max-group-draws', type=int, default=None,
+                        help='Cap on rows drawn per group when resampling; capped intervals are labelled approximate, 0 disables the cap (default: RESAMPLE_MAX_GROUP_DRAWS or 2000)')
+    args = parser.parse_args()
+    create_enhanced_analysis(rebuildCache=args.rebuild_cache, constantMemory=args.constant_memory, engine=args.engine, profile=args.profile,
+                             lowMemory=args.low_memory, resamples=args.resamples, maxGroupDraws=args.max_group_draws)
@@ -1,24 +1,52 @@
+import argparse
 import pandas as pd
 import numpy as np
 from pathlib import Path
 import os
+from src.utils.data_cache import load_breach_data
+from src.utils.incremental import StoreAggregates, update_aggregate_store
+from src.utils.excel_writer import SheetStages
+from src.utils.instrumentation import stage, write_timing_report
+from src.utils.low_memory import compact_frame, low_memory_default, release_memory
+from src.utils.profiling import PROFILE_MODES, enable_profiling, profile_mode_default
+from src.utils.parallel_aggregation import AGGREGATION_ENGINES, create_aggregation_cache
+from src.utils.schema import required_columns, requires_columns
 
-def create_analysis_report():
+@requires_columns('Year', 'Country', 'Attack Type', 'Target Industry Standardized', 'Defense Mechanism Used',
+                  'Financial Loss (in Million $)', 'Incident Resolution Time (in Hours)')
+def create_analysis_report(rebuildCache=False, incremental=False, engine=None, profile=None, lowMemory=False):
+    # --profile ile her aşama cProfile veya örnekleyici ile profillenir, çıktılar data/profiles altına yazılır
+    enable_profiling(Path('data') / 'profiles' / 'analysis_report', profile)
     # camelCase kullanımına dikkat edelim
     dataPath = Path('data/RAW-cybersecurity_breach_data.csv')
     
-    # Veri setini yükle
-    if dataPath.exists():
-        df = pd.read_csv(dataPath)
-        print(f"Loaded data with {len(df)} records from {dataPath}")
-    else:
+    if not dataPath.exists():
         print(f"Data file not found at {dataPath}")
         return
     
+    # Veri setini yükle (yalnızca raporda kullanılan sütunlar okunur)
+    def load_frame():
+        with stage('load', 'pipeline'):
+            df = load_breach_data(dataPath, rebuildCache=rebuildCache, columns=required_columns(create_analysis_report))
+        print(f"Loaded data with {len(df)} records from {dataPath}")
+        # Düşük bellek profili: sayısal sütunlar küçültülür, metinler kategoriye çevrilir
+        return compact_frame(df) if lowMemory else df
+    
+    # Artımlı modda yalnızca yeni eklenen satırlar özet deposuna eklenir; rapordaki tüm özetler depoda
+    # tutulduğundan veri seti yalnızca depoda olmayan bir özet istenirse yüklenir
+    if incremental:
+        aggregates = StoreAggregates(update_aggregate_store(dataPath, rebuildCache), load_frame)
+    else:
+        # AGGREGATION_BACKEND=parallel ile gruplama süreç havuzunda yapılır, --engine ile polars/duckdb veya küp seçilebilir
+        aggregates = create_aggregation_cache(load_frame(), engine=engine)
+    
     # Excel dosyasını oluştur
     outputPath = 'data/analysis_report.xlsx'
     writer = pd.ExcelWriter(outputPath, engine='xlsxwriter')
     workbook = writer.book
+    # Her sayfanın süresi, CPU zamanı ve bellek kullanımı ayrı ölçülür
+    # Düşük bellek profilinde her sayfadan sonra önbellekteki ara sonuçlar serbest bırakılır
+    sheetStages = SheetStages(workbook, (lambda: release_memory(aggregates)) if lowMemory else None)
     
     # Formatları tanımla
     headerFormat = workbook.add_format({
@@ -54,19 +82,19 @@ def create_analysis_report():
     summarySheet = workbook.add_worksheet('Summary')
     
     # Toplam saldırı sayısı
-    totalAttacks = len(df)
+    totalAttacks = aggregates.row_count()
     
     # Finansal kayıp ortalaması
-    avgFinancialLoss = df['Financial Loss (in Million $)'].mean()
+    avgFinancialLoss = aggregates.total('Financial Loss (in Million $)', 'mean')
     
     # En yaygın saldırı türü
-    mostCommonAttack = df['Attack Type'].value_counts().idxmax()
+    mostCommonAttack = aggregates.value_counts('Attack Type').idxmax()
     
     # En çok etkilenen sektör
-    mostAffectedIndustry = df['Target Industry Standardized'].value_counts().idxmax()
+    mostAffectedIndustry = aggregates.value_counts('Target Industry Standardized').idxmax()
     
     # En uzun çözüm süresine sahip saldırı türü
-    avgResolutionByAttack = df.groupby('Attack Type')['Incident Resolution Time (in Hours)'].mean()
+    avgResolutionByAttack = aggregates.groupby('Attack Type', 'Incident Resolution Time (in Hours)', 'mean')
     longestResolutionAttack = avgResolutionByAttack.idxmax()
     
     # Özet tablo
@@ -81,7 +109,7 @@ def create_analysis_report():
     summarySheet.write_row('A1', ['Key Metrics', 'Value'], headerFormat)
     for i, row in enumerate(summaryData):
         summarySheet.write(i+1, 0, row[0], boldFormat)
-        if isinstance(row[1], (int, float)) and i != 0:
+        if isinstance(row[1], (int, float, np.number)) and i != 0:
             if i == 1:  # Financial loss
                 summarySheet.write(i+1, 1, row[1], currencyFormat)
             else:
@@ -97,7 +125,11 @@ def create_analysis_report():
     financialSheet = workbook.add_worksheet('Financial Impact')
     
     # Sektöre göre ortalama finansal kayıp
-    financialByIndustry = df.groupby('Target Industry Standardized')['Financial Loss (in Million $)'].agg(['mean', 'sum', 'count']).reset_index()
+    financialByIndustry = aggregates.summary('Target Industry Standardized', {
+        'mean': ('Financial Loss (in Million $)', 'mean'),
+        'sum': ('Financial Loss (in Million $)', 'sum'),
+        'count': ('Financial Loss (in Million $)', 'count')
+    })
     financialByIndustry = financialByIndustry.sort_values('sum', ascending=False)
     
     # Sektör bazlı finansal tablo
@@ -124,13 +156,12 @@ def create_analysis_report():
     attackSheet = workbook.add_worksheet('Attack Analysis')
     
     # Saldırı türüne göre istatistikler
-    attackStats = df.groupby('Attack Type').agg({
-        'Financial Loss (in Million $)': ['mean', 'sum'],
-        'Incident Resolution Time (in Hours)': 'mean',
-        'Attack Type': 'count'
-    }).reset_index()
-    
-    attackStats.columns = ['Attack Type', 'Avg Loss', 'Total Loss', 'Avg Resolution Time', 'Count']
+    attackStats = aggregates.summary('Attack Type', {
+        'Avg Loss': ('Financial Loss (in Million $)', 'mean'),
+        'Total Loss': ('Financial Loss (in Million $)', 'sum'),
+        'Avg Resolution Time': ('Incident Resolution Time (in Hours)', 'mean'),
+        'Count': (None, 'size')
+    })
     attackStats = attackStats.sort_values('Count', ascending=False)
     
     # Saldırı analizi tablosu
@@ -160,13 +191,13 @@ def create_analysis_report():
     defenseSheet = workbook.add_worksheet('Defense Mechanisms')
     
     # Savunma mekanizmalarına göre istatistikler
-    defenseStats = df.groupby('Defense Mechanism Used').agg({
-        'Financial Loss (in Million $)': ['mean', 'sum'],
-        'Incident Resolution Time (in Hours)': 'mean',
-        'Defense Mechanism Used': 'count'
-    }).reset_index()
-    
-    defenseStats.columns = ['Defense Mechanism', 'Avg Loss', 'Total Loss', 'Avg Resolution Time', 'Count']
+    defenseStats = aggregates.summary('Defense Mechanism Used', {
+        'Avg Loss': ('Financial Loss (in Million $)', 'mean'),
+        'Total Loss': ('Financial Loss (in Million $)', 'sum'),
+        'Avg Resolution Time': ('Incident Resolution Time (in Hours)', 'mean'),
+        'Count': (None, 'size')
+    })
+    defenseStats = defenseStats.rename(columns={'Defense Mechanism Used': 'Defense Mechanism'})
     defenseStats = defenseStats.sort_values('Avg Resolution Time')
     
     # Savunma mekanizması tablosu
@@ -196,13 +227,12 @@ def create_analysis_report():
     trendSheet = workbook.add_worksheet('Yearly Trends')
     
     # Yıla göre istatistikler
-    yearlyStats = df.groupby('Year').agg({
-        'Financial Loss (in Million $)': ['mean', 'sum'],
-        'Incident Resolution Time (in Hours)': 'mean',
-        'Year': 'count'
-    }).reset_index()
-    
-    yearlyStats.columns = ['Year', 'Avg Loss', 'Total Loss', 'Avg Resolution Time', 'Incident Count']
+    yearlyStats = aggregates.summary('Year', {
+        'Avg Loss': ('Financial Loss (in Million $)', 'mean'),
+        'Total Loss': ('Financial Loss (in Million $)', 'sum'),
+        'Avg Resolution Time': ('Incident Resolution Time (in Hours)', 'mean'),
+        'Incident Count': (None, 'size')
+    })
     yearlyStats = yearlyStats.sort_values('Year')
     
     # Yıllık trend tablosu
@@ -230,13 +260,12 @@ def create_analysis_report():
     countrySheet = workbook.add_worksheet('Country Analysis')
     
     # Ülkelere göre istatistikler
-    countryStats = df.groupby('Country').agg({
-        'Financial Loss (in Million $)': ['mean', 'sum'],
-        'Incident Resolution Time (in Hours)': 'mean',
-        'Country': 'count'
-    }).reset_index()
-    
-    countryStats.columns = ['Country', 'Avg Loss', 'Total Loss', 'Avg Resolution Time', 'Incident Count']
+    countryStats = aggregates.summary('Country', {
+        'Avg Loss': ('Financial Loss (in Million $)', 'mean'),
+        'Total Loss': ('Financial Loss (in Million $)', 'sum'),
+        'Avg Resolution Time': ('Incident Resolution Time (in Hours)', 'mean'),
+        'Incident Count': (None, 'size')
+    })
     countryStats = countryStats.sort_values('Incident Count', ascending=False).head(15)  # Top 15 ülke
     
     # Ülke analizi tablosu
@@ -267,7 +296,7 @@ def create_analysis_report():
     crossSheet = workbook.add_worksheet('Industry-Attack Cross')
     
     # Çapraz tablo oluştur
-    crossTab = pd.crosstab(df['Target Industry Standardized'], df['Attack Type'])
+    crossTab = aggregates.crosstab('Target Industry Standardized', 'Attack Type')
     
     # Sütun başlıklarını yaz
     crossSheet.write_row('A1', ['Industry'] + list(crossTab.columns), headerFormat)
@@ -318,9 +347,14 @@ def create_analysis_report():
     studentSheet.set_column('B:B', 25)
     
     # Excel dosyasını kaydet
-    writer.close()
+    sheetStages.finish()
+    with stage('excel_save', 'pipeline'):
+        writer.close()
     
     print(f"Analysis report created: {outputPath}")
+    aggregates.print_report()
+    # Aşama süreleri JSON/CSV olarak kaydedilir ve özet tablo yazdırılır
+    write_timing_report('data', 'analysis_report_timing')
     
     # Script dosyasını trash-bin'e taşı
     scriptPath = os.path.realpath(__file__)
@@ -346,4 +380,15 @@ def create_analysis_report():
         print(f"Note: Could not move scripts to trash-bin: {e}")
 
 if __name__ == "__main__":
-    create_analysis_report()
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rebuild-cache', action='store_true', help='Re-parse the CSV and rewrite the columnar data cache')
+    parser.add_argument('--incremental', action='store_true', help='Fold only newly appended rows into the persisted aggregate store')
+    parser.add_argument('--engine', choices=AGGREGATION_ENGINES, default=None,
+                        help='Dataframe engine for aggregations, or cube to answer them from pre-aggregated cuboids (default: DATAFRAME_ENGINE or pandas)')
+    parser.add_argument('--profile', nargs='?', const='cprofile', choices=PROFILE_MODES, default=profile_mode_default(),
+                        help='Profile each top-level stage with cProfile (default) or a low-overhead sampler; writes .prof and collapsed-stack files (default: PROFILE_MODE)')
+    parser.add_argument('--low-memory', action='store_true', default=low_memory_default(),
+                        help='Low-memory profile: downcast numerics, category-code strings, free cached aggregations between sheets (default: LOW_MEMORY)')
+    args = parser.parse_args()
+    create_analysis_report(rebuildCache=args.rebuild_cache, incremental=args.incremental, engine=args.engine, profile=args.profile,
+                           lowMemory=args.low_memory)
@@ -1,11 +1,33 @@
 #!/usr/bin/env python3
+import argparse
 import os
 import sys
 sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
 from src.analysis.enhanced_analysis import generate_enhanced_analysis
+from src.utils.parallel_aggregation import AGGREGATION_ENGINES
+from src.utils.ingestion import CHUNK_ROWS
+from src.utils.low_memory import low_memory_default
+from src.utils.profiling import PROFILE_MODES, profile_mode_default
 def main():
+    parser = argparse.ArgumentParser(description="Cybersecurity Breach Analysis")
+    parser.add_argument('--rebuild-cache', action='store_true', help='Re-parse the CSV and rewrite the columnar data cache')
+    parser.add_argument('--incremental', action='store_true', help='Fold only newly appended rows into the persisted aggregate store')
+    parser.add_argument('--workers', type=int, default=None, help='Number of chart rendering processes (default: CHART_WORKERS or CPU count)')
+    parser.add_argument('--force-render', action='store_true', help='Re-render every chart even when its inputs are unchanged')
+    parser.add_argument('--stream', action='store_true', help='Read the CSV in chunks with bounded memory; raw-point charts use a sample (RAW_SAMPLE_ROWS, RAW_SAMPLE_STRATEGY, RAW_SAMPLE_STRATIFY)')
+    parser.add_argument('--chunk-rows', type=int, default=CHUNK_ROWS, help='Rows per chunk when streaming')
+    parser.add_argument('--store', action='store_true', help='Answer aggregations from the indexed SQLite breach store instead of the in-memory frame')
+    parser.add_argument('--engine', choices=AGGREGATION_ENGINES, default=None,
+                        help='Dataframe engine for aggregations, or cube to answer them from pre-aggregated cuboids (default: DATAFRAME_ENGINE or pandas)')
+    parser.add_argument('--profile', nargs='?', const='cprofile', choices=PROFILE_MODES, default=profile_mode_default(),
+                        help='Profile each top-level stage with cProfile (default) or a low-overhead sampler; writes .prof and collapsed-stack files (default: PROFILE_MODE)')
+    parser.add_argument('--low-memory', action='store_true', default=low_memory_default(),
+                        help='Low-memory profile: downcast numerics, category-code strings, free cached aggregations between stages (default: LOW_MEMORY)')
+    args = parser.parse_args()
     print("Running Cybersecurity Breach Analysis...")
-    generate_enhanced_analysis()
+    generate_enhanced_analysis(rebuildCache=args.rebuild_cache, maxWorkers=args.workers, incremental=args.incremental, forceRender=args.force_render or None,
+                               streaming=args.stream, chunkSize=args.chunk_rows, engine=args.engine,
+                               store=args.store, profile=args.profile, lowMemory=args.low_memory)
     dashboardPath = os.path.join('output', 'dashboard', 'index.html')
     print("Analysis complete. Results available in the output directory.")
     print(f"Dashboard available at: {dashboardPath}")
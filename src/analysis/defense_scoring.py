@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+from scipy import stats
+from src.utils.resampling import DEFAULT_CONFIDENCE, bootstrap_mean_samples, group_draws
+from src.utils.schema import FINANCIAL_LOSS, RESOLUTION_HOURS
+DEFENSE_COLUMN = 'Defense Mechanism Used'
+DEFAULT_WEIGHTS = {RESOLUTION_HOURS: 0.5, FINANCIAL_LOSS: 0.5}
+NORMALIZATIONS = ('max', 'minmax', 'rank', 'zscore')
+SCORE_SEGMENTS = {'Overall': (), 'Attack Type': ('Attack Type',), 'Industry': ('Target Industry Standardized',), 'Year': ('Year',)}
+def segment_reduce(ufunc, values, segmentStarts, counts):
+    return np.repeat(ufunc.reduceat(values, segmentStarts, axis=-1), counts, axis=-1)
+def normalize_lower_better(values, segmentStarts, strategy='max'):
+    if strategy not in NORMALIZATIONS:
+        raise ValueError(f"Unknown normalization '{strategy}', expected one of {', '.join(NORMALIZATIONS)}")
+    counts = np.diff(np.append(segmentStarts, values.shape[-1]))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        if strategy == 'max':
+            return 1 - values / segment_reduce(np.maximum, values, segmentStarts, counts)
+        if strategy == 'minmax':
+            low = segment_reduce(np.minimum, values, segmentStarts, counts)
+            span = segment_reduce(np.maximum, values, segmentStarts, counts) - low
+            return np.where(span > 0, 1 - (values - low) / span, 0.5)
+        if strategy == 'zscore':
+            means = segment_reduce(np.add, values, segmentStarts, counts) / np.repeat(counts, counts)
+            deviations = values - means
+            spread = np.sqrt(segment_reduce(np.add, deviations * deviations, segmentStarts, counts) / np.repeat(counts - 1, counts))
+            return np.where(spread > 0, stats.norm.cdf(-deviations / spread), 0.5)
+    ranks = np.concatenate([stats.rankdata(values[..., start:start + count], method='average', axis=-1) - 1
+                            for start, count in zip(segmentStarts, counts)], axis=-1) if len(counts) else np.zeros_like(values)
+    sizes = np.repeat(counts, counts)
+    return np.where(sizes > 1, 1 - ranks / np.maximum(sizes - 1, 1), 1.0)
+def combine_scores(means, segmentStarts, weights, normalization):
+    total = sum(weights.values())
+    return 100 * sum(weight * normalize_lower_better(means[..., i], segmentStarts, normalization)
+                     for i, weight in enumerate(weights.values())) / total
+def score_defenses(df, by=(), weights=None, normalization='max', resamples=0, confidence=DEFAULT_CONFIDENCE, seed=0, maxWorkers=1,
+                   maxGroupDraws=None):
+    weights = dict(weights or DEFAULT_WEIGHTS)
+    keys = list(by) + [DEFENSE_COLUMN]
+    grouped = df[keys].groupby(keys, observed=True, sort=True)
+    groupIds = grouped.ngroup().to_numpy()
+    valid = groupIds >= 0
+    order = np.argsort(groupIds[valid], kind='stable')
+    values = df[list(weights)].to_numpy(dtype=np.float64)[valid][order]
+    counts = np.bincount(groupIds[valid], minlength=grouped.ngroups)
+    starts = np.cumsum(counts) - counts
+    means = np.add.reduceat(values, starts, axis=0) / counts[:, None]
+    labels = pd.MultiIndex.from_frame(grouped.size().reset_index()[keys]) if by else grouped.size().index
+    segments = labels.droplevel(-1) if by else pd.Index(np.zeros(len(labels)))
+    segmentStarts = np.flatnonzero(np.r_[True, segments[1:] != segments[:-1]]) if len(segments) else np.array([], dtype=np.int64)
+    result = pd.DataFrame({'Count': counts}, index=labels)
+    for i, metric in enumerate(weights):
+        result[metric] = means[:, i]
+    result['Effectiveness Score'] = combine_scores(means, segmentStarts, weights, normalization)
+    if resamples > 0:
+        samples = bootstrap_mean_samples(values, starts, counts, resamples, seed, maxWorkers, maxGroupDraws)
+        sampleScores = combine_scores(samples, segmentStarts, weights, normalization)
+        alpha = (1 - confidence) / 2
+        result['Score CI Lower'], result['Score CI Upper'] = np.quantile(sampleScores, [alpha, 1 - alpha], axis=0)
+        result['Bootstrap Draws'] = group_draws(counts, maxGroupDraws)
+    scores = result['Effectiveness Score']
+    result['Rank'] = (scores.groupby(level=list(range(len(by))), observed=True) if by else scores).rank(ascending=False, method='min').astype('int64')
+    return result
+def score_segments(df, segments=None, **options):
+    frames = []
+    for name, by in (segments or SCORE_SEGMENTS).items():
+        scores = score_defenses(df, by, **options).reset_index()
+        scores.insert(0, 'Segment', scores[list(by)].astype(str).agg(' / '.join, axis=1) if by else 'All')
+        scores.insert(0, 'Segment Type', name)
+        frames.append(scores.drop(columns=list(by)))
+    return pd.concat(frames, ignore_index=True)
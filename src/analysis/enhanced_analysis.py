@@ -1,85 +1,107 @@
 import pandas as pd
 import matplotlib.pyplot as plt
+from matplotlib.colors import to_rgba
 import seaborn as sns
 import numpy as np
 from pathlib import Path
 import os
 import shutil
 from datetime import datetime
-def generate_enhanced_analysis():
+from src.utils.aggregation import AggregationCache
+from src.utils.dataset_context import DatasetContext
+from src.utils.density import binned_kde, grouped_histograms
+from src.utils.grouped_stats import GroupedStatistics, factorize_keys
+from src.utils.visualization_utils import draw_violins
+from src.utils.ingestion import CHUNK_ROWS
+from src.utils.instrumentation import write_timing_report
+from src.utils.profiling import enable_profiling
+from src.utils.schema import NUMERIC_COLUMNS, required_columns, requires_columns
+from src.visualization.chart_jobs import ChartJob, run_chart_jobs, save_chart
+from src.visualization.large_scatter import DEFAULT_POINT_THRESHOLD, large_scatter, scatter_options
+def generate_enhanced_analysis(context=None, rebuildCache=False, maxWorkers=None, incremental=False, forceRender=None,
+                               streaming=False, chunkSize=CHUNK_ROWS, engine=None, store=False, profile=None,
+                               lowMemory=False):
     print("Generating enhanced analysis visualizations...")
     outputDir = Path('../../output/visualizations')
     dashboardDir = Path('../../output/dashboard')
     outputDir.mkdir(exist_ok=True, parents=True)
     dashboardDir.mkdir(exist_ok=True, parents=True)
-    possiblePaths = [
-        Path('../../data/cybersecurity_breach_data.csv'),
-        Path('data/cybersecurity_breach_data.csv'),
-        Path('../data/cybersecurity_breach_data.csv')
-    ]
-    df = None
-    for dataPath in possiblePaths:
-        try:
-            df = pd.read_csv(dataPath)
-            print(f"Loaded data with {len(df)} records from {dataPath}")
-            break
-        except Exception:
-            continue
-    if df is None:
+    enable_profiling(outputDir.parent / 'profiles', profile)
+    if profile is not None and maxWorkers is None:
+        maxWorkers = 1
+    if context is None:
+        possiblePaths = [
+            Path('../../data/cybersecurity_breach_data.csv'),
+            Path('data/cybersecurity_breach_data.csv'),
+            Path('../data/cybersecurity_breach_data.csv')
+        ]
+        context = DatasetContext.from_candidates(possiblePaths, rebuildCache=rebuildCache, incremental=incremental,
+                                                 streaming=streaming, chunkSize=chunkSize, engine=engine, store=store,
+                                                 lowMemory=lowMemory, columns=required_columns(*ENHANCED_STAGES))
+    aggregates = context.aggregates if context is not None else None
+    if aggregates is None:
         print(f"Error: Could not load data from any of the possible paths")
         return
-    generate_financial_analysis(df, outputDir)
-    generate_attack_analysis(df, outputDir)
-    generate_vulnerability_analysis(df, outputDir)
-    generate_correlation_analysis(df, outputDir)
-    generate_trend_analysis(df, outputDir)
-    create_pure_analysis_dashboard(outputDir, dashboardDir)
+    try:
+        jobs = []
+        with context.timed('financial_analysis'):
+            jobs += build_financial_jobs(aggregates=aggregates)
+        with context.timed('attack_analysis'):
+            jobs += build_attack_jobs(aggregates=aggregates)
+        with context.timed('vulnerability_analysis'):
+            jobs += build_vulnerability_jobs(aggregates=aggregates)
+        with context.timed('correlation_analysis'):
+            jobs += build_correlation_jobs(aggregates=aggregates)
+        with context.timed('trend_analysis'):
+            jobs += build_trend_jobs(aggregates=aggregates)
+        with context.timed('chart_rendering'):
+            run_chart_jobs(jobs, outputDir, maxWorkers, forceRender)
+        with context.timed('dashboard'):
+            create_pure_analysis_dashboard(outputDir, dashboardDir)
+    finally:
+        context.print_timings()
+        aggregates.print_report()
+        write_timing_report(outputDir)
     dashboardPath = os.path.join('output', 'dashboard', 'index.html')
     print(f"Enhanced analysis completed. Dashboard available at {dashboardPath}")
-def generate_financial_analysis(df, outputDir):
-    print("Generating financial impact analysis...")
-    sns.set_style("whitegrid")
-    plt.rcParams['font.family'] = 'sans-serif'
-    plt.figure(figsize=(12, 8))
-    industryImpact = df.groupby('Target Industry Standardized')['Financial Loss (in Million $)'].mean().sort_values()
-    sns.barplot(y=industryImpact.index, x=industryImpact.values, hue=industryImpact.index, palette='viridis', legend=False)
+def render_financial_impact_by_industry(industryImpact, outputPath, figsize=(12, 8), dpi=300, palette='viridis'):
+    plt.figure(figsize=figsize)
+    sns.barplot(y=industryImpact.index.astype(str), x=industryImpact.values, hue=industryImpact.index.astype(str), palette=palette, legend=False)
     plt.title('Average Financial Loss by Industry', fontsize=16)
     plt.xlabel('Average Financial Loss (Million $)', fontsize=14)
     plt.ylabel('Industry', fontsize=14)
     plt.tight_layout()
-    plt.savefig(outputDir / 'financial_impact_by_industry.png', dpi=300, bbox_inches='tight')
-    plt.close()
-    plt.figure(figsize=(14, 8))
-    sns.boxplot(data=df, x='Target Industry Standardized', y='Financial Loss (in Million $)',
-              hue='Target Industry Standardized', palette='muted', legend=False)
+    save_chart(outputPath, dpi)
+def render_financial_loss_distribution(lossData, outputPath, figsize=(14, 8), dpi=300, palette='muted'):
+    plt.figure(figsize=figsize)
+    sns.boxplot(data=lossData.astype({'Target Industry Standardized': str}), x='Target Industry Standardized', y='Financial Loss (in Million $)',
+              hue='Target Industry Standardized', palette=palette, legend=False)
     plt.title('Financial Loss Distribution by Industry', fontsize=16)
     plt.xlabel('Industry', fontsize=14)
     plt.ylabel('Financial Loss (Million $)', fontsize=14)
     plt.xticks(rotation=45, ha='right')
     plt.tight_layout()
-    plt.savefig(outputDir / 'financial_loss_distribution.png', dpi=300, bbox_inches='tight')
-    plt.close()
-    plt.figure(figsize=(16, 10))
-    heatmapData = df.pivot_table(
-        values='Financial Loss (in Million $)',
-        index='Target Industry Standardized',
-        columns='Attack Type',
-        aggfunc='mean'
-    )
-    sns.heatmap(heatmapData, annot=True, cmap='YlOrRd', fmt='.2f', linewidths=.5)
+    save_chart(outputPath, dpi)
+def render_financial_impact_heatmap(heatmapData, outputPath, figsize=(16, 10), dpi=300, palette='YlOrRd'):
+    plt.figure(figsize=figsize)
+    sns.heatmap(heatmapData, annot=True, cmap=palette, fmt='.2f', linewidths=.5)
     plt.title('Average Financial Loss by Industry and Attack Type (Million $)', fontsize=16)
     plt.tight_layout()
-    plt.savefig(outputDir / 'financial_impact_heatmap.png', dpi=300, bbox_inches='tight')
-    plt.close()
-    plt.figure(figsize=(12, 8))
-    sns.scatterplot(
-        data=df,
+    save_chart(outputPath, dpi)
+def render_financial_loss_vs_users(scatterData, outputPath, figsize=(12, 8), dpi=300, palette=None,
+                                   largeMode='density', pointThreshold=DEFAULT_POINT_THRESHOLD):
+    plt.figure(figsize=figsize)
+    large_scatter(
+        scatterData,
         x='Number of Affected Users',
         y='Financial Loss (in Million $)',
         hue='Attack Type',
         size='Incident Resolution Time (in Hours)',
         sizes=(20, 200),
-        alpha=0.7
+        alpha=0.7,
+        palette=palette,
+        largeMode=largeMode,
+        pointThreshold=pointThreshold
     )
     plt.title('Financial Loss vs. Number of Affected Users', fontsize=16)
     plt.xlabel('Number of Affected Users', fontsize=14)
@@ -87,64 +109,85 @@ def generate_financial_analysis(df, outputDir):
     plt.grid(True, alpha=0.3)
     plt.legend(bbox_to_anchor=(1.05, 1), loc='upper left')
     plt.tight_layout()
-    plt.savefig(outputDir / 'financial_loss_vs_users.png', dpi=300, bbox_inches='tight')
-    plt.close()
-def generate_attack_analysis(df, outputDir):
-    print("Generating attack pattern analysis...")
-    sns.set_style("whitegrid")
-    plt.rcParams['font.family'] = 'sans-serif'
-    plt.figure(figsize=(12, 10))
-    attackCounts = df['Attack Type'].value_counts()
+    save_chart(outputPath, dpi)
+@requires_columns('Target Industry Standardized', 'Attack Type', 'Financial Loss (in Million $)', 'Number of Affected Users',
+                  'Incident Resolution Time (in Hours)')
+def build_financial_jobs(df=None, aggregates=None):
+    aggregates = aggregates if aggregates is not None else AggregationCache(df)
+    industryImpact = aggregates.groupby('Target Industry Standardized', 'Financial Loss (in Million $)', 'mean').sort_values()
+    heatmapData = aggregates.pivot('Target Industry Standardized', 'Attack Type', 'Financial Loss (in Million $)', 'mean')
+    caption = aggregates.sample_caption()
+    return [
+        ChartJob('financial_impact_by_industry.png', render_financial_impact_by_industry, industryImpact),
+        ChartJob('financial_loss_distribution.png', render_financial_loss_distribution,
+                 aggregates.raw(['Target Industry Standardized', 'Financial Loss (in Million $)']), caption=caption),
+        ChartJob('financial_impact_heatmap.png', render_financial_impact_heatmap, heatmapData),
+        ChartJob('financial_loss_vs_users.png', render_financial_loss_vs_users,
+                 aggregates.raw(['Number of Affected Users', 'Financial Loss (in Million $)', 'Attack Type', 'Incident Resolution Time (in Hours)']),
+                 caption=caption, **scatter_options())
+    ]
+def generate_financial_analysis(df, outputDir, maxWorkers=None, aggregates=None, forceRender=None):
+    print("Generating financial impact analysis...")
+    return run_chart_jobs(build_financial_jobs(df, aggregates), outputDir, maxWorkers, forceRender)
+def render_attack_type_distribution(attackCounts, outputPath, figsize=(12, 10), dpi=300):
+    plt.figure(figsize=figsize)
     explode = [0.1 if i == 0 else 0.05 if i == 1 else 0 for i in range(len(attackCounts))]
     plt.pie(attackCounts, labels=attackCounts.index, autopct='%1.1f%%',
             startangle=90, explode=explode, shadow=True, textprops={'fontsize': 12})
     plt.title('Distribution of Attack Types', fontsize=16)
     plt.axis('equal')
     plt.tight_layout()
-    plt.savefig(outputDir / 'attack_type_distribution.png', dpi=300, bbox_inches='tight')
-    plt.close()
-    plt.figure(figsize=(14, 10))
-    attackSourceCross = pd.crosstab(df['Attack Type'], df['Attack Source'])
-    attackSourcePct = attackSourceCross.div(attackSourceCross.sum(axis=1), axis=0) * 100
-    attackSourcePct.plot(kind='bar', stacked=True, figsize=(14, 8), colormap='tab20')
+    save_chart(outputPath, dpi)
+def render_attack_source_by_type(attackSourcePct, outputPath, figsize=(14, 8), dpi=300, palette='tab20'):
+    attackSourcePct.plot(kind='bar', stacked=True, figsize=figsize, colormap=palette)
     plt.title('Attack Sources by Attack Type (%)', fontsize=16)
     plt.xlabel('Attack Type', fontsize=14)
     plt.ylabel('Percentage', fontsize=14)
     plt.legend(title='Attack Source', bbox_to_anchor=(1.05, 1), loc='upper left')
     plt.tight_layout()
-    plt.savefig(outputDir / 'attack_source_by_type.png', dpi=300, bbox_inches='tight')
-    plt.close()
-    plt.figure(figsize=(16, 10))
-    industryAttackTable = pd.crosstab(df['Target Industry Standardized'], df['Attack Type'])
-    industryAttackTablePct = industryAttackTable.div(industryAttackTable.sum(axis=1), axis=0) * 100
-    sns.heatmap(industryAttackTablePct, annot=True, cmap='YlGnBu', fmt='.1f', linewidths=.5)
+    save_chart(outputPath, dpi)
+def render_attack_type_by_industry(industryAttackTablePct, outputPath, figsize=(16, 10), dpi=300, palette='YlGnBu'):
+    plt.figure(figsize=figsize)
+    sns.heatmap(industryAttackTablePct, annot=True, cmap=palette, fmt='.1f', linewidths=.5)
     plt.title('Attack Type Distribution by Industry (%)', fontsize=16)
     plt.tight_layout()
-    plt.savefig(outputDir / 'attack_type_by_industry.png', dpi=300, bbox_inches='tight')
-    plt.close()
-    plt.figure(figsize=(14, 10))
-    countryAttacks = df['Country'].value_counts()
-    sns.barplot(y=countryAttacks.index[:10], x=countryAttacks.values[:10],
-              hue=countryAttacks.index[:10], palette='crest', legend=False)
+    save_chart(outputPath, dpi)
+def render_geographic_attack_distribution(countryAttacks, outputPath, figsize=(14, 10), dpi=300, palette='crest'):
+    plt.figure(figsize=figsize)
+    sns.barplot(y=countryAttacks.index[:10].astype(str), x=countryAttacks.values[:10],
+              hue=countryAttacks.index[:10].astype(str), palette=palette, legend=False)
     plt.title('Top 10 Countries by Number of Cybersecurity Incidents', fontsize=16)
     plt.xlabel('Number of Incidents', fontsize=14)
     plt.ylabel('Country', fontsize=14)
     plt.tight_layout()
-    plt.savefig(outputDir / 'geographic_attack_distribution.png', dpi=300, bbox_inches='tight')
-    plt.close()
-def generate_vulnerability_analysis(df, outputDir):
-    print("Generating vulnerability and resolution time analysis...")
-    sns.set_style("whitegrid")
-    plt.rcParams['font.family'] = 'sans-serif'
-    plt.figure(figsize=(16, 10))
-    resTimeByIndVuln = df.groupby(['Target Industry Standardized', 'Security Vulnerability Type'])['Incident Resolution Time (in Hours)'].mean().reset_index()
+    save_chart(outputPath, dpi)
+@requires_columns('Attack Type', 'Attack Source', 'Country', 'Target Industry Standardized')
+def build_attack_jobs(df=None, aggregates=None):
+    aggregates = aggregates if aggregates is not None else AggregationCache(df)
+    attackCounts = aggregates.value_counts('Attack Type')
+    attackSourceCross = aggregates.crosstab('Attack Type', 'Attack Source')
+    attackSourcePct = attackSourceCross.div(attackSourceCross.sum(axis=1), axis=0) * 100
+    industryAttackTable = aggregates.crosstab('Target Industry Standardized', 'Attack Type')
+    industryAttackTablePct = industryAttackTable.div(industryAttackTable.sum(axis=1), axis=0) * 100
+    countryAttacks = aggregates.value_counts('Country')
+    return [
+        ChartJob('attack_type_distribution.png', render_attack_type_distribution, attackCounts),
+        ChartJob('attack_source_by_type.png', render_attack_source_by_type, attackSourcePct),
+        ChartJob('attack_type_by_industry.png', render_attack_type_by_industry, industryAttackTablePct),
+        ChartJob('geographic_attack_distribution.png', render_geographic_attack_distribution, countryAttacks)
+    ]
+def generate_attack_analysis(df, outputDir, maxWorkers=None, aggregates=None, forceRender=None):
+    print("Generating attack pattern analysis...")
+    return run_chart_jobs(build_attack_jobs(df, aggregates), outputDir, maxWorkers, forceRender)
+def render_resolution_by_industry_vulnerability(resTimeByIndVuln, outputPath, figsize=(16, 10), dpi=300, palette='dark'):
+    plt.figure(figsize=figsize)
     g = sns.catplot(
         data=resTimeByIndVuln,
         kind="bar",
         x="Target Industry Standardized",
         y="Incident Resolution Time (in Hours)",
         hue="Security Vulnerability Type",
-        palette="dark",
+        palette=palette,
         alpha=.6,
         height=8,
         aspect=2
@@ -152,23 +195,17 @@ def generate_vulnerability_analysis(df, outputDir):
     g.set_xticklabels(rotation=45, ha="right")
     g.fig.suptitle('Average Resolution Time by Industry and Vulnerability Type', fontsize=16, y=1.02)
     g.set_axis_labels("Industry", "Resolution Time (Hours)")
-    plt.savefig(outputDir / 'resolution_by_industry_vulnerability.png', dpi=300, bbox_inches='tight')
-    plt.close()
-    plt.figure(figsize=(12, 8))
-    vulnCounts = df['Security Vulnerability Type'].value_counts()
+    save_chart(outputPath, dpi)
+def render_vulnerability_distribution(vulnCounts, outputPath, figsize=(12, 8), dpi=300):
+    plt.figure(figsize=figsize)
     plt.pie(vulnCounts, labels=vulnCounts.index, autopct='%1.1f%%',
             startangle=90, wedgeprops=dict(width=0.5), textprops={'fontsize': 12})
     plt.title('Distribution of Security Vulnerabilities', fontsize=16)
     plt.axis('equal')
     plt.tight_layout()
-    plt.savefig(outputDir / 'vulnerability_distribution.png', dpi=300, bbox_inches='tight')
-    plt.close()
-    plt.figure(figsize=(12, 8))
-    vulnGroup = df.groupby('Security Vulnerability Type').agg({
-        'Incident Resolution Time (in Hours)': 'mean',
-        'Financial Loss (in Million $)': 'mean',
-        'Number of Affected Users': 'mean'
-    }).reset_index()
+    save_chart(outputPath, dpi)
+def render_resolution_vs_loss_by_vulnerability(vulnGroup, outputPath, figsize=(12, 8), dpi=300, palette=None):
+    plt.figure(figsize=figsize)
     sns.scatterplot(
         data=vulnGroup,
         x='Incident Resolution Time (in Hours)',
@@ -176,71 +213,116 @@ def generate_vulnerability_analysis(df, outputDir):
         size='Number of Affected Users',
         hue='Security Vulnerability Type',
         sizes=(100, 2000),
-        alpha=0.7
+        alpha=0.7,
+        palette=palette
     )
     plt.title('Resolution Time vs. Financial Loss by Vulnerability Type', fontsize=16)
     plt.xlabel('Average Resolution Time (Hours)', fontsize=14)
     plt.ylabel('Average Financial Loss (Million $)', fontsize=14)
     plt.grid(True, alpha=0.3)
     plt.tight_layout()
-    plt.savefig(outputDir / 'resolution_vs_loss_by_vulnerability.png', dpi=300, bbox_inches='tight')
-    plt.close()
-    plt.figure(figsize=(14, 8))
-    sns.violinplot(data=df, x='Defense Mechanism Used', y='Incident Resolution Time (in Hours)',
-                  hue='Defense Mechanism Used', palette='muted', legend=False)
+    save_chart(outputPath, dpi)
+def render_defense_mechanism_effectiveness(resolutionData, outputPath, figsize=(14, 8), dpi=300, palette='muted'):
+    plt.figure(figsize=figsize)
+    draw_violins(resolutionData, 'Defense Mechanism Used', 'Incident Resolution Time (in Hours)', palette=palette)
     plt.title('Resolution Time Distribution by Defense Mechanism', fontsize=16)
     plt.xlabel('Defense Mechanism', fontsize=14)
     plt.ylabel('Resolution Time (Hours)', fontsize=14)
     plt.xticks(rotation=45, ha='right')
     plt.tight_layout()
-    plt.savefig(outputDir / 'defense_mechanism_effectiveness.png', dpi=300, bbox_inches='tight')
-    plt.close()
-def generate_correlation_analysis(df, outputDir):
-    print("Generating correlation analysis...")
-    sns.set_style("whitegrid")
-    plt.rcParams['font.family'] = 'sans-serif'
-    plt.figure(figsize=(12, 10))
-    numericColumns = df.select_dtypes(include=[np.number]).columns
-    corr = df[numericColumns].corr()
+    save_chart(outputPath, dpi)
+@requires_columns('Target Industry Standardized', 'Security Vulnerability Type', 'Defense Mechanism Used',
+                  'Financial Loss (in Million $)', 'Number of Affected Users', 'Incident Resolution Time (in Hours)')
+def build_vulnerability_jobs(df=None, aggregates=None):
+    aggregates = aggregates if aggregates is not None else AggregationCache(df)
+    resTimeByIndVuln = aggregates.groupby(['Target Industry Standardized', 'Security Vulnerability Type'], 'Incident Resolution Time (in Hours)', 'mean').reset_index()
+    vulnCounts = aggregates.value_counts('Security Vulnerability Type')
+    vulnGroup = aggregates.summary('Security Vulnerability Type', {
+        measure: (measure, 'mean')
+        for measure in ['Incident Resolution Time (in Hours)', 'Financial Loss (in Million $)', 'Number of Affected Users']
+    })
+    caption = aggregates.sample_caption()
+    return [
+        ChartJob('resolution_by_industry_vulnerability.png', render_resolution_by_industry_vulnerability, resTimeByIndVuln),
+        ChartJob('vulnerability_distribution.png', render_vulnerability_distribution, vulnCounts),
+        ChartJob('resolution_vs_loss_by_vulnerability.png', render_resolution_vs_loss_by_vulnerability, vulnGroup),
+        ChartJob('defense_mechanism_effectiveness.png', render_defense_mechanism_effectiveness,
+                 aggregates.raw(['Defense Mechanism Used', 'Incident Resolution Time (in Hours)']), caption=caption)
+    ]
+def generate_vulnerability_analysis(df, outputDir, maxWorkers=None, aggregates=None, forceRender=None):
+    print("Generating vulnerability and resolution time analysis...")
+    return run_chart_jobs(build_vulnerability_jobs(df, aggregates), outputDir, maxWorkers, forceRender)
+def render_correlation_matrix(corr, outputPath, figsize=(12, 10), dpi=300):
+    plt.figure(figsize=figsize)
     mask = np.triu(np.ones_like(corr, dtype=bool))
     cmap = sns.diverging_palette(230, 20, as_cmap=True)
     sns.heatmap(corr, mask=mask, cmap=cmap, vmax=.3, center=0,
                 square=True, linewidths=.5, annot=True, fmt='.2f')
     plt.title('Correlation Matrix of Numeric Variables', fontsize=16)
     plt.tight_layout()
-    plt.savefig(outputDir / 'correlation_matrix.png', dpi=300, bbox_inches='tight')
-    plt.close()
-    plt.figure(figsize=(12, 8))
-    plt.hexbin(df['Incident Resolution Time (in Hours)'],
-               df['Financial Loss (in Million $)'],
-               gridsize=30, cmap='viridis', mincnt=1)
+    save_chart(outputPath, dpi)
+def render_resolution_vs_loss_hexbin(pointData, outputPath, figsize=(12, 8), dpi=300, palette='viridis'):
+    plt.figure(figsize=figsize)
+    plt.hexbin(pointData['Incident Resolution Time (in Hours)'],
+               pointData['Financial Loss (in Million $)'],
+               gridsize=30, cmap=palette, mincnt=1)
     plt.colorbar(label='Count')
     plt.title('Resolution Time vs. Financial Loss', fontsize=16)
     plt.xlabel('Resolution Time (Hours)', fontsize=14)
     plt.ylabel('Financial Loss (Million $)', fontsize=14)
     plt.grid(True, alpha=0.3)
     plt.tight_layout()
-    plt.savefig(outputDir / 'resolution_vs_loss_hexbin.png', dpi=300, bbox_inches='tight')
-    plt.close()
-    plt.figure(figsize=(16, 12))
-    g = sns.FacetGrid(df, col="Attack Source", row="Security Vulnerability Type",
-                    height=5, aspect=1.2, sharey=False)
-    g.map_dataframe(sns.histplot, x="Financial Loss (in Million $)", bins=20, kde=True)
-    g.set_axis_labels("Financial Loss (Million $)", "Count")
-    g.set_titles(col_template="{col_name}", row_template="{row_name}")
-    g.fig.suptitle('Financial Loss Distribution by Attack Source and Vulnerability Type',
+    save_chart(outputPath, dpi)
+def render_loss_by_source_vulnerability(facetData, outputPath, height=5, aspect=1.2, bins=20, dpi=300):
+    rowCodes, rowLabels = factorize_keys(facetData['Security Vulnerability Type'])
+    colCodes, colLabels = factorize_keys(facetData['Attack Source'])
+    facetIds = np.where((rowCodes >= 0) & (colCodes >= 0), rowCodes * len(colLabels) + colCodes, -1)
+    facetStats = GroupedStatistics(pd.Series(pd.Categorical.from_codes(facetIds, range(len(rowLabels) * len(colLabels)))),
+                                   facetData['Financial Loss (in Million $)'])
+    table = facetStats.table
+    groupIds = np.repeat(np.arange(len(table)), facetStats.counts)
+    lower, upper = table['min'].to_numpy(), table['max'].to_numpy()
+    edges, heights = grouped_histograms(facetStats.sortedValues, groupIds, lower, upper, bins)
+    support, density = binned_kde(facetStats.sortedValues, groupIds, facetStats.counts, table['std'].to_numpy(), lower, upper)
+    fig, axes = plt.subplots(len(rowLabels), len(colLabels), figsize=(len(colLabels) * height * aspect, len(rowLabels) * height),
+                             sharex=True, squeeze=False)
+    color = plt.rcParams['axes.prop_cycle'].by_key()['color'][0]
+    bars = []
+    for groupId, facet in enumerate(table.index):
+        ax = axes[facet // len(colLabels), facet % len(colLabels)]
+        widths = np.diff(edges[groupId])
+        bars.extend(ax.bar(edges[groupId][:-1], heights[groupId], widths, align='edge', facecolor=to_rgba(color, 0.5),
+                           edgecolor=plt.rcParams['patch.edgecolor']))
+        ax.plot(support[groupId], density[groupId] * facetStats.counts[groupId] * widths[0], color=color)
+    axes[0, 0].autoscale_view()
+    binWidth = np.diff(edges, axis=1).min()
+    barPoints = 72 / fig.dpi * abs(np.diff(axes[0, 0].transData.transform([[0, 0], [binWidth, 0]])[:, 0]))[0]
+    for bar in bars:
+        bar.set_linewidth(0.1 * barPoints)
+    for rowIdx, rowLabel in enumerate(rowLabels):
+        for colIdx, colLabel in enumerate(colLabels):
+            ax = axes[rowIdx, colIdx]
+            ax.set_title(f"{rowLabel} | {colLabel}", fontsize=plt.rcParams['axes.labelsize'])
+            ax.set_xlabel("Financial Loss (Million $)" if rowIdx == len(rowLabels) - 1 else '')
+            ax.set_ylabel("Count" if colIdx == 0 else '')
+    sns.despine(fig)
+    fig.suptitle('Financial Loss Distribution by Attack Source and Vulnerability Type',
                  fontsize=16, y=1.02)
-    g.tight_layout()
-    plt.savefig(outputDir / 'loss_by_source_vulnerability.png', dpi=300, bbox_inches='tight')
-    plt.close()
-    plt.figure(figsize=(12, 8))
-    sns.scatterplot(
-        data=df,
+    fig.tight_layout()
+    save_chart(outputPath, dpi)
+def render_users_vs_resolution(scatterData, outputPath, figsize=(12, 8), dpi=300, palette=None,
+                               largeMode='density', pointThreshold=DEFAULT_POINT_THRESHOLD):
+    plt.figure(figsize=figsize)
+    large_scatter(
+        scatterData,
         x='Number of Affected Users',
         y='Incident Resolution Time (in Hours)',
         hue='Attack Type',
         style='Attack Source',
-        alpha=0.7
+        alpha=0.7,
+        palette=palette,
+        largeMode=largeMode,
+        pointThreshold=pointThreshold
     )
     plt.title('Affected Users vs. Resolution Time by Attack Type', fontsize=16)
     plt.xlabel('Number of Affected Users', fontsize=14)
@@ -248,70 +330,78 @@ def generate_correlation_analysis(df, outputDir):
     plt.grid(True, alpha=0.3)
     plt.legend(bbox_to_anchor=(1.05, 1), loc='upper left')
     plt.tight_layout()
-    plt.savefig(outputDir / 'users_vs_resolution.png', dpi=300, bbox_inches='tight')
-    plt.close()
-def generate_trend_analysis(df, outputDir):
-    print("Generating trend analysis...")
-    sns.set_style("whitegrid")
-    plt.rcParams['font.family'] = 'sans-serif'
-    plt.figure(figsize=(14, 8))
-    yearlyAttacks = df.groupby(['Year', 'Attack Type']).size().unstack()
-    yearlyAttacks.plot(marker='o', linewidth=2.5)
-    plt.title('Evolution of Attack Types Over Time', fontsize=16)
+    save_chart(outputPath, dpi)
+@requires_columns(*NUMERIC_COLUMNS, 'Attack Type', 'Attack Source', 'Security Vulnerability Type')
+def build_correlation_jobs(df=None, aggregates=None):
+    aggregates = aggregates if aggregates is not None else AggregationCache(df)
+    corr = aggregates.corr(NUMERIC_COLUMNS)
+    caption = aggregates.sample_caption()
+    return [
+        ChartJob('correlation_matrix.png', render_correlation_matrix, corr),
+        ChartJob('resolution_vs_loss_hexbin.png', render_resolution_vs_loss_hexbin,
+                 aggregates.raw(['Incident Resolution Time (in Hours)', 'Financial Loss (in Million $)']), caption=caption),
+        ChartJob('loss_by_source_vulnerability.png', render_loss_by_source_vulnerability,
+                 aggregates.raw(['Attack Source', 'Security Vulnerability Type', 'Financial Loss (in Million $)']), caption=caption),
+        ChartJob('users_vs_resolution.png', render_users_vs_resolution,
+                 aggregates.raw(['Number of Affected Users', 'Incident Resolution Time (in Hours)', 'Attack Type', 'Attack Source']),
+                 caption=caption, **scatter_options())
+    ]
+def generate_correlation_analysis(df, outputDir, maxWorkers=None, aggregates=None, forceRender=None):
+    print("Generating correlation analysis...")
+    return run_chart_jobs(build_correlation_jobs(df, aggregates), outputDir, maxWorkers, forceRender)
+def render_yearly_counts(yearlyCounts, outputPath, title='', legendTitle='', figsize=(14, 8), dpi=300):
+    plt.figure(figsize=figsize)
+    yearlyCounts.plot(marker='o', linewidth=2.5)
+    plt.title(title, fontsize=16)
     plt.xlabel('Year', fontsize=14)
     plt.ylabel('Number of Incidents', fontsize=14)
     plt.grid(True, alpha=0.3)
-    plt.legend(title='Attack Type', bbox_to_anchor=(1.05, 1), loc='upper left')
+    plt.legend(title=legendTitle, bbox_to_anchor=(1.05, 1), loc='upper left')
     plt.tight_layout()
-    plt.savefig(outputDir / 'attack_evolution.png', dpi=300, bbox_inches='tight')
-    plt.close()
-    plt.figure(figsize=(14, 8))
-    yearlyLossByIndustry = df.groupby(['Year', 'Target Industry Standardized'])['Financial Loss (in Million $)'].mean().reset_index()
+    save_chart(outputPath, dpi)
+def render_yearly_means(yearlyMeans, outputPath, measure='', hue='', title='', ylabel='', legendTitle='',
+                        figsize=(14, 8), dpi=300, palette=None):
+    plt.figure(figsize=figsize)
     sns.lineplot(
-        data=yearlyLossByIndustry,
+        data=yearlyMeans,
         x='Year',
-        y='Financial Loss (in Million $)',
-        hue='Target Industry Standardized',
+        y=measure,
+        hue=hue,
         marker='o',
-        linewidth=2.5
+        linewidth=2.5,
+        palette=palette
     )
-    plt.title('Financial Loss Trends by Industry', fontsize=16)
+    plt.title(title, fontsize=16)
     plt.xlabel('Year', fontsize=14)
-    plt.ylabel('Average Financial Loss (Million $)', fontsize=14)
+    plt.ylabel(ylabel, fontsize=14)
     plt.grid(True, alpha=0.3)
-    plt.legend(title='Industry', bbox_to_anchor=(1.05, 1), loc='upper left')
+    plt.legend(title=legendTitle, bbox_to_anchor=(1.05, 1), loc='upper left')
     plt.tight_layout()
-    plt.savefig(outputDir / 'financial_loss_trends.png', dpi=300, bbox_inches='tight')
-    plt.close()
-    plt.figure(figsize=(14, 8))
-    yearlyResolutionByAttack = df.groupby(['Year', 'Attack Type'])['Incident Resolution Time (in Hours)'].mean().reset_index()
-    sns.lineplot(
-        data=yearlyResolutionByAttack,
-        x='Year',
-        y='Incident Resolution Time (in Hours)',
-        hue='Attack Type',
-        marker='o',
-        linewidth=2.5
-    )
-    plt.title('Resolution Time Trends by Attack Type', fontsize=16)
-    plt.xlabel('Year', fontsize=14)
-    plt.ylabel('Average Resolution Time (Hours)', fontsize=14)
-    plt.grid(True, alpha=0.3)
-    plt.legend(title='Attack Type', bbox_to_anchor=(1.05, 1), loc='upper left')
-    plt.tight_layout()
-    plt.savefig(outputDir / 'resolution_time_trends.png', dpi=300, bbox_inches='tight')
-    plt.close()
-    plt.figure(figsize=(14, 8))
-    yearlyVulnerabilities = df.groupby(['Year', 'Security Vulnerability Type']).size().unstack()
-    yearlyVulnerabilities.plot(marker='o', linewidth=2.5)
-    plt.title('Vulnerability Exploitation Trends', fontsize=16)
-    plt.xlabel('Year', fontsize=14)
-    plt.ylabel('Number of Incidents', fontsize=14)
-    plt.grid(True, alpha=0.3)
-    plt.legend(title='Vulnerability Type', bbox_to_anchor=(1.05, 1), loc='upper left')
-    plt.tight_layout()
-    plt.savefig(outputDir / 'vulnerability_trends.png', dpi=300, bbox_inches='tight')
-    plt.close()
+    save_chart(outputPath, dpi)
+@requires_columns('Year', 'Attack Type', 'Target Industry Standardized', 'Security Vulnerability Type',
+                  'Financial Loss (in Million $)', 'Incident Resolution Time (in Hours)')
+def build_trend_jobs(df=None, aggregates=None):
+    aggregates = aggregates if aggregates is not None else AggregationCache(df)
+    yearlyAttacks = aggregates.pivot('Year', 'Attack Type')
+    yearlyLossByIndustry = aggregates.groupby(['Year', 'Target Industry Standardized'], 'Financial Loss (in Million $)', 'mean').reset_index()
+    yearlyResolutionByAttack = aggregates.groupby(['Year', 'Attack Type'], 'Incident Resolution Time (in Hours)', 'mean').reset_index()
+    yearlyVulnerabilities = aggregates.pivot('Year', 'Security Vulnerability Type')
+    return [
+        ChartJob('attack_evolution.png', render_yearly_counts, yearlyAttacks,
+                 title='Evolution of Attack Types Over Time', legendTitle='Attack Type'),
+        ChartJob('financial_loss_trends.png', render_yearly_means, yearlyLossByIndustry,
+                 measure='Financial Loss (in Million $)', hue='Target Industry Standardized',
+                 title='Financial Loss Trends by Industry', ylabel='Average Financial Loss (Million $)', legendTitle='Industry'),
+        ChartJob('resolution_time_trends.png', render_yearly_means, yearlyResolutionByAttack,
+                 measure='Incident Resolution Time (in Hours)', hue='Attack Type',
+                 title='Resolution Time Trends by Attack Type', ylabel='Average Resolution Time (Hours)', legendTitle='Attack Type'),
+        ChartJob('vulnerability_trends.png', render_yearly_counts, yearlyVulnerabilities,
+                 title='Vulnerability Exploitation Trends', legendTitle='Vulnerability Type')
+    ]
+def generate_trend_analysis(df, outputDir, maxWorkers=None, aggregates=None, forceRender=None):
+    print("Generating trend analysis...")
+    return run_chart_jobs(build_trend_jobs(df, aggregates), outputDir, maxWorkers, forceRender)
+ENHANCED_STAGES = [build_financial_jobs, build_attack_jobs, build_vulnerability_jobs, build_correlation_jobs, build_trend_jobs]
 def create_pure_analysis_dashboard(vizDir, dashboardDir):
     from src.dashboard.html_generator import generate_dashboard_html
     visualizationFiles = [f for f in os.listdir(vizDir) if f.endswith('.png')]
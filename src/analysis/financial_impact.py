@@ -4,103 +4,84 @@ import seaborn as sns
 import numpy as np
 from pathlib import Path
 import os
-def analyze_financial_impact():
-    print("Starting financial impact analysis...")
-    outputDir = Path('analysis/output')
-    outputDir.mkdir(exist_ok=True, parents=True)
-    dataPath = Path('../Enhanced_Cybersecurity_Data.csv')
-    try:
-        df = pd.read_csv(dataPath)
-        print(f"Loaded data with {len(df)} records")
-    except Exception as e:
-        print(f"Error loading data: {e}")
-        return
-    sns.set_style("whitegrid")
-    plt.rcParams['font.family'] = 'sans-serif'
-    plt.rcParams['font.sans-serif'] = 'Arial'
-    plt.figure(figsize=(12, 8))
-    industryImpact = df.groupby('Target Industry Standardized')['Financial Loss (in Million $)'].mean().sort_values(ascending=False)
-    ax = sns.barplot(x=industryImpact.index, y=industryImpact.values, palette='viridis')
-    plt.title('Average Financial Loss by Industry', fontsize=16, pad=20)
-    plt.xlabel('Industry', fontsize=14)
-    plt.ylabel('Average Financial Loss (Million $)', fontsize=14)
-    plt.xticks(rotation=45, ha='right')
-    plt.tight_layout()
-    for i, v in enumerate(industryImpact.values):
-        ax.text(i, v + 1, f'{v:.2f}', ha='center', fontsize=10)
-    plt.savefig(outputDir / 'financial_impact_by_industry.png', dpi=300, bbox_inches='tight')
-    plt.close()
-    plt.figure(figsize=(14, 8))
-    attackImpact = df.groupby('Attack Type Detailed')['Financial Loss (in Million $)'].mean().sort_values(ascending=False)
-    ax = sns.barplot(x=attackImpact.index, y=attackImpact.values, palette='magma')
-    plt.title('Average Financial Loss by Attack Type', fontsize=16, pad=20)
-    plt.xlabel('Attack Type', fontsize=14)
-    plt.ylabel('Average Financial Loss (Million $)', fontsize=14)
-    plt.xticks(rotation=45, ha='right')
-    plt.tight_layout()
-    for i, v in enumerate(attackImpact.values):
-        ax.text(i, v + 1, f'{v:.2f}', ha='center', fontsize=10)
-    plt.savefig(outputDir / 'financial_impact_by_attack.png', dpi=300, bbox_inches='tight')
-    plt.close()
-    plt.figure(figsize=(10, 8))
-    sns.violinplot(data=df, x='Target Industry Standardized', y='Financial Loss (in Million $)', palette='muted')
+from src.utils.dataset_context import DatasetContext
+from src.utils.schema import required_columns, requires_columns
+from src.utils.visualization_utils import draw_violins, render_labeled_bar
+from src.visualization.chart_jobs import CHART_RC, ChartJob, run_chart_jobs, save_chart
+def render_financial_impact_distribution(lossData, outputPath, figsize=(10, 8), dpi=300, palette='muted'):
+    plt.figure(figsize=figsize)
+    draw_violins(lossData, 'Target Industry Standardized', 'Financial Loss (in Million $)', palette=palette)
     plt.title('Financial Loss Distribution by Industry', fontsize=16, pad=20)
     plt.xlabel('Industry', fontsize=14)
     plt.ylabel('Financial Loss (Million $)', fontsize=14)
     plt.xticks(rotation=45, ha='right')
     plt.tight_layout()
-    plt.savefig(outputDir / 'financial_impact_distribution.png', dpi=300, bbox_inches='tight')
-    plt.close()
-    plt.figure(figsize=(16, 10))
-    heatmapData = df.pivot_table(
-        values='Financial Loss (in Million $)',
-        index='Target Industry Standardized',
-        columns='Attack Type',
-        aggfunc='mean'
-    )
-    sns.heatmap(heatmapData, annot=True, cmap='YlOrRd', fmt='.2f', linewidths=.5)
+    save_chart(outputPath, dpi)
+def render_financial_impact_heatmap(heatmapData, outputPath, figsize=(16, 10), dpi=300, palette='YlOrRd'):
+    plt.figure(figsize=figsize)
+    sns.heatmap(heatmapData, annot=True, cmap=palette, fmt='.2f', linewidths=.5)
     plt.title('Average Financial Loss by Industry and Attack Type (Million $)', fontsize=16, pad=20)
     plt.tight_layout()
-    plt.savefig(outputDir / 'financial_impact_heatmap.png', dpi=300, bbox_inches='tight')
-    plt.close()
-    plt.figure(figsize=(14, 8))
-    yearlyImpact = df.groupby(['Year', 'Target Industry Standardized'])['Financial Loss (in Million $)'].mean().reset_index()
+    save_chart(outputPath, dpi)
+def render_financial_impact_trends(yearlyImpact, outputPath, figsize=(14, 8), dpi=300, palette=None):
+    plt.figure(figsize=figsize)
     sns.lineplot(data=yearlyImpact, x='Year', y='Financial Loss (in Million $)',
-                hue='Target Industry Standardized', marker='o', linewidth=2.5)
+                hue='Target Industry Standardized', marker='o', linewidth=2.5, palette=palette)
     plt.title('Financial Loss Trends by Industry (2015-2024)', fontsize=16, pad=20)
     plt.xlabel('Year', fontsize=14)
     plt.ylabel('Average Financial Loss (Million $)', fontsize=14)
     plt.grid(True, alpha=0.3)
     plt.legend(title='Industry', bbox_to_anchor=(1.05, 1), loc='upper left')
     plt.tight_layout()
-    plt.savefig(outputDir / 'financial_impact_trends.png', dpi=300, bbox_inches='tight')
-    plt.close()
-    plt.figure(figsize=(12, 8))
-    vulnerabilityImpact = df.groupby('Security Vulnerability Type')['Financial Loss (in Million $)'].mean().sort_values(ascending=False)
-    ax = sns.barplot(x=vulnerabilityImpact.index, y=vulnerabilityImpact.values, palette='crest')
-    plt.title('Average Financial Loss by Security Vulnerability Type', fontsize=16, pad=20)
-    plt.xlabel('Vulnerability Type', fontsize=14)
-    plt.ylabel('Average Financial Loss (Million $)', fontsize=14)
-    plt.tight_layout()
-    for i, v in enumerate(vulnerabilityImpact.values):
-        ax.text(i, v + 1, f'{v:.2f}', ha='center', fontsize=10)
-    plt.savefig(outputDir / 'financial_impact_by_vulnerability.png', dpi=300, bbox_inches='tight')
-    plt.close()
+    save_chart(outputPath, dpi)
+@requires_columns('Year', 'Attack Type', 'Attack Type Detailed', 'Target Industry Standardized', 'Security Vulnerability Type',
+                  'Financial Loss (in Million $)')
+def analyze_financial_impact(context=None, maxWorkers=None, forceRender=None):
+    print("Starting financial impact analysis...")
+    outputDir = Path('analysis/output')
+    outputDir.mkdir(exist_ok=True, parents=True)
+    if context is None:
+        context = DatasetContext(Path('../Enhanced_Cybersecurity_Data.csv'), columns=required_columns(analyze_financial_impact))
+    aggregates = context.aggregates
+    if aggregates is None:
+        return
+    industryImpact = aggregates.groupby('Target Industry Standardized', 'Financial Loss (in Million $)', 'mean').sort_values(ascending=False)
+    attackImpact = aggregates.groupby('Attack Type Detailed', 'Financial Loss (in Million $)', 'mean').sort_values(ascending=False)
+    heatmapData = aggregates.pivot('Target Industry Standardized', 'Attack Type', 'Financial Loss (in Million $)', 'mean')
+    yearlyImpact = aggregates.groupby(['Year', 'Target Industry Standardized'], 'Financial Loss (in Million $)', 'mean').reset_index()
+    vulnerabilityImpact = aggregates.groupby('Security Vulnerability Type', 'Financial Loss (in Million $)', 'mean').sort_values(ascending=False)
+    jobs = [
+        ChartJob('financial_impact_by_industry.png', render_labeled_bar, industryImpact, CHART_RC,
+                 title='Average Financial Loss by Industry', xlabel='Industry',
+                 ylabel='Average Financial Loss (Million $)', palette='viridis'),
+        ChartJob('financial_impact_by_attack.png', render_labeled_bar, attackImpact, CHART_RC,
+                 title='Average Financial Loss by Attack Type', xlabel='Attack Type',
+                 ylabel='Average Financial Loss (Million $)', figsize=(14, 8), palette='magma'),
+        ChartJob('financial_impact_distribution.png', render_financial_impact_distribution,
+                 aggregates.raw(['Target Industry Standardized', 'Financial Loss (in Million $)']), CHART_RC),
+        ChartJob('financial_impact_heatmap.png', render_financial_impact_heatmap, heatmapData, CHART_RC),
+        ChartJob('financial_impact_trends.png', render_financial_impact_trends, yearlyImpact, CHART_RC),
+        ChartJob('financial_impact_by_vulnerability.png', render_labeled_bar, vulnerabilityImpact, CHART_RC,
+                 title='Average Financial Loss by Security Vulnerability Type', xlabel='Vulnerability Type',
+                 ylabel='Average Financial Loss (Million $)', rotateLabels=False, palette='crest')
+    ]
+    run_chart_jobs(jobs, outputDir, maxWorkers, forceRender)
+    totalIncidents = aggregates.row_count()
     with open(outputDir / 'financial_impact_summary.md', 'w') as f:
-        f.write("
-        f.write(f"
-        f.write(f"- Total financial loss: ${df['Financial Loss (in Million $)'].sum():.2f} million\n")
-        f.write(f"- Average financial loss per incident: ${df['Financial Loss (in Million $)'].mean():.2f} million\n")
-        f.write(f"- Maximum financial loss: ${df['Financial Loss (in Million $)'].max():.2f} million\n\n")
-        f.write("
+        f.write("# Financial Impact Analysis Summary\n\n")
+        f.write(f"## Overall Financial Impact ({totalIncidents} incidents)\n\n")
+        f.write(f"- Total financial loss: ${aggregates.total('Financial Loss (in Million $)', 'sum'):.2f} million\n")
+        f.write(f"- Average financial loss per incident: ${aggregates.total('Financial Loss (in Million $)', 'mean'):.2f} million\n")
+        f.write(f"- Maximum financial loss: ${aggregates.total('Financial Loss (in Million $)', 'max'):.2f} million\n\n")
+        f.write("## Industries with Highest Average Loss\n\n")
         for industry, loss in industryImpact.head(3).items():
             f.write(f"- {industry}: ${loss:.2f} million\n")
         f.write("\n")
-        f.write("
+        f.write("## Attack Types with Highest Average Loss\n\n")
         for attack, loss in attackImpact.head(3).items():
             f.write(f"- {attack}: ${loss:.2f} million\n")
         f.write("\n")
-        f.write("
+        f.write("## Vulnerabilities with Highest Average Loss\n\n")
         for vuln, loss in vulnerabilityImpact.head(3).items():
             f.write(f"- {vuln}: ${loss:.2f} million\n")
     print("Financial impact analysis completed successfully!")
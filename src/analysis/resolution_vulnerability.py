@@ -4,89 +4,25 @@ import seaborn as sns
 import numpy as np
 from pathlib import Path
 import os
-def analyze_resolution_vulnerability():
-    print("Starting resolution time and vulnerability analysis...")
-    outputDir = Path('analysis/output')
-    outputDir.mkdir(exist_ok=True, parents=True)
-    dataPath = Path('../Enhanced_Cybersecurity_Data.csv')
-    try:
-        df = pd.read_csv(dataPath)
-        print(f"Loaded data with {len(df)} records")
-    except Exception as e:
-        print(f"Error loading data: {e}")
-        return
-    sns.set_style("whitegrid")
-    plt.rcParams['font.family'] = 'sans-serif'
-    plt.rcParams['font.sans-serif'] = 'Arial'
-    plt.figure(figsize=(12, 8))
-    resTimeByIndustry = df.groupby('Target Industry Standardized')['Incident Resolution Time (in Hours)'].mean().sort_values(ascending=False)
-    ax = sns.barplot(x=resTimeByIndustry.index, y=resTimeByIndustry.values, palette='mako')
-    plt.title('Average Resolution Time by Industry', fontsize=16, pad=20)
-    plt.xlabel('Industry', fontsize=14)
-    plt.ylabel('Average Resolution Time (Hours)', fontsize=14)
-    plt.xticks(rotation=45, ha='right')
-    plt.tight_layout()
-    for i, v in enumerate(resTimeByIndustry.values):
-        ax.text(i, v + 1, f'{v:.1f}', ha='center', fontsize=10)
-    plt.savefig(outputDir / 'resolution_time_by_industry.png', dpi=300, bbox_inches='tight')
-    plt.close()
-    plt.figure(figsize=(14, 8))
-    resTimeByAttack = df.groupby('Attack Type Detailed')['Incident Resolution Time (in Hours)'].mean().sort_values(ascending=False)
-    ax = sns.barplot(x=resTimeByAttack.index, y=resTimeByAttack.values, palette='viridis')
-    plt.title('Average Resolution Time by Attack Type', fontsize=16, pad=20)
-    plt.xlabel('Attack Type', fontsize=14)
-    plt.ylabel('Average Resolution Time (Hours)', fontsize=14)
-    plt.xticks(rotation=45, ha='right')
-    plt.tight_layout()
-    for i, v in enumerate(resTimeByAttack.values):
-        ax.text(i, v + 1, f'{v:.1f}', ha='center', fontsize=10)
-    plt.savefig(outputDir / 'resolution_time_by_attack.png', dpi=300, bbox_inches='tight')
-    plt.close()
-    plt.figure(figsize=(12, 8))
-    df['Resolution Time Category'] = pd.Categorical(
-        df['Resolution Time Category'],
-        categories=[
-            'Less than 24 hours',
-            '1-3 days',
-            '4-7 days',
-            '1-2 weeks',
-            '2-4 weeks',
-            '1-3 months',
-            'More than 3 months'
-        ],
-        ordered=True
-    )
-    resCatCount = df['Resolution Time Category'].value_counts().sort_index()
-    ax = sns.barplot(x=resCatCount.index, y=resCatCount.values, palette='rocket')
-    plt.title('Distribution of Incident Resolution Times', fontsize=16, pad=20)
-    plt.xlabel('Resolution Time', fontsize=14)
-    plt.ylabel('Number of Incidents', fontsize=14)
-    plt.xticks(rotation=45, ha='right')
-    plt.tight_layout()
-    for i, v in enumerate(resCatCount.values):
-        ax.text(i, v + 10, str(v), ha='center', fontsize=10)
-    plt.savefig(outputDir / 'resolution_time_distribution.png', dpi=300, bbox_inches='tight')
-    plt.close()
-    plt.figure(figsize=(12, 8))
-    resTimeByDefense = df.groupby('Defense Mechanism Used')['Incident Resolution Time (in Hours)'].mean().sort_values(ascending=False)
-    ax = sns.barplot(x=resTimeByDefense.index, y=resTimeByDefense.values, palette='crest')
-    plt.title('Average Resolution Time by Defense Mechanism', fontsize=16, pad=20)
-    plt.xlabel('Defense Mechanism', fontsize=14)
-    plt.ylabel('Average Resolution Time (Hours)', fontsize=14)
-    plt.tight_layout()
-    for i, v in enumerate(resTimeByDefense.values):
-        ax.text(i, v + 1, f'{v:.1f}', ha='center', fontsize=10)
-    plt.savefig(outputDir / 'resolution_time_by_defense.png', dpi=300, bbox_inches='tight')
-    plt.close()
-    plt.figure(figsize=(10, 8))
-    sns.scatterplot(
-        data=df,
+from src.utils.dataset_context import DatasetContext
+from src.utils.schema import RESOLUTION_TIME_CATEGORIES, required_columns, requires_columns
+from src.utils.visualization_utils import render_labeled_bar
+from src.visualization.chart_jobs import CHART_RC, ChartJob, run_chart_jobs, save_chart
+from src.visualization.large_scatter import DEFAULT_POINT_THRESHOLD, large_scatter, scatter_options
+def render_resolution_vs_financial_loss(scatterData, outputPath, figsize=(10, 8), dpi=300, palette=None,
+                                        largeMode='density', pointThreshold=DEFAULT_POINT_THRESHOLD):
+    plt.figure(figsize=figsize)
+    large_scatter(
+        scatterData,
         x='Incident Resolution Time (in Hours)',
         y='Financial Loss (in Million $)',
         hue='Attack Type',
         size='Number of Affected Users',
         sizes=(20, 200),
-        alpha=0.7
+        alpha=0.7,
+        palette=palette,
+        largeMode=largeMode,
+        pointThreshold=pointThreshold
     )
     plt.title('Correlation: Resolution Time vs. Financial Loss', fontsize=16, pad=20)
     plt.xlabel('Resolution Time (Hours)', fontsize=14)
@@ -94,47 +30,83 @@ def analyze_resolution_vulnerability():
     plt.grid(True, alpha=0.3)
     plt.legend(bbox_to_anchor=(1.05, 1), loc='upper left')
     plt.tight_layout()
-    plt.savefig(outputDir / 'resolution_vs_financial_loss.png', dpi=300, bbox_inches='tight')
-    plt.close()
-    plt.figure(figsize=(10, 8))
-    vulnCounts = df['Security Vulnerability Type'].value_counts()
+    save_chart(outputPath, dpi)
+def render_vulnerability_distribution(vulnCounts, outputPath, figsize=(10, 8), dpi=300):
+    plt.figure(figsize=figsize)
     explode = [0.1 if i == 0 else 0.05 if i == 1 else 0 for i in range(len(vulnCounts))]
     plt.pie(vulnCounts, labels=vulnCounts.index, autopct='%1.1f%%',
             startangle=90, explode=explode, shadow=True, textprops={'fontsize': 12})
     plt.title('Distribution of Security Vulnerabilities', fontsize=16, pad=20)
     plt.axis('equal')
     plt.tight_layout()
-    plt.savefig(outputDir / 'vulnerability_distribution.png', dpi=300, bbox_inches='tight')
-    plt.close()
-    plt.figure(figsize=(12, 8))
-    vulnIndustryTable = pd.crosstab(df['Target Industry Standardized'], df['Security Vulnerability Type'])
-    vulnIndustryTablePct = vulnIndustryTable.div(vulnIndustryTable.sum(axis=1), axis=0) * 100
-    sns.heatmap(vulnIndustryTablePct, annot=True, cmap='YlGnBu', fmt='.1f', linewidths=.5)
+    save_chart(outputPath, dpi)
+def render_vulnerability_by_industry(vulnIndustryTablePct, outputPath, figsize=(12, 8), dpi=300, palette='YlGnBu'):
+    plt.figure(figsize=figsize)
+    sns.heatmap(vulnIndustryTablePct, annot=True, cmap=palette, fmt='.1f', linewidths=.5)
     plt.title('Security Vulnerability Distribution by Industry (%)', fontsize=16, pad=20)
     plt.tight_layout()
-    plt.savefig(outputDir / 'vulnerability_by_industry.png', dpi=300, bbox_inches='tight')
-    plt.close()
+    save_chart(outputPath, dpi)
+@requires_columns('Attack Type', 'Attack Type Detailed', 'Target Industry Standardized', 'Security Vulnerability Type',
+                  'Defense Mechanism Used', 'Resolution Time Category', 'Financial Loss (in Million $)', 'Number of Affected Users',
+                  'Incident Resolution Time (in Hours)')
+def analyze_resolution_vulnerability(context=None, maxWorkers=None, forceRender=None):
+    print("Starting resolution time and vulnerability analysis...")
+    outputDir = Path('analysis/output')
+    outputDir.mkdir(exist_ok=True, parents=True)
+    if context is None:
+        context = DatasetContext(Path('../Enhanced_Cybersecurity_Data.csv'), columns=required_columns(analyze_resolution_vulnerability))
+    aggregates = context.aggregates
+    if aggregates is None:
+        return
+    resTimeByIndustry = aggregates.groupby('Target Industry Standardized', 'Incident Resolution Time (in Hours)', 'mean').sort_values(ascending=False)
+    resTimeByAttack = aggregates.groupby('Attack Type Detailed', 'Incident Resolution Time (in Hours)', 'mean').sort_values(ascending=False)
+    resCatCount = aggregates.groupby('Resolution Time Category').reindex(RESOLUTION_TIME_CATEGORIES, fill_value=0)
+    resTimeByDefense = aggregates.groupby('Defense Mechanism Used', 'Incident Resolution Time (in Hours)', 'mean').sort_values(ascending=False)
+    vulnCounts = aggregates.value_counts('Security Vulnerability Type')
+    vulnIndustryTable = aggregates.crosstab('Target Industry Standardized', 'Security Vulnerability Type')
+    vulnIndustryTablePct = vulnIndustryTable.div(vulnIndustryTable.sum(axis=1), axis=0) * 100
+    jobs = [
+        ChartJob('resolution_time_by_industry.png', render_labeled_bar, resTimeByIndustry, CHART_RC,
+                 title='Average Resolution Time by Industry', xlabel='Industry',
+                 ylabel='Average Resolution Time (Hours)', labelFormat='{:.1f}', palette='mako'),
+        ChartJob('resolution_time_by_attack.png', render_labeled_bar, resTimeByAttack, CHART_RC,
+                 title='Average Resolution Time by Attack Type', xlabel='Attack Type',
+                 ylabel='Average Resolution Time (Hours)', labelFormat='{:.1f}', figsize=(14, 8), palette='viridis'),
+        ChartJob('resolution_time_distribution.png', render_labeled_bar, resCatCount, CHART_RC,
+                 title='Distribution of Incident Resolution Times', xlabel='Resolution Time',
+                 ylabel='Number of Incidents', labelOffset=10, labelFormat='{}', palette='rocket'),
+        ChartJob('resolution_time_by_defense.png', render_labeled_bar, resTimeByDefense, CHART_RC,
+                 title='Average Resolution Time by Defense Mechanism', xlabel='Defense Mechanism',
+                 ylabel='Average Resolution Time (Hours)', rotateLabels=False, labelFormat='{:.1f}', palette='crest'),
+        ChartJob('resolution_vs_financial_loss.png', render_resolution_vs_financial_loss,
+                 aggregates.raw(['Incident Resolution Time (in Hours)', 'Financial Loss (in Million $)', 'Attack Type', 'Number of Affected Users']), CHART_RC,
+                 **scatter_options()),
+        ChartJob('vulnerability_distribution.png', render_vulnerability_distribution, vulnCounts, CHART_RC),
+        ChartJob('vulnerability_by_industry.png', render_vulnerability_by_industry, vulnIndustryTablePct, CHART_RC)
+    ]
+    run_chart_jobs(jobs, outputDir, maxWorkers, forceRender)
+    totalIncidents = aggregates.row_count()
     with open(outputDir / 'resolution_vulnerability_summary.md', 'w') as f:
-        f.write("
-        f.write("
-        f.write(f"- Average resolution time: {df['Incident Resolution Time (in Hours)'].mean():.1f} hours\n")
-        f.write(f"- Median resolution time: {df['Incident Resolution Time (in Hours)'].median():.1f} hours\n")
-        f.write(f"- Minimum resolution time: {df['Incident Resolution Time (in Hours)'].min():.1f} hours\n")
-        f.write(f"- Maximum resolution time: {df['Incident Resolution Time (in Hours)'].max():.1f} hours\n\n")
-        f.write("
+        f.write("# Resolution Time & Vulnerability Analysis Summary\n\n")
+        f.write("## Resolution Time Statistics\n\n")
+        f.write(f"- Average resolution time: {aggregates.total('Incident Resolution Time (in Hours)', 'mean'):.1f} hours\n")
+        f.write(f"- Median resolution time: {aggregates.total('Incident Resolution Time (in Hours)', 'median'):.1f} hours\n")
+        f.write(f"- Minimum resolution time: {aggregates.total('Incident Resolution Time (in Hours)', 'min'):.1f} hours\n")
+        f.write(f"- Maximum resolution time: {aggregates.total('Incident Resolution Time (in Hours)', 'max'):.1f} hours\n\n")
+        f.write("## Industries with Longest Resolution Times\n\n")
         for industry, time in resTimeByIndustry.head(3).items():
             f.write(f"- {industry}: {time:.1f} hours\n")
         f.write("\n")
-        f.write("
+        f.write("## Attack Types with Longest Resolution Times\n\n")
         for attack, time in resTimeByAttack.head(3).items():
             f.write(f"- {attack}: {time:.1f} hours\n")
         f.write("\n")
-        f.write("
+        f.write("## Most Common Security Vulnerabilities\n\n")
         for vuln, count in vulnCounts.head(3).items():
-            f.write(f"- {vuln}: {count} incidents ({count/len(df)*100:.1f}%)\n")
+            f.write(f"- {vuln}: {count} incidents ({count/totalIncidents*100:.1f}%)\n")
         f.write("\n")
-        f.write("
-        correlation = df['Incident Resolution Time (in Hours)'].corr(df['Financial Loss (in Million $)'])
+        f.write("## Resolution Time vs Financial Loss\n\n")
+        correlation = aggregates.corr(['Incident Resolution Time (in Hours)', 'Financial Loss (in Million $)']).iloc[0, 1]
         f.write(f"- Correlation coefficient: {correlation:.3f}\n")
         if correlation > 0.5:
             f.write("- Strong positive correlation: Higher resolution times tend to result in higher financial losses\n")
@@ -0,0 +1,173 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+from datetime import datetime
+from pathlib import Path
+from src.analysis.enhanced_analysis import (build_attack_jobs, build_correlation_jobs, build_financial_jobs, build_trend_jobs,
+                                            build_vulnerability_jobs, create_pure_analysis_dashboard, ENHANCED_STAGES)
+from src.benchmarks.synthetic_data import SEED_DATA_PATH, SYNTHETIC_DIR, format_scale, parse_scale, synthetic_data_path, write_synthetic_dataset
+from src.utils.data_cache import read_cached_frame, write_cached_frame
+from src.utils.ingestion import read_breach_csv
+from src.utils.instrumentation import RECORDER, stage
+from src.utils.parallel_aggregation import create_aggregation_cache
+from src.utils.schema import required_columns
+from src.visualization.chart_jobs import run_chart_jobs
+REPO_ROOT = Path(__file__).resolve().parents[2]
+BENCHMARK_DIR = Path('data/.cache/benchmarks')
+HISTORY_PATH = BENCHMARK_DIR / 'history.json'
+DEFAULT_SCALES = ['10k', '100k', '1m', '10m']
+BENCHMARK_STEPS = ('ingestion', 'aggregation', 'charts', 'excel', 'dashboard')
+CHART_GENERATORS = {
+    'financial': build_financial_jobs,
+    'attack': build_attack_jobs,
+    'vulnerability': build_vulnerability_jobs,
+    'correlation': build_correlation_jobs,
+    'trend': build_trend_jobs
+}
+EXCEL_BUILDERS = {
+    'enhanced_analysis': 'create_enhanced_analysis.py',
+    'analysis_report': 'create_excel_report_fixed.py'
+}
+RESULT_FIELDS = ('wall_seconds', 'cpu_seconds', 'peak_rss_bytes', 'rss_growth_bytes', 'peak_allocated_bytes')
+REGRESSION_THRESHOLD = 1.25
+def measure(results, name, function, *args, **kwargs):
+    value, error = None, None
+    with stage(name, 'benchmark'):
+        try:
+            value = function(*args, **kwargs)
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+    results[name] = {field: RECORDER.records[-1][field] for field in RESULT_FIELDS}
+    if error is not None:
+        results[name]['error'] = error
+        print(f"Benchmark step {name} failed: {error}")
+    return value
+def run_excel_builder(scriptName, dataPath, workDir):
+    dataDir = Path(workDir) / 'data'
+    dataDir.mkdir(exist_ok=True, parents=True)
+    linkPath = dataDir / SEED_DATA_PATH.name
+    if linkPath.is_symlink() or linkPath.exists():
+        linkPath.unlink()
+    linkPath.symlink_to(Path(dataPath).resolve())
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [str(REPO_ROOT), os.environ.get('PYTHONPATH')])))
+    completed = subprocess.run([sys.executable, str(REPO_ROOT / scriptName)], cwd=workDir, env=env, capture_output=True, text=True)
+    if completed.returncode != 0:
+        raise RuntimeError(completed.stderr.strip().splitlines()[-1] if completed.stderr.strip() else f"exit code {completed.returncode}")
+def run_scale(dataPath, workDir, steps=BENCHMARK_STEPS, maxWorkers=1):
+    results = {}
+    workDir = Path(workDir)
+    chartDir = workDir / 'visualizations'
+    firstRecord = len(RECORDER.records)
+    df = measure(results, 'ingestion/parse_csv', read_breach_csv, dataPath)
+    if df is None:
+        return results
+    if 'ingestion' in steps:
+        measure(results, 'ingestion/cache_write', write_cached_frame, dataPath, df, workDir / '.cache')
+        measure(results, 'ingestion/cache_read', read_cached_frame, dataPath, workDir / '.cache')
+        columns = required_columns(*ENHANCED_STAGES)
+        measure(results, 'ingestion/parse_csv_projected', read_breach_csv, dataPath, columns)
+        measure(results, 'ingestion/cache_read_projected', read_cached_frame, dataPath, workDir / '.cache', columns)
+    jobs = {}
+    if 'aggregation' in steps or 'charts' in steps:
+        aggregates = measure(results, 'aggregation/fingerprint', create_aggregation_cache, df)
+        for name, buildJobs in CHART_GENERATORS.items():
+            jobs[name] = measure(results, f'aggregation/{name}', buildJobs, df, aggregates) or []
+    if 'charts' in steps:
+        for name, chartJobs in jobs.items():
+            measure(results, f'charts/{name}', run_chart_jobs, chartJobs, chartDir, maxWorkers, True)
+        for record in RECORDER.records[firstRecord:]:
+            if record['category'] == 'chart':
+                results[f"charts/{record['name']}"] = {field: record[field] for field in RESULT_FIELDS}
+    if 'excel' in steps:
+        for name, scriptName in EXCEL_BUILDERS.items():
+            measure(results, f'excel/{name}', run_excel_builder, scriptName, dataPath, workDir / 'excel')
+    if 'dashboard' in steps:
+        dashboardDir = workDir / 'dashboard'
+        chartDir.mkdir(exist_ok=True, parents=True)
+        dashboardDir.mkdir(exist_ok=True, parents=True)
+        measure(results, 'dashboard', create_pure_analysis_dashboard, chartDir, dashboardDir)
+    return results
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_ROOT, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+def load_history(historyPath):
+    try:
+        with open(historyPath) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return []
+def save_history(historyPath, history):
+    historyPath = Path(historyPath)
+    historyPath.parent.mkdir(exist_ok=True, parents=True)
+    tmpPath = historyPath.with_suffix('.json.tmp')
+    with open(tmpPath, 'w') as f:
+        json.dump(history, f, indent=2)
+    os.replace(tmpPath, historyPath)
+def previous_result(history, scale, step):
+    for entry in reversed(history):
+        result = entry['scales'].get(scale, {}).get(step)
+        if result is not None and 'error' not in result:
+            return entry, result
+    return None, None
+def print_comparison(history, entry, threshold=REGRESSION_THRESHOLD):
+    print("\n=== BENCHMARK RESULTS ===")
+    print(f"{'scale':<8} {'step':<52} {'wall':>10} {'previous':>10} {'ratio':>7}")
+    regressions = []
+    for scale, results in entry['scales'].items():
+        for step, result in results.items():
+            if 'error' in result:
+                print(f"{scale:<8} {step[:52]:<52} {'failed':>10}")
+                continue
+            previousEntry, previous = previous_result(history, scale, step)
+            if previous is None or previous['wall_seconds'] <= 0:
+                print(f"{scale:<8} {step[:52]:<52} {result['wall_seconds']:>9.3f}s {'-':>10} {'-':>7}")
+                continue
+            ratio = result['wall_seconds'] / previous['wall_seconds']
+            flag = ' REGRESSION' if ratio > threshold else ''
+            print(f"{scale:<8} {step[:52]:<52} {result['wall_seconds']:>9.3f}s {previous['wall_seconds']:>9.3f}s {ratio:>6.2f}x{flag}")
+            if flag:
+                regressions.append((scale, step, ratio, previousEntry.get('commit')))
+    for scale, step, ratio, commit in regressions:
+        print(f"Regression: {step} at {scale} rows is {ratio:.2f}x slower than at {commit or 'the previous run'}")
+    return regressions
+def run_benchmarks(scales=DEFAULT_SCALES, steps=BENCHMARK_STEPS, seed=0, maxWorkers=1, dataDir=SYNTHETIC_DIR,
+                   workDir=BENCHMARK_DIR, historyPath=HISTORY_PATH, threshold=REGRESSION_THRESHOLD):
+    entry = {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'seed': seed,
+        'steps': list(steps),
+        'scales': {}
+    }
+    for scale in scales:
+        rows = parse_scale(scale)
+        label = format_scale(rows)
+        print(f"\n=== BENCHMARK {label} ROWS ===")
+        with stage('generate', 'benchmark'):
+            dataPath = write_synthetic_dataset(rows, synthetic_data_path(rows, seed, dataDir), seed)
+        entry['scales'][label] = run_scale(dataPath, Path(workDir) / label, steps, maxWorkers)
+    history = load_history(historyPath)
+    regressions = print_comparison(history, entry, threshold)
+    history.append(entry)
+    save_history(historyPath, history)
+    print(f"Benchmark history written to {historyPath}")
+    return entry, regressions
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--scales', nargs='+', default=DEFAULT_SCALES, help='Synthetic dataset sizes to benchmark, e.g. 10k 100k 1m 10m')
+    parser.add_argument('--steps', nargs='+', choices=BENCHMARK_STEPS, default=list(BENCHMARK_STEPS), help='Pipeline steps to time')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed for the synthetic datasets')
+    parser.add_argument('--workers', type=int, default=1, help='Chart rendering processes (default: 1 for comparable timings)')
+    parser.add_argument('--history', default=str(HISTORY_PATH), help='JSON file the results are appended to and compared against')
+    parser.add_argument('--threshold', type=float, default=REGRESSION_THRESHOLD, help='Slowdown ratio reported as a regression')
+    args = parser.parse_args()
+    _, regressions = run_benchmarks(args.scales, args.steps, args.seed, args.workers, historyPath=args.history, threshold=args.threshold)
+    sys.exit(1 if regressions else 0)
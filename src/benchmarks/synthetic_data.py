@@ -0,0 +1,87 @@
+import argparse
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from src.utils.schema import AFFECTED_USERS, BREACH_COLUMNS, FINANCIAL_LOSS, RESOLUTION_HOURS, RESOLUTION_TIME_CATEGORIES
+SEED_DATA_PATH = Path('data/RAW-cybersecurity_breach_data.csv')
+SYNTHETIC_DIR = Path('data/.cache/synthetic')
+GENERATION_CHUNK_ROWS = 1000000
+NUMERIC_JITTER = 0.05
+NUMERIC_DECIMALS = {FINANCIAL_LOSS: 2, AFFECTED_USERS: 0, RESOLUTION_HOURS: 0}
+STANDARDIZED_COLUMNS = {
+    'Target Industry Standardized': 'Target Industry',
+    'Attack Type Detailed': 'Attack Type'
+}
+DERIVED_CATEGORIES = {
+    'Financial Impact Category': (FINANCIAL_LOSS, [10, 50], ['Less than $10,000', '$10,000 - $50,000', '$50,001 - $100,000']),
+    'Affected Users Category': (AFFECTED_USERS, [1001, 10001, 100001], ['100 - 1,000', '1,001 - 10,000', '10,001 - 100,000', '100,001 - 1 million']),
+    'Resolution Time Category': (RESOLUTION_HOURS, [24, 72, 168, 336, 672, 2160], RESOLUTION_TIME_CATEGORIES)
+}
+SAMPLED_COLUMNS = [col for col in BREACH_COLUMNS
+                   if col not in NUMERIC_DECIMALS and col not in STANDARDIZED_COLUMNS and col not in DERIVED_CATEGORIES]
+SCALE_SUFFIXES = {'k': 1000, 'm': 1000000}
+def parse_scale(scale):
+    scale = str(scale).strip().lower().replace('_', '')
+    if scale[-1:] in SCALE_SUFFIXES:
+        return int(float(scale[:-1]) * SCALE_SUFFIXES[scale[-1]])
+    return int(scale)
+def format_scale(rows):
+    for suffix, factor in sorted(SCALE_SUFFIXES.items(), key=lambda item: -item[1]):
+        if rows >= factor and rows % factor == 0:
+            return f'{rows // factor}{suffix}'
+    return str(rows)
+class BreachDataModel:
+    def __init__(self, seedData):
+        self.categories = {col: pd.Categorical(seedData[col].astype(str)) for col in SAMPLED_COLUMNS}
+        self.numeric = {col: seedData[col].to_numpy(dtype=np.float64) for col in NUMERIC_DECIMALS}
+        self.bounds = {col: (values.min(), values.max()) for col, values in self.numeric.items()}
+        self.standardized = {
+            col: seedData.groupby(source, observed=True)[col].first().astype(str).to_dict()
+            for col, source in STANDARDIZED_COLUMNS.items()
+        }
+        self.rows = len(seedData)
+    @classmethod
+    def from_csv(cls, seedPath=SEED_DATA_PATH):
+        return cls(pd.read_csv(seedPath))
+    def sample(self, rows, rng):
+        positions = rng.integers(self.rows, size=rows)
+        frame = {}
+        for col, values in self.categories.items():
+            frame[col] = pd.Categorical.from_codes(values.codes[positions], values.categories)
+        for col, values in self.numeric.items():
+            low, high = self.bounds[col]
+            jittered = values[positions] * rng.uniform(1 - NUMERIC_JITTER, 1 + NUMERIC_JITTER, rows)
+            jittered = np.round(np.clip(jittered, low, high), NUMERIC_DECIMALS[col])
+            frame[col] = jittered if NUMERIC_DECIMALS[col] else jittered.astype(np.int64)
+        for col, source in STANDARDIZED_COLUMNS.items():
+            frame[col] = frame[source].rename_categories([self.standardized[col][label] for label in frame[source].categories])
+        for col, (source, edges, labels) in DERIVED_CATEGORIES.items():
+            frame[col] = pd.Categorical.from_codes(np.searchsorted(edges, frame[source], side='right'), labels)
+        return pd.DataFrame(frame)[BREACH_COLUMNS]
+def synthetic_data_path(rows, seed=0, outputDir=SYNTHETIC_DIR):
+    return Path(outputDir) / f'synthetic-{format_scale(rows)}-seed{seed}.csv'
+def write_synthetic_dataset(rows, outputPath=None, seed=0, seedPath=SEED_DATA_PATH, chunkRows=GENERATION_CHUNK_ROWS, rebuild=False):
+    outputPath = Path(outputPath) if outputPath is not None else synthetic_data_path(rows, seed)
+    if outputPath.exists() and not rebuild:
+        return outputPath
+    outputPath.parent.mkdir(exist_ok=True, parents=True)
+    model = BreachDataModel.from_csv(seedPath)
+    tmpPath = outputPath.with_suffix('.csv.tmp')
+    for chunkIdx, start in enumerate(range(0, rows, chunkRows)):
+        rng = np.random.default_rng([seed, chunkIdx])
+        chunk = model.sample(min(chunkRows, rows - start), rng)
+        chunk.to_csv(tmpPath, mode='w' if chunkIdx == 0 else 'a', header=chunkIdx == 0, index=False)
+    tmpPath.replace(outputPath)
+    print(f"Generated {rows} synthetic breach records at {outputPath}")
+    return outputPath
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('scales', nargs='+', help='Row counts to generate, e.g. 10k 100k 1m 10m')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed; each chunk draws from its own seeded stream')
+    parser.add_argument('--output-dir', default=str(SYNTHETIC_DIR), help='Directory for the generated CSV files')
+    parser.add_argument('--seed-data', default=str(SEED_DATA_PATH), help='Real dataset whose vocabularies and distributions are resampled')
+    parser.add_argument('--rebuild', action='store_true', help='Regenerate files that already exist')
+    args = parser.parse_args()
+    for scale in args.scales:
+        rows = parse_scale(scale)
+        write_synthetic_dataset(rows, synthetic_data_path(rows, args.seed, args.output_dir), args.seed, args.seed_data, rebuild=args.rebuild)
@@ -1,13 +1,125 @@
 from pathlib import Path
 import os
 def generate_dashboard_html(vizDir, dashboardDir, financialViz, attackViz, vulnerabilityViz, correlationViz, trendViz):
-    cssContent =
+    cssContent = """body {
+    font-family: 'Segoe UI', Arial, sans-serif;
+    margin: 0;
+    background-color: #f4f6f9;
+    color: #2c3e50;
+}
+header {
+    background-color: #2c3e50;
+    color: #ffffff;
+    padding: 20px 40px;
+}
+header h1 {
+    margin: 0;
+    font-size: 28px;
+}
+header p {
+    margin: 5px 0 0;
+    color: #bdc3c7;
+}
+nav {
+    background-color: #34495e;
+    padding: 0 40px;
+}
+nav button {
+    background: none;
+    border: none;
+    color: #ecf0f1;
+    padding: 14px 18px;
+    font-size: 15px;
+    cursor: pointer;
+}
+nav button.active, nav button:hover {
+    background-color: #1abc9c;
+}
+main {
+    padding: 30px 40px;
+}
+.section {
+    display: none;
+}
+.section.active {
+    display: block;
+}
+.grid {
+    display: grid;
+    grid-template-columns: repeat(auto-fill, minmax(520px, 1fr));
+    gap: 24px;
+}
+.card {
+    background-color: #ffffff;
+    border-radius: 8px;
+    box-shadow: 0 2px 6px rgba(0, 0, 0, 0.1);
+    padding: 16px;
+}
+.card h3 {
+    margin-top: 0;
+    font-size: 17px;
+}
+.card img {
+    width: 100%;
+    height: auto;
+    cursor: zoom-in;
+}
+footer {
+    text-align: center;
+    padding: 20px;
+    color: #7f8c8d;
+    font-size: 13px;
+}
+"""
     with open(Path(dashboardDir) / 'styles.css', 'w') as f:
         f.write(cssContent)
-    jsContent =
+    jsContent = """document.addEventListener('DOMContentLoaded', function() {
+    const buttons = document.querySelectorAll('nav button');
+    const sections = document.querySelectorAll('.section');
+    buttons.forEach(function(button) {
+        button.addEventListener('click', function() {
+            buttons.forEach(function(b) { b.classList.remove('active'); });
+            sections.forEach(function(s) { s.classList.remove('active'); });
+            button.classList.add('active');
+            document.getElementById(button.dataset.section).classList.add('active');
+        });
+    });
+    document.querySelectorAll('.card img').forEach(function(img) {
+        img.addEventListener('click', function() {
+            window.open(img.src, '_blank');
+        });
+    });
+});
+"""
     with open(Path(dashboardDir) / 'main.js', 'w') as f:
         f.write(jsContent)
-    htmlContent =
+    imageDir = Path(os.path.relpath(vizDir, dashboardDir)).as_posix()
+    htmlContent = """<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Cybersecurity Breach Analysis Dashboard</title>
+    <link rel="stylesheet" href="styles.css">
+</head>
+<body>
+    <header>
+        <h1>Cybersecurity Breach Analysis Dashboard</h1>
+        <p>Financial impact, attack patterns, vulnerabilities and trends</p>
+    </header>
+    <nav>
+        <button class="active" data-section="overview">Overview</button>
+        <button data-section="financial">Financial Impact</button>
+        <button data-section="attack">Attack Patterns</button>
+        <button data-section="vulnerability">Vulnerabilities</button>
+        <button data-section="correlation">Correlations</button>
+        <button data-section="trends">Trends</button>
+    </nav>
+    <main>
+        <div class="section active" id="overview">
+            <h2>Overview</h2>
+            <div class="grid">
+"""
     overviewViz = []
     if financialViz: overviewViz.append(financialViz[0])
     if attackViz: overviewViz.append(attackViz[0])
@@ -15,27 +127,83 @@ def generate_dashboard_html(vizDir, dashboardDir, financialViz, attackViz, vulne
     if correlationViz: overviewViz.append(correlationViz[0])
     for viz in overviewViz:
         title = ' '.join(word.capitalize() for word in viz.replace('.png', '').split('_'))
-        htmlContent += f
-    htmlContent +=
+        htmlContent += f"""                <div class="card">
+                    <h3>{title}</h3>
+                    <img src="{imageDir}/{viz}" alt="{title}">
+                </div>
+"""
+    htmlContent += """            </div>
+        </div>
+        <div class="section" id="financial">
+            <h2>Financial Impact</h2>
+            <div class="grid">
+"""
     for viz in financialViz:
         title = ' '.join(word.capitalize() for word in viz.replace('.png', '').split('_'))
-        htmlContent += f
-    htmlContent +=
+        htmlContent += f"""                <div class="card">
+                    <h3>{title}</h3>
+                    <img src="{imageDir}/{viz}" alt="{title}">
+                </div>
+"""
+    htmlContent += """            </div>
+        </div>
+        <div class="section" id="attack">
+            <h2>Attack Patterns</h2>
+            <div class="grid">
+"""
     for viz in attackViz:
         title = ' '.join(word.capitalize() for word in viz.replace('.png', '').split('_'))
-        htmlContent += f
-    htmlContent +=
+        htmlContent += f"""                <div class="card">
+                    <h3>{title}</h3>
+                    <img src="{imageDir}/{viz}" alt="{title}">
+                </div>
+"""
+    htmlContent += """            </div>
+        </div>
+        <div class="section" id="vulnerability">
+            <h2>Vulnerabilities</h2>
+            <div class="grid">
+"""
     for viz in vulnerabilityViz:
         title = ' '.join(word.capitalize() for word in viz.replace('.png', '').split('_'))
-        htmlContent += f
-    htmlContent +=
+        htmlContent += f"""                <div class="card">
+                    <h3>{title}</h3>
+                    <img src="{imageDir}/{viz}" alt="{title}">
+                </div>
+"""
+    htmlContent += """            </div>
+        </div>
+        <div class="section" id="correlation">
+            <h2>Correlations</h2>
+            <div class="grid">
+"""
     for viz in correlationViz:
         title = ' '.join(word.capitalize() for word in viz.replace('.png', '').split('_'))
-        htmlContent += f
-    htmlContent +=
+        htmlContent += f"""                <div class="card">
+                    <h3>{title}</h3>
+                    <img src="{imageDir}/{viz}" alt="{title}">
+                </div>
+"""
+    htmlContent += """            </div>
+        </div>
+        <div class="section" id="trends">
+            <h2>Trends</h2>
+            <div class="grid">
+"""
     for viz in trendViz:
         title = ' '.join(word.capitalize() for word in viz.replace('.png', '').split('_'))
-        htmlContent += f
-    htmlContent +=
+        htmlContent += f"""                <div class="card">
+                    <h3>{title}</h3>
+                    <img src="{imageDir}/{viz}" alt="{title}">
+                </div>
+"""
+    htmlContent += """            </div>
+        </div>
+    </main>
+    <footer>Generated from the cybersecurity breach dataset</footer>
+    <script src="main.js"></script>
+</body>
+</html>
+"""
     with open(Path(dashboardDir) / 'index.html', 'w') as f:
         f.write(htmlContent)
\ No newline at end of file
@@ -1,3 +1,4 @@
+import argparse
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
@@ -10,6 +11,11 @@ try:
     from src.analysis.financial_impact import analyze_financial_impact
     from src.analysis.attack_patterns import analyze_attack_patterns
     from src.analysis.resolution_vulnerability import analyze_resolution_vulnerability
+    from src.utils.dataset_context import DatasetContext
+    from src.utils.instrumentation import write_timing_report
+    from src.utils.low_memory import low_memory_default
+    from src.utils.profiling import PROFILE_MODES, enable_profiling, profile_mode_default
+    from src.utils.schema import required_columns
 except ImportError:
     print("Error importing analysis modules. Make sure you're running this script from the analysis directory.")
     sys.exit(1)
@@ -30,30 +36,55 @@ def create_dashboard():
         {'file': 'resolution_vs_financial_loss.png', 'title': 'Resolution Time vs Financial Loss'}
     ]
     with open(dashboardDir / 'cybersecurity_dashboard.html', 'w') as f:
-        f.write()
+        f.write("""<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <title>Cybersecurity Breach Analysis Dashboard</title>
+    <style>
+        body { font-family: Arial, sans-serif; margin: 0; padding: 20px; background-color: #f5f5f5; }
+        h1 { text-align: center; color: #2F75B5; }
+        .visualization-row { display: flex; gap: 20px; margin-bottom: 20px; }
+        .visualization { flex: 1; background: white; padding: 15px; border-radius: 5px; }
+        .visualization img { width: 100%; }
+        footer { text-align: center; color: #666; margin-top: 20px; }
+    </style>
+</head>
+<body>
+    <h1>Cybersecurity Breach Analysis Dashboard</h1>
+    <div class="visualization-row">
+""")
         for i, viz in enumerate(keyVisualizations):
             if i > 0 and i % 2 == 0:
                 f.write('</div>\n<div class="visualization-row">\n')
-            f.write(f)
-        f.write( + datetime.now().strftime("%Y-%m-%d %H:%M:%S") + )
+            f.write(f"""        <div class="visualization">
+            <h2>{viz['title']}</h2>
+            <img src="../{viz['file']}" alt="{viz['title']}">
+        </div>
+""")
+        f.write("""    </div>
+    <footer>Generated on """ + datetime.now().strftime("%Y-%m-%d %H:%M:%S") + """</footer>
+</body>
+</html>
+""")
     with open(dashboardDir / 'index.md', 'w') as f:
-        f.write("
+        f.write("# Cybersecurity Breach Analysis Dashboard\n\n")
         f.write(f"Generated on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
-        f.write("
+        f.write("## Interactive Dashboard\n\n")
         f.write("- [View Interactive Dashboard](cybersecurity_dashboard.html)\n\n")
-        f.write("
+        f.write("## Analysis Summaries\n\n")
         f.write("- [Financial Impact Analysis](../financial_impact_summary.md)\n")
         f.write("- [Attack Patterns Analysis](../attack_patterns_summary.md)\n")
         f.write("- [Resolution Time & Vulnerability Analysis](../resolution_vulnerability_summary.md)\n\n")
-        f.write("
-        f.write("
+        f.write("## Visualizations\n\n")
+        f.write("### Financial Impact\n\n")
         f.write("- [Financial Impact by Industry](../financial_impact_by_industry.png)\n")
         f.write("- [Financial Impact by Attack Type](../financial_impact_by_attack.png)\n")
         f.write("- [Financial Impact Distribution](../financial_impact_distribution.png)\n")
         f.write("- [Financial Impact Heatmap](../financial_impact_heatmap.png)\n")
         f.write("- [Financial Impact Trends](../financial_impact_trends.png)\n")
         f.write("- [Financial Impact by Vulnerability](../financial_impact_by_vulnerability.png)\n\n")
-        f.write("
+        f.write("### Attack Patterns\n\n")
         f.write("- [Attack Type Distribution](../attack_type_distribution.png)\n")
         f.write("- [Attack Evolution Over Time](../attack_evolution.png)\n")
         f.write("- [Attack Source Distribution](../attack_source_distribution.png)\n")
@@ -61,7 +92,7 @@ def create_dashboard():
         f.write("- [Attack Type by Industry](../attack_type_by_industry.png)\n")
         f.write("- [Geographic Attack Distribution](../geographic_attack_distribution.png)\n")
         f.write("- [Affected Users by Attack Type](../affected_users_by_attack.png)\n\n")
-        f.write("
+        f.write("### Resolution Time & Vulnerabilities\n\n")
         f.write("- [Resolution Time by Industry](../resolution_time_by_industry.png)\n")
         f.write("- [Resolution Time by Attack Type](../resolution_time_by_attack.png)\n")
         f.write("- [Resolution Time Distribution](../resolution_time_distribution.png)\n")
@@ -71,20 +102,51 @@ def create_dashboard():
         f.write("- [Vulnerability by Industry](../vulnerability_by_industry.png)\n")
     print(f"Dashboard created successfully at {dashboardDir / 'cybersecurity_dashboard.html'}")
     print(f"Index created successfully at {dashboardDir / 'index.md'}")
-def generate_comprehensive_analysis():
+def generate_comprehensive_analysis(context=None, rebuildCache=False, maxWorkers=None, incremental=False, forceRender=None, store=False, profile=None,
+                                    lowMemory=False):
     print("Starting comprehensive cybersecurity breach analysis...")
     outputDir = Path('analysis/output')
     outputDir.mkdir(exist_ok=True, parents=True)
-    print("\n=== FINANCIAL IMPACT ANALYSIS ===")
-    analyze_financial_impact()
-    print("\n=== ATTACK PATTERNS ANALYSIS ===")
-    analyze_attack_patterns()
-    print("\n=== RESOLUTION & VULNERABILITY ANALYSIS ===")
-    analyze_resolution_vulnerability()
-    print("\n=== CREATING DASHBOARD ===")
-    create_dashboard()
+    enable_profiling(outputDir / 'profiles', profile)
+    if profile is not None and maxWorkers is None:
+        maxWorkers = 1
+    if context is None:
+        context = DatasetContext(Path('../Enhanced_Cybersecurity_Data.csv'), rebuildCache=rebuildCache, incremental=incremental, store=store,
+                                 lowMemory=lowMemory, columns=required_columns(analyze_financial_impact, analyze_attack_patterns,
+                                                                               analyze_resolution_vulnerability))
+    if context.aggregates is None:
+        return
+    try:
+        print("\n=== FINANCIAL IMPACT ANALYSIS ===")
+        with context.timed('financial_impact'):
+            analyze_financial_impact(context, maxWorkers, forceRender)
+        print("\n=== ATTACK PATTERNS ANALYSIS ===")
+        with context.timed('attack_patterns'):
+            analyze_attack_patterns(context, maxWorkers, forceRender)
+        print("\n=== RESOLUTION & VULNERABILITY ANALYSIS ===")
+        with context.timed('resolution_vulnerability'):
+            analyze_resolution_vulnerability(context, maxWorkers, forceRender)
+        print("\n=== CREATING DASHBOARD ===")
+        with context.timed('dashboard'):
+            create_dashboard()
+    finally:
+        context.print_timings()
+        context.aggregates.print_report()
+        write_timing_report(outputDir)
     print("\nComprehensive analysis completed successfully!")
     print(f"All visualizations and reports are available in the {outputDir} directory")
     print(f"Dashboard is available at {outputDir / 'dashboard/cybersecurity_dashboard.html'}")
 if __name__ == "__main__":
-    generate_comprehensive_analysis()
\ No newline at end of file
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rebuild-cache', action='store_true', help='Re-parse the CSV and rewrite the columnar data cache')
+    parser.add_argument('--incremental', action='store_true', help='Fold only newly appended rows into the persisted aggregate store')
+    parser.add_argument('--workers', type=int, default=None, help='Number of chart rendering processes (default: CHART_WORKERS or CPU count)')
+    parser.add_argument('--force-render', action='store_true', help='Re-render every chart even when its inputs are unchanged')
+    parser.add_argument('--store', action='store_true', help='Answer aggregations from the indexed SQLite breach store instead of the in-memory frame')
+    parser.add_argument('--profile', nargs='?', const='cprofile', choices=PROFILE_MODES, default=profile_mode_default(),
+                        help='Profile each top-level stage with cProfile (default) or a low-overhead sampler; writes .prof and collapsed-stack files (default: PROFILE_MODE)')
+    parser.add_argument('--low-memory', action='store_true', default=low_memory_default(),
+                        help='Low-memory profile: downcast numerics, category-code strings, free cached aggregations between stages (default: LOW_MEMORY)')
+    args = parser.parse_args()
+    generate_comprehensive_analysis(rebuildCache=args.rebuild_cache, maxWorkers=args.workers, incremental=args.incremental, forceRender=args.force_render or None,
+                                    store=args.store, profile=args.profile, lowMemory=args.low_memory)
\ No newline at end of file
@@ -0,0 +1,106 @@
+import hashlib
+import pandas as pd
+from src.utils.contingency import pairwise_chi_square
+from src.utils.grouped_stats import STATISTICS, GroupedStatistics
+from src.utils.instrumentation import stage
+from src.utils.resampling import DEFAULT_RESAMPLES, bootstrap_group_means
+def dataset_fingerprint(df):
+    digest = hashlib.sha256(repr(list(df.columns)).encode())
+    digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return digest.hexdigest()[:16]
+def _key_tuple(keys):
+    return (keys,) if isinstance(keys, str) else tuple(keys)
+def _stage_name(kind, key):
+    parts = [', '.join(map(str, part)) if isinstance(part, tuple) else str(part) for part in key if part is not None]
+    return f"{kind}[{' | '.join(parts)}]"
+class AggregationCache:
+    def __init__(self, df, fingerprint=None, engine=None):
+        self.df = df
+        self.engine = engine
+        self.fingerprint = fingerprint if fingerprint is not None else dataset_fingerprint(df)
+        self.hits = 0
+        self.misses = 0
+        self._results = {}
+    def memoize(self, kind, key, compute):
+        cacheKey = (self.fingerprint, kind) + key
+        if cacheKey in self._results:
+            self.hits += 1
+            return self._results[cacheKey]
+        self.misses += 1
+        with stage(_stage_name(kind, key), 'aggregation'):
+            result = self._results[cacheKey] = compute()
+        return result
+    def clear(self):
+        self._results.clear()
+    def compute_groupby(self, keys, measure, agg):
+        if self.engine is not None:
+            return self.engine_groupby(keys, measure, agg)
+        if len(keys) == 1 and measure is not None and agg in STATISTICS and pd.api.types.is_numeric_dtype(self.df[measure]):
+            return self.stats(keys[0], measure)[agg].rename(measure)
+        grouped = self.df.groupby(list(keys), observed=True)
+        if measure is None:
+            return grouped.size()
+        return grouped[measure].agg(agg)
+    def engine_groupby(self, keys, measure, agg, engine=None):
+        engine = engine if engine is not None else self.engine
+        if len(keys) == 1 and measure is not None and agg in STATISTICS and pd.api.types.is_numeric_dtype(engine.column_dtype(measure)):
+            result = engine.groupby(keys, measure, agg, 'int64' if agg == 'count' else 'float64')
+            if isinstance(result.index, pd.CategoricalIndex):
+                result.index = result.index.categories.take(result.index.codes).rename(keys[0])
+            return result
+        return engine.groupby(keys, measure, agg)
+    def stats(self, key, measure):
+        return self.memoize('stats', ((key,), measure, STATISTICS), lambda: GroupedStatistics(self.df[key], self.df[measure]))
+    def bootstrap_means(self, key, measure, resamples=DEFAULT_RESAMPLES, seed=0, maxWorkers=1, maxGroupDraws=None):
+        def compute():
+            return bootstrap_group_means(self.stats(key, measure), resamples, seed=seed, maxWorkers=maxWorkers, maxGroupDraws=maxGroupDraws)
+        return self.memoize('bootstrap', ((key,), measure, resamples, seed, maxGroupDraws), compute)
+    def groupby(self, keys, measure=None, agg='size'):
+        keys = _key_tuple(keys)
+        return self.memoize('groupby', (keys, measure, agg), lambda: self.compute_groupby(keys, measure, agg))
+    def pivot(self, index, columns, measure=None, agg='size', fillValue=None):
+        def compute():
+            return self.groupby([index, columns], measure, agg).unstack(columns, fill_value=fillValue)
+        return self.memoize('pivot', ((index, columns), measure, agg, fillValue), compute)
+    def crosstab(self, index, columns):
+        return self.pivot(index, columns, fillValue=0)
+    def summary(self, keys, columns):
+        keys = _key_tuple(keys)
+        frame = pd.concat([self.groupby(keys, measure, agg) for measure, agg in columns.values()], axis=1)
+        frame.columns = list(columns)
+        return frame.reset_index()
+    def raw(self, columns):
+        return self.df[list(columns)]
+    def sample_caption(self):
+        return None
+    def describe(self, columns):
+        columns = tuple(columns)
+        def compute():
+            if self.engine is not None:
+                return self.engine.describe(columns)
+            return self.raw(columns).describe().T
+        return self.memoize('describe', (columns,), compute)
+    def corr(self, columns):
+        columns = tuple(columns)
+        def compute():
+            if self.engine is not None:
+                return self.engine.corr(columns)
+            return self.raw(columns).corr()
+        return self.memoize('corr', (columns,), compute)
+    def chi_square(self, columns):
+        columns = tuple(columns)
+        return self.memoize('chi_square', (columns,), lambda: pairwise_chi_square(self.raw(columns), columns))
+    def value_counts(self, column):
+        return self.memoize('value_counts', ((column,), None, 'size'), lambda: self.groupby(column).sort_values(ascending=False, kind='stable'))
+    def compute_total(self, measure, agg):
+        if measure is None:
+            return len(self.df)
+        return self.df[measure].agg(agg)
+    def total(self, measure, agg):
+        return self.memoize('total', ((), measure, agg), lambda: self.compute_total(measure, agg))
+    def row_count(self):
+        return int(self.total(None, 'size'))
+    def print_report(self):
+        lookups = self.hits + self.misses
+        hitRate = self.hits / lookups * 100 if lookups else 0.0
+        print(f"Aggregation cache: {self.hits} hits, {self.misses} misses ({hitRate:.1f}% reused, {len(self._results)} cached results)")
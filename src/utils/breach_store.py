@@ -0,0 +1,182 @@
+import hashlib
+import json
+import os
+import sqlite3
+import numpy as np
+import pandas as pd
+from src.utils.aggregation import AggregationCache
+from src.utils.data_cache import cache_paths, read_cache_meta, source_signature
+from src.utils.dataframe_backend import DataFrameEngine, quote
+from src.utils.excel_writer import frame_chunks
+from src.utils.grouped_stats import STATISTICS, GroupedStatistics
+from src.utils.ingestion import CHUNK_ROWS, iter_breach_chunks
+from src.utils.schema import BREACH_COLUMNS, BREACH_SCHEMA, FINANCIAL_LOSS, AFFECTED_USERS, RESOLUTION_HOURS
+TABLE_NAME = 'breaches'
+INDEXED_DIMENSIONS = [
+    'Year',
+    'Country',
+    'Attack Type',
+    'Target Industry Standardized',
+    'Defense Mechanism Used',
+    'Security Vulnerability Type'
+]
+COVERED_MEASURES = [FINANCIAL_LOSS, AFFECTED_USERS, RESOLUTION_HOURS]
+STORE_INDEXES = {
+    **{f'idx_{dimension.lower().replace(" ", "_")}': [dimension] + COVERED_MEASURES for dimension in INDEXED_DIMENSIONS},
+    'idx_industry_year_attack': ['Target Industry Standardized', 'Year', 'Attack Type'] + COVERED_MEASURES
+}
+SQL_AGGREGATIONS = {'count': 'COUNT', 'sum': 'SUM', 'mean': 'AVG', 'min': 'MIN', 'max': 'MAX'}
+def store_layout():
+    return hashlib.sha256(repr(sorted(STORE_INDEXES.items())).encode()).hexdigest()[:16]
+def store_path(dataPath, cacheDir=None):
+    cachePath, _ = cache_paths(dataPath, cacheDir)
+    return cachePath.with_suffix('.sqlite')
+def column_type(column):
+    dtype = pd.api.types.pandas_dtype(BREACH_SCHEMA[column])
+    if pd.api.types.is_integer_dtype(dtype):
+        return 'INTEGER'
+    if pd.api.types.is_float_dtype(dtype):
+        return 'REAL'
+    return 'TEXT'
+def sql_value(value):
+    return value.item() if isinstance(value, np.generic) else value
+def where_clause(filters):
+    conditions, params = [], []
+    for column, value in (filters or {}).items():
+        if column not in BREACH_SCHEMA:
+            raise ValueError(f"Unknown breach column '{column}'")
+        if isinstance(value, (list, tuple, set)):
+            values = list(value)
+            conditions.append(f"{quote(column)} IN ({', '.join('?' * len(values))})")
+            params += [sql_value(item) for item in values]
+        else:
+            conditions.append(f'{quote(column)} = ?')
+            params.append(sql_value(value))
+    return (' WHERE ' + ' AND '.join(conditions) if conditions else ''), params
+def read_store_meta(path):
+    try:
+        with sqlite3.connect(f'file:{path}?mode=ro', uri=True) as connection:
+            return json.loads(connection.execute("SELECT value FROM store_meta WHERE key = 'signature'").fetchone()[0])
+    except (sqlite3.Error, TypeError, ValueError):
+        return None
+def write_breach_store(dataPath, path, chunkSize=CHUNK_ROWS):
+    tmpPath = path.with_suffix('.sqlite.tmp')
+    if tmpPath.exists():
+        tmpPath.unlink()
+    connection = sqlite3.connect(tmpPath)
+    try:
+        connection.execute('PRAGMA journal_mode = OFF')
+        connection.execute('PRAGMA synchronous = OFF')
+        connection.execute(f"CREATE TABLE {TABLE_NAME} ({', '.join(f'{quote(col)} {column_type(col)}' for col in BREACH_COLUMNS)})")
+        insert = f"INSERT INTO {TABLE_NAME} VALUES ({', '.join('?' * len(BREACH_COLUMNS))})"
+        rows = 0
+        for chunk in iter_breach_chunks(dataPath, chunkSize):
+            for values in frame_chunks(chunk[BREACH_COLUMNS], chunkSize):
+                connection.executemany(insert, values.tolist())
+            rows += len(chunk)
+        for name, columns in STORE_INDEXES.items():
+            connection.execute(f"CREATE INDEX {name} ON {TABLE_NAME} ({', '.join(quote(col) for col in columns)})")
+        connection.execute('ANALYZE')
+        signature = dict(source_signature(dataPath), layout=store_layout(), rows=rows)
+        connection.execute('CREATE TABLE store_meta (key TEXT PRIMARY KEY, value TEXT)')
+        connection.execute("INSERT INTO store_meta VALUES ('signature', ?)", (json.dumps(signature),))
+        connection.commit()
+    finally:
+        connection.close()
+    os.replace(tmpPath, path)
+    return signature
+def build_breach_store(dataPath, rebuild=False, cacheDir=None, chunkSize=CHUNK_ROWS):
+    path = store_path(dataPath, cacheDir)
+    previous = None if rebuild or not path.exists() else read_store_meta(path)
+    if previous is not None:
+        signature = source_signature(dataPath, previous)
+        if signature['sha256'] != previous.get('sha256') or signature['schema'] != previous.get('schema') or previous.get('layout') != store_layout():
+            previous = None
+    if previous is None:
+        path.parent.mkdir(exist_ok=True, parents=True)
+        print(f"Building breach store from {dataPath}")
+        previous = write_breach_store(dataPath, path, chunkSize)
+        print(f"Breach store: {previous['rows']} rows indexed on {', '.join(INDEXED_DIMENSIONS)}")
+    return BreachStore(path, previous)
+class BreachStore:
+    def __init__(self, path, signature=None):
+        self.path = path
+        self.signature = signature if signature is not None else read_store_meta(path)
+        self.connection = sqlite3.connect(f'file:{path}?mode=ro', uri=True, check_same_thread=False)
+        self._dtypes = {}
+    def dtype(self, column):
+        if column not in self._dtypes:
+            dtype = pd.api.types.pandas_dtype(BREACH_SCHEMA[column])
+            if isinstance(dtype, pd.CategoricalDtype) and dtype.categories is None:
+                values = self.connection.execute(f'SELECT DISTINCT {quote(column)} FROM {TABLE_NAME} WHERE {quote(column)} IS NOT NULL ORDER BY 1').fetchall()
+                dtype = pd.CategoricalDtype([row[0] for row in values])
+            self._dtypes[column] = dtype
+        return self._dtypes[column]
+    def query(self, sql, params=()):
+        return pd.read_sql_query(sql, self.connection, params=list(params))
+    def explain(self, sql, params=()):
+        return [row[-1] for row in self.connection.execute(f'EXPLAIN QUERY PLAN {sql}', list(params)).fetchall()]
+    def slice(self, filters=None, columns=None):
+        columns = list(columns) if columns is not None else BREACH_COLUMNS
+        where, params = where_clause(filters)
+        frame = self.query(f"SELECT {', '.join(quote(col) for col in columns)} FROM {TABLE_NAME}{where} ORDER BY rowid", params)
+        return frame.astype({col: self.dtype(col) for col in columns})
+    def count(self, filters=None):
+        where, params = where_clause(filters)
+        return self.connection.execute(f'SELECT COUNT(*) FROM {TABLE_NAME}{where}', params).fetchone()[0]
+    def aggregates(self, filters=None):
+        return StoreQueryAggregates(self, filters)
+class StoreQueryEngine(DataFrameEngine):
+    name = 'sqlite'
+    def __init__(self, store, filters=None):
+        super().__init__(None)
+        self.store = store
+        self.filters = dict(filters or {})
+    def column_dtype(self, column):
+        return self.store.dtype(column)
+    def groupby_table(self, keys, measure, agg):
+        if measure is not None and agg not in SQL_AGGREGATIONS and agg not in ('std', 'var'):
+            frame = self.store.slice(self.filters, list(keys) + [measure])
+            return frame.groupby(list(keys), observed=True)[measure].agg(agg).rename('value').reset_index()
+        keyList = ', '.join(quote(key) for key in keys)
+        where, params = where_clause(dict(self.filters))
+        notNull = ' AND '.join(f'{quote(key)} IS NOT NULL' for key in keys)
+        where = f'{where} AND {notNull}' if where else f' WHERE {notNull}'
+        if measure is not None and agg in ('std', 'var'):
+            centred = (f'SELECT {keyList}, CAST({quote(measure)} AS REAL) AS x, AVG(CAST({quote(measure)} AS REAL)) OVER (PARTITION BY {keyList}) AS mean'
+                       f' FROM {TABLE_NAME}{where}')
+            value = 'CASE WHEN COUNT(x) > 1 THEN SUM((x - mean) * (x - mean)) / (COUNT(x) - 1) END'
+            table = self.store.query(f'SELECT {keyList}, {value} AS value FROM ({centred}) GROUP BY {keyList}', params)
+            if agg == 'std':
+                table['value'] = np.sqrt(table['value'].astype('float64'))
+            return table
+        value = 'COUNT(*)' if measure is None else f'{SQL_AGGREGATIONS[agg]}({quote(measure)})'
+        return self.store.query(f'SELECT {keyList}, {value} AS value FROM {TABLE_NAME}{where} GROUP BY {keyList}', params)
+    def describe(self, columns):
+        return self.store.slice(self.filters, columns).describe().T
+    def corr(self, columns):
+        return self.store.slice(self.filters, columns).corr()
+class StoreQueryAggregates(AggregationCache):
+    def __init__(self, store, filters=None):
+        filters = dict(filters or {})
+        fingerprint = hashlib.sha256(f"{(store.signature or {}).get('sha256')}:{sorted(filters.items(), key=str)}".encode()).hexdigest()[:16]
+        super().__init__(None, fingerprint, StoreQueryEngine(store, filters))
+        self.store = store
+        self.filters = filters
+    def where(self, filters):
+        return StoreQueryAggregates(self.store, {**self.filters, **filters})
+    def stats(self, key, measure):
+        def compute():
+            frame = self.store.slice(self.filters, [key, measure])
+            return GroupedStatistics(frame[key], frame[measure])
+        return self.memoize('stats', ((key,), measure, STATISTICS), compute)
+    def raw(self, columns):
+        return self.memoize('raw', (tuple(columns),), lambda: self.store.slice(self.filters, columns))
+    def compute_total(self, measure, agg):
+        if measure is None:
+            return self.store.count(self.filters)
+        if agg in SQL_AGGREGATIONS:
+            where, params = where_clause(self.filters)
+            value = self.store.connection.execute(f'SELECT {SQL_AGGREGATIONS[agg]}({quote(measure)}) FROM {TABLE_NAME}{where}', params).fetchone()[0]
+            return np.nan if value is None else value
+        return self.raw([measure])[measure].agg(agg)
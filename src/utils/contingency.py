@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+from scipy import stats
+from src.utils.grouped_stats import factorize_keys
+CHI_SQUARE_COLUMNS = ['Variable 1', 'Variable 2', 'Chi-Square', 'p-value', 'Degrees of Freedom', "Cramér's V", 'Observations']
+def contingency_table(codes1, codes2, size1, size2):
+    valid = (codes1 >= 0) & (codes2 >= 0)
+    table = np.bincount(codes1[valid] * size2 + codes2[valid], minlength=size1 * size2).reshape(size1, size2)
+    return table[table.sum(axis=1) > 0][:, table.sum(axis=0) > 0]
+def stacked_tables(tables):
+    rows = max((table.shape[0] for table in tables), default=0)
+    cols = max((table.shape[1] for table in tables), default=0)
+    stacked = np.zeros((len(tables), rows, cols), dtype=np.float64)
+    for i, table in enumerate(tables):
+        stacked[i, :table.shape[0], :table.shape[1]] = table
+    return stacked
+def batched_chi_square(tables):
+    observed = stacked_tables(tables)
+    rowSums = observed.sum(axis=2)
+    colSums = observed.sum(axis=1)
+    totals = rowSums.sum(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        expected = rowSums[:, :, None] * colSums[:, None, :] / totals[:, None, None]
+        dof = np.maximum(np.count_nonzero(rowSums, axis=1) - 1, 0) * np.maximum(np.count_nonzero(colSums, axis=1) - 1, 0)
+        deviations = observed - expected
+        chi2 = np.where(expected > 0, deviations * deviations / expected, 0.0).sum(axis=(1, 2))
+        corrected = np.abs(deviations) - np.minimum(0.5, np.abs(deviations))
+        yates = np.where(expected > 0, corrected * corrected / expected, 0.0).sum(axis=(1, 2))
+        minDim = np.minimum(np.count_nonzero(rowSums, axis=1), np.count_nonzero(colSums, axis=1)) - 1
+    defined = (minDim > 0) & (totals > 0)
+    cramersV = np.zeros(len(chi2))
+    cramersV[defined] = np.sqrt(chi2[defined] / totals[defined] / minDim[defined])
+    statistic = np.where(dof == 1, yates, np.where(dof > 0, chi2, 0.0))
+    pValues = np.where(dof > 0, stats.chi2.sf(statistic, np.maximum(dof, 1)), 1.0)
+    return statistic, pValues, dof, cramersV, totals
+def pairwise_chi_square(df, columns):
+    columns = list(columns)
+    coded = [factorize_keys(df[col]) for col in columns]
+    pairs, tables = [], []
+    for i, (codes1, labels1) in enumerate(coded):
+        for j in range(i + 1, len(columns)):
+            codes2, labels2 = coded[j]
+            pairs.append((columns[i], columns[j]))
+            tables.append(contingency_table(codes1, codes2, len(labels1), len(labels2)))
+    statistic, pValues, dof, cramersV, totals = batched_chi_square(tables)
+    return pd.DataFrame({
+        'Variable 1': [pair[0] for pair in pairs],
+        'Variable 2': [pair[1] for pair in pairs],
+        'Chi-Square': statistic,
+        'p-value': pValues,
+        'Degrees of Freedom': dof,
+        "Cramér's V": cramersV,
+        'Observations': totals.astype('int64')
+    }, columns=CHI_SQUARE_COLUMNS)
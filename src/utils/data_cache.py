@@ -0,0 +1,101 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+from src.utils.ingestion import read_breach_csv
+from src.utils.schema import BREACH_COLUMNS, BREACH_SCHEMA
+try:
+    import pyarrow.feather as feather
+except ImportError:
+    feather = None
+CACHE_DIR_NAME = '.cache'
+HASH_BLOCK_SIZE = 1 << 20
+def schema_version():
+    return hashlib.sha256(repr(sorted((col, str(dtype)) for col, dtype in BREACH_SCHEMA.items())).encode()).hexdigest()[:16]
+def file_sha256(dataPath):
+    digest = hashlib.sha256()
+    with open(dataPath, 'rb') as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+def cache_paths(dataPath, cacheDir=None):
+    dataPath = Path(dataPath)
+    cacheDir = Path(cacheDir) if cacheDir is not None else dataPath.parent / CACHE_DIR_NAME
+    return cacheDir / f'{dataPath.stem}.feather', cacheDir / f'{dataPath.stem}.json'
+def read_cache_meta(metaPath):
+    try:
+        with open(metaPath) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+def source_signature(dataPath, previous=None):
+    stat = os.stat(dataPath)
+    signature = {'size': stat.st_size, 'mtime': stat.st_mtime_ns, 'schema': schema_version()}
+    if previous and all(previous.get(key) == value for key, value in signature.items()):
+        signature['sha256'] = previous.get('sha256')
+    else:
+        signature['sha256'] = file_sha256(dataPath)
+    return signature
+def covers_columns(cachedColumns, columns):
+    if cachedColumns is None:
+        return True
+    return columns is not None and set(columns) <= set(cachedColumns)
+def read_cached_frame(dataPath, cacheDir=None, columns=None):
+    if feather is None:
+        return None
+    cachePath, metaPath = cache_paths(dataPath, cacheDir)
+    previous = read_cache_meta(metaPath)
+    if previous is None or not cachePath.exists() or not covers_columns(previous.get('columns'), columns):
+        return None
+    signature = source_signature(dataPath, previous)
+    if signature['sha256'] != previous.get('sha256') or signature['schema'] != previous.get('schema'):
+        return None
+    signature['columns'] = previous.get('columns')
+    if signature != previous:
+        write_cache_meta(metaPath, signature)
+    table = feather.read_table(cachePath, columns=None if columns is None else list(columns), memory_map=True)
+    return table.to_pandas()
+def merge_cached_columns(cachePath, previous, signature, df, columns):
+    if previous is None or not cachePath.exists() or any(previous.get(key) != signature[key] for key in ('sha256', 'schema')):
+        return df, columns
+    cached = feather.read_table(cachePath, memory_map=True).to_pandas()
+    if len(cached) != len(df):
+        return df, columns
+    for col in df.columns:
+        cached[col] = df[col].array
+    if previous.get('columns') is None:
+        return cached, None
+    merged = [col for col in BREACH_COLUMNS if col in cached.columns] + [col for col in cached.columns if col not in BREACH_COLUMNS]
+    return cached[merged], merged
+def write_cache_meta(metaPath, signature):
+    tmpPath = metaPath.with_suffix('.json.tmp')
+    with open(tmpPath, 'w') as f:
+        json.dump(signature, f)
+    os.replace(tmpPath, metaPath)
+def write_cached_frame(dataPath, df, cacheDir=None, columns=None):
+    if feather is None:
+        return False
+    cachePath, metaPath = cache_paths(dataPath, cacheDir)
+    try:
+        cachePath.parent.mkdir(exist_ok=True, parents=True)
+        signature = source_signature(dataPath)
+        if columns is not None:
+            df, columns = merge_cached_columns(cachePath, read_cache_meta(metaPath), signature, df, columns)
+        signature['columns'] = None if columns is None else list(columns)
+        tmpPath = cachePath.with_suffix('.feather.tmp')
+        feather.write_feather(df.reset_index(drop=True), tmpPath, compression='uncompressed')
+        os.replace(tmpPath, cachePath)
+        write_cache_meta(metaPath, signature)
+    except Exception as e:
+        print(f"Note: Could not write data cache: {e}")
+        return False
+    return True
+def load_breach_data(dataPath, useCache=True, rebuildCache=False, columns=None):
+    df = None
+    if useCache and not rebuildCache:
+        df = read_cached_frame(dataPath, columns=columns)
+    if df is None:
+        df = read_breach_csv(dataPath, usecols=columns)
+        if useCache:
+            write_cached_frame(dataPath, df, columns=columns)
+    return df[columns] if columns is not None and list(df.columns) != list(columns) else df
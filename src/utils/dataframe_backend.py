@@ -0,0 +1,165 @@
+import os
+from abc import ABC, abstractmethod
+import numpy as np
+import pandas as pd
+try:
+    import polars as pl
+except ImportError:
+    pl = None
+try:
+    import duckdb
+except ImportError:
+    duckdb = None
+DATAFRAME_ENGINES = ('pandas', 'polars', 'duckdb')
+DESCRIBE_STATISTICS = ['count', 'mean', 'std', 'min', '25%', '50%', '75%', 'max']
+QUANTILES = {'25%': 0.25, '50%': 0.5, '75%': 0.75}
+class DataFrameEngine(ABC):
+    name = None
+    def __init__(self, df):
+        self.df = df
+    def column_dtype(self, column):
+        return self.df[column].dtype
+    @abstractmethod
+    def groupby_table(self, keys, measure, agg):
+        pass
+    def groupby(self, keys, measure=None, agg='size', dtype=None):
+        keys = list(keys)
+        table = self.groupby_table(keys, measure, agg)
+        arrays = []
+        for key in keys:
+            keyDtype = self.column_dtype(key)
+            arrays.append(pd.Categorical(table[key].to_numpy(), dtype=keyDtype) if isinstance(keyDtype, pd.CategoricalDtype) else table[key].astype(keyDtype).to_numpy())
+        index = pd.Index(arrays[0], name=keys[0]) if len(keys) == 1 else pd.MultiIndex.from_arrays(arrays, names=keys)
+        values = table['value'].astype(dtype or self.result_dtype(measure, agg, table['value'])).to_numpy()
+        return pd.Series(values, index=index, name=measure).sort_index()
+    def result_dtype(self, measure, agg, values=None):
+        if agg in ('size', 'count'):
+            return 'int64'
+        dtype = self.column_dtype(measure)
+        if agg == 'sum' and values is not None and len(values) and pd.api.types.is_integer_dtype(dtype):
+            limits = np.iinfo(dtype)
+            if values.min() < limits.min or values.max() > limits.max:
+                return 'int64'
+        if pd.api.types.is_float_dtype(dtype) or agg in ('sum', 'min', 'max'):
+            return dtype
+        return 'float64'
+class PandasEngine(DataFrameEngine):
+    name = 'pandas'
+    def groupby_table(self, keys, measure, agg):
+        grouped = self.df.groupby(keys, observed=True)
+        result = grouped.size() if measure is None else grouped[measure].agg(agg)
+        return result.rename('value').reset_index()
+    def describe(self, columns):
+        return self.df[list(columns)].describe().T[DESCRIBE_STATISTICS]
+    def corr(self, columns):
+        return self.df[list(columns)].corr()
+class PolarsEngine(DataFrameEngine):
+    name = 'polars'
+    def __init__(self, df):
+        super().__init__(df)
+        self.frame = pl.from_pandas(df).with_columns(
+            [pl.col(col).cast(pl.Utf8) for col in df.columns if isinstance(df[col].dtype, pd.CategoricalDtype)]
+        ).lazy()
+    def aggregation(self, measure, agg):
+        if measure is None:
+            return pl.len()
+        col = pl.col(measure).cast(pl.Float64)
+        expressions = {
+            'count': pl.col(measure).count(),
+            'sum': col.sum(),
+            'mean': col.mean(),
+            'std': col.std(),
+            'var': col.var(),
+            'min': col.min(),
+            'max': col.max(),
+            'median': col.median()
+        }
+        return expressions[agg]
+    def groupby_table(self, keys, measure, agg):
+        return self.frame.drop_nulls(keys).group_by(keys).agg(self.aggregation(measure, agg).alias('value')).collect().to_pandas()
+    def describe(self, columns):
+        expressions = []
+        for col in columns:
+            values = pl.col(col).cast(pl.Float64)
+            expressions += [
+                values.count().cast(pl.Float64).alias(f'{col}|count'),
+                values.mean().alias(f'{col}|mean'),
+                values.std().alias(f'{col}|std'),
+                values.min().alias(f'{col}|min'),
+                values.quantile(0.25, interpolation='linear').alias(f'{col}|25%'),
+                values.quantile(0.5, interpolation='linear').alias(f'{col}|50%'),
+                values.quantile(0.75, interpolation='linear').alias(f'{col}|75%'),
+                values.max().alias(f'{col}|max')
+            ]
+        row = self.frame.select(expressions).collect().row(0, named=True)
+        return pd.DataFrame([[row[f'{col}|{stat}'] for stat in DESCRIBE_STATISTICS] for col in columns],
+                            index=list(columns), columns=DESCRIBE_STATISTICS, dtype='float64')
+    def corr(self, columns):
+        columns = list(columns)
+        expressions = [
+            pl.corr(pl.col(a).cast(pl.Float64), pl.col(b).cast(pl.Float64)).alias(f'{a}|{b}')
+            for i, a in enumerate(columns) for b in columns[i + 1:]
+        ]
+        row = self.frame.select(expressions).collect().row(0, named=True) if expressions else {}
+        matrix = pd.DataFrame(np.eye(len(columns)), index=columns, columns=columns)
+        for i, a in enumerate(columns):
+            for b in columns[i + 1:]:
+                matrix.loc[a, b] = matrix.loc[b, a] = row[f'{a}|{b}']
+        return matrix
+def quote(name):
+    return '"' + name.replace('"', '""') + '"'
+class DuckDBEngine(DataFrameEngine):
+    name = 'duckdb'
+    SQL_AGGREGATIONS = {'count': 'COUNT', 'sum': 'SUM', 'mean': 'AVG', 'std': 'STDDEV_SAMP', 'var': 'VAR_SAMP',
+                        'min': 'MIN', 'max': 'MAX', 'median': 'MEDIAN'}
+    def __init__(self, df):
+        super().__init__(df)
+        self.connection = duckdb.connect()
+        self.connection.register('breach', df)
+    def query(self, sql):
+        return self.connection.execute(sql).df()
+    def groupby_table(self, keys, measure, agg):
+        keyList = ', '.join(quote(key) for key in keys)
+        if measure is None:
+            value = 'COUNT(*)'
+        elif agg == 'count':
+            value = f'COUNT({quote(measure)})'
+        else:
+            value = f'{self.SQL_AGGREGATIONS[agg]}(CAST({quote(measure)} AS DOUBLE))'
+        notNull = ' AND '.join(f'{quote(key)} IS NOT NULL' for key in keys)
+        table = self.query(f'SELECT {keyList}, {value} AS value FROM breach WHERE {notNull} GROUP BY {keyList}')
+        for key in keys:
+            if isinstance(self.df[key].dtype, pd.CategoricalDtype):
+                table[key] = table[key].astype(object)
+        return table
+    def describe(self, columns):
+        selects = []
+        for col in columns:
+            value = f'CAST({quote(col)} AS DOUBLE)'
+            selects += [f'CAST(COUNT({value}) AS DOUBLE)', f'AVG({value})', f'STDDEV_SAMP({value})', f'MIN({value})',
+                        f'QUANTILE_CONT({value}, 0.25)', f'QUANTILE_CONT({value}, 0.5)', f'QUANTILE_CONT({value}, 0.75)', f'MAX({value})']
+        row = self.connection.execute(f"SELECT {', '.join(selects)} FROM breach").fetchone()
+        values = np.asarray(row, dtype=np.float64).reshape(len(columns), len(DESCRIBE_STATISTICS))
+        return pd.DataFrame(values, index=list(columns), columns=DESCRIBE_STATISTICS)
+    def corr(self, columns):
+        columns = list(columns)
+        pairs = [(a, b) for i, a in enumerate(columns) for b in columns[i + 1:]]
+        matrix = pd.DataFrame(np.eye(len(columns)), index=columns, columns=columns)
+        if pairs:
+            selects = ', '.join(f'CORR(CAST({quote(a)} AS DOUBLE), CAST({quote(b)} AS DOUBLE))' for a, b in pairs)
+            for (a, b), value in zip(pairs, self.connection.execute(f'SELECT {selects} FROM breach').fetchone()):
+                matrix.loc[a, b] = matrix.loc[b, a] = value
+        return matrix
+ENGINE_CLASSES = {'pandas': PandasEngine, 'polars': PolarsEngine, 'duckdb': DuckDBEngine}
+ENGINE_MODULES = {'pandas': pd, 'polars': pl, 'duckdb': duckdb}
+def available_engines():
+    return [name for name in DATAFRAME_ENGINES if ENGINE_MODULES[name] is not None]
+def dataframe_engine_name(engine=None):
+    engine = (engine or os.environ.get('DATAFRAME_ENGINE', 'pandas')).lower()
+    if engine not in DATAFRAME_ENGINES:
+        raise ValueError(f"Unknown dataframe engine '{engine}', expected one of {', '.join(DATAFRAME_ENGINES)}")
+    if ENGINE_MODULES[engine] is None:
+        raise ValueError(f"Dataframe engine '{engine}' requires the {engine} package, which is not installed")
+    return engine
+def create_engine(df, engine):
+    return ENGINE_CLASSES[dataframe_engine_name(engine)](df)
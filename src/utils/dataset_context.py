@@ -0,0 +1,90 @@
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from src.utils.breach_store import build_breach_store
+from src.utils.data_cache import read_cached_frame, write_cached_frame
+from src.utils.incremental import StoreAggregates, update_aggregate_store
+from src.utils import instrumentation
+from src.utils.ingestion import CHUNK_ROWS, read_breach_csv
+from src.utils.low_memory import compact_frame, release_memory
+from src.utils.parallel_aggregation import create_aggregation_cache
+from src.utils.streaming import stream_breach_aggregates
+class DatasetContext:
+    def __init__(self, dataPath, useCache=True, rebuildCache=False, incremental=False, streaming=False,
+                 chunkSize=CHUNK_ROWS, samplingPolicy=None, engine=None, store=False, lowMemory=False, columns=None):
+        self.dataPath = Path(dataPath)
+        self.useCache = useCache
+        self.rebuildCache = rebuildCache
+        self.incremental = incremental
+        self.streaming = streaming
+        self.chunkSize = chunkSize
+        self.samplingPolicy = samplingPolicy
+        self.engine = engine
+        self.store = store
+        self.lowMemory = lowMemory
+        self.columns = columns
+        self.timings = {}
+        self._df = None
+        self._aggregates = None
+    @classmethod
+    def from_candidates(cls, candidatePaths, **kwargs):
+        for dataPath in candidatePaths:
+            if Path(dataPath).exists():
+                return cls(dataPath, **kwargs)
+        return None
+    @contextmanager
+    def timed(self, stage):
+        start = time.perf_counter()
+        try:
+            with instrumentation.stage(stage, 'pipeline'):
+                yield
+                if self.lowMemory:
+                    release_memory(self._aggregates)
+        finally:
+            self.timings[stage] = self.timings.get(stage, 0.0) + time.perf_counter() - start
+    def load(self):
+        if self._df is not None:
+            return self._df
+        try:
+            if self.useCache and not self.rebuildCache:
+                with self.timed('cache_read'):
+                    self._df = read_cached_frame(self.dataPath, columns=self.columns)
+            if self._df is None:
+                with self.timed('load'):
+                    self._df = read_breach_csv(self.dataPath, usecols=self.columns)
+                if self.useCache:
+                    with self.timed('cache_write'):
+                        write_cached_frame(self.dataPath, self._df, columns=self.columns)
+        except Exception as e:
+            print(f"Error loading data: {e}")
+            return None
+        if self.lowMemory:
+            self._df = compact_frame(self._df)
+        print(f"Loaded data with {len(self._df)} records from {self.dataPath}")
+        return self._df
+    @property
+    def df(self):
+        return self.load()
+    @property
+    def aggregates(self):
+        if self._aggregates is None and self.streaming:
+            try:
+                with self.timed('stream'):
+                    self._aggregates = stream_breach_aggregates(self.dataPath, self.chunkSize, self.samplingPolicy)
+            except Exception as e:
+                print(f"Error streaming data: {e}")
+                return None
+        elif self._aggregates is None and self.store:
+            with self.timed('breach_store'):
+                self._aggregates = build_breach_store(self.dataPath, self.rebuildCache, chunkSize=self.chunkSize).aggregates()
+        elif self._aggregates is None and self.incremental:
+            with self.timed('aggregate_store'):
+                self._aggregates = StoreAggregates(update_aggregate_store(self.dataPath, self.rebuildCache), self.load)
+        elif self._aggregates is None and self.load() is not None:
+            with self.timed('fingerprint'):
+                self._aggregates = create_aggregation_cache(self._df, engine=self.engine)
+        return self._aggregates
+    def print_timings(self):
+        print("\n=== STAGE TIMINGS ===")
+        for stage, seconds in self.timings.items():
+            print(f"{stage:<40} {seconds:>10.3f}s")
@@ -0,0 +1,82 @@
+import numpy as np
+DEFAULT_GRIDSIZE = 200
+VIOLIN_GRIDSIZE = 100
+def scott_bandwidth(stds, counts):
+    return stds * np.power(counts, -1 / 5)
+def silverman_bandwidth(stds, counts):
+    return stds * np.power(counts * 0.75, -1 / 5)
+def kde_bandwidth(method, stds, counts):
+    if method == 'scott':
+        return scott_bandwidth(stds, counts)
+    if method == 'silverman':
+        return silverman_bandwidth(stds, counts)
+    if np.isscalar(method) and not isinstance(method, str):
+        return stds * method
+    raise ValueError(f"Unknown bandwidth method '{method}', expected 'scott', 'silverman' or a scalar factor")
+def group_support(lower, upper, gridsize=DEFAULT_GRIDSIZE):
+    return lower[:, None] + (upper - lower)[:, None] * np.linspace(0, 1, gridsize)
+def linear_binning(values, groupIds, lower, upper, gridsize=DEFAULT_GRIDSIZE):
+    nGroups = len(lower)
+    delta = (upper - lower) / (gridsize - 1)
+    delta = np.where(delta > 0, delta, 1.0)
+    position = (values - lower[groupIds]) / delta[groupIds]
+    left = np.clip(np.floor(position).astype(np.int64), 0, gridsize - 2)
+    weight = np.clip(position - left, 0, 1)
+    cells = groupIds * gridsize + left
+    binned = np.bincount(cells, weights=1 - weight, minlength=nGroups * gridsize)
+    binned += np.bincount(cells + 1, weights=weight, minlength=nGroups * gridsize)
+    return binned.reshape(nGroups, gridsize)
+def gaussian_smooth(binned, sigmaBins):
+    gridsize = binned.shape[1]
+    finite = sigmaBins[np.isfinite(sigmaBins)]
+    padding = int(np.ceil(4 * finite.max())) if len(finite) else 0
+    length = 1 << int(np.ceil(np.log2(gridsize + padding)))
+    frequencies = np.fft.rfftfreq(length)
+    kernel = np.exp(-2 * (np.pi * frequencies[None, :] * np.nan_to_num(sigmaBins)[:, None]) ** 2)
+    return np.fft.irfft(np.fft.rfft(binned, length, axis=1) * kernel, length, axis=1)[:, :gridsize]
+def binned_kde(values, groupIds, counts, stds, lower, upper, gridsize=DEFAULT_GRIDSIZE, cut=0, bandwidth='scott'):
+    counts = np.asarray(counts, dtype=np.float64)
+    valid = (counts > 1) & (stds > 0)
+    bandwidth = np.where(valid, kde_bandwidth(bandwidth, stds, counts), 0)
+    low = lower - cut * bandwidth
+    high = upper + cut * bandwidth
+    delta = (high - low) / (gridsize - 1)
+    binned = linear_binning(values, groupIds, low, high, gridsize)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        density = gaussian_smooth(binned, bandwidth / delta) / (counts * delta)[:, None]
+    density[~valid] = np.nan
+    return group_support(low, high, gridsize), np.clip(density, 0, None)
+def grouped_histograms(values, groupIds, lower, upper, bins):
+    nGroups = len(lower)
+    lower, upper = np.where(upper > lower, lower, lower - 0.5), np.where(upper > lower, upper, upper + 0.5)
+    width = (upper - lower) / bins
+    position = (values - lower[groupIds]) / np.where(width > 0, width, 1.0)[groupIds]
+    cells = groupIds * bins + np.clip(np.floor(position).astype(np.int64), 0, bins - 1)
+    counts = np.bincount(cells, minlength=nGroups * bins).reshape(nGroups, bins)
+    return group_support(lower, upper, bins + 1), counts
+def sorted_quantiles(groupedStats, q):
+    position = groupedStats.starts[:, None] + (groupedStats.counts[:, None] - 1) * np.asarray(q)[None, :]
+    lower = np.floor(position).astype(np.int64)
+    upper = np.minimum(lower + 1, groupedStats.starts[:, None] + groupedStats.counts[:, None] - 1)
+    fraction = position - lower
+    return groupedStats.sortedValues[lower] * (1 - fraction) + groupedStats.sortedValues[upper] * fraction
+class ViolinGeometry:
+    def __init__(self, groupedStats, width=0.8, gridsize=VIOLIN_GRIDSIZE, cut=2, bandwidth='scott'):
+        table = groupedStats.table
+        values = groupedStats.sortedValues
+        groupIds = np.repeat(np.arange(len(table)), groupedStats.counts)
+        self.labels = table.index
+        self.counts = groupedStats.counts
+        self.support, density = binned_kde(values, groupIds, groupedStats.counts, table['std'].to_numpy(),
+                                           table['min'].to_numpy(), table['max'].to_numpy(), gridsize, cut, bandwidth)
+        with np.errstate(invalid='ignore'):
+            self.halfWidths = density / np.nanmax(density) * width / 2 if np.isfinite(density).any() else density
+        self.quartiles = sorted_quantiles(groupedStats, [0.25, 0.5, 0.75])
+        iqr = self.quartiles[:, 2] - self.quartiles[:, 0]
+        lowFence = np.repeat(self.quartiles[:, 0] - 1.5 * iqr, groupedStats.counts)
+        highFence = np.repeat(self.quartiles[:, 2] + 1.5 * iqr, groupedStats.counts)
+        self.whiskers = np.column_stack([
+            np.minimum.reduceat(np.where(values >= lowFence, values, np.inf), groupedStats.starts),
+            np.maximum.reduceat(np.where(values <= highFence, values, -np.inf), groupedStats.starts)
+        ])
+        self.means = table['mean'].to_numpy()
@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+from src.utils.instrumentation import stage
+EXCEL_MAX_ROWS = 1048576
+ROW_CHUNK_SIZE = 65536
+class SheetStages:
+    def __init__(self, workbook, onSheetEnd=None):
+        self.workbook = workbook
+        self.onSheetEnd = onSheetEnd
+        self.addWorksheet = workbook.add_worksheet
+        self.current = None
+        workbook.add_worksheet = self.add_worksheet
+    def add_worksheet(self, name=None, *args, **kwargs):
+        self.finish()
+        self.current = stage(f'sheet[{name}]', 'excel_sheet')
+        self.current.__enter__()
+        return self.addWorksheet(name, *args, **kwargs)
+    def finish(self):
+        if self.current is not None:
+            if self.onSheetEnd is not None:
+                self.onSheetEnd()
+            self.current.__exit__(None, None, None)
+            self.current = None
+def numeric_column_formats(df, numberFormat, currencyFormat=None, currencyColumns=()):
+    formats = {}
+    for col in df.select_dtypes(include=[np.number]).columns:
+        formats[col] = currencyFormat if col in currencyColumns and currencyFormat is not None else numberFormat
+    return formats
+def frame_chunks(df, chunkSize=ROW_CHUNK_SIZE):
+    for start in range(0, len(df), chunkSize):
+        values = df.iloc[start:start + chunkSize].to_numpy(dtype=object)
+        values[pd.isna(values)] = None
+        yield values
+def add_frame_sheet(workbook, sheetName, columns, headerFormat=None, columnFormats=None, columnWidth=18, sheet=None):
+    columnFormats = columnFormats or {}
+    if sheet is None:
+        sheet = workbook.add_worksheet(sheetName)
+    for colIdx, col in enumerate(columns):
+        sheet.set_column(colIdx, colIdx, columnWidth, columnFormats.get(col))
+    sheet.write_row(0, 0, list(columns), headerFormat)
+    return sheet
+def write_frame_sheet(workbook, sheetName, df, headerFormat=None, columnFormats=None, columnWidth=18, chunkSize=ROW_CHUNK_SIZE, sheet=None):
+    sheets = [add_frame_sheet(workbook, sheetName, df.columns, headerFormat, columnFormats, columnWidth, sheet)]
+    rowIdx = 0
+    for values in frame_chunks(df, chunkSize):
+        for row in values:
+            if rowIdx == EXCEL_MAX_ROWS - 1:
+                sheets.append(add_frame_sheet(workbook, f"{sheetName} {len(sheets) + 1}", df.columns, headerFormat, columnFormats, columnWidth))
+                rowIdx = 0
+            rowIdx += 1
+            sheets[-1].write_row(rowIdx, 0, row)
+    return sheets
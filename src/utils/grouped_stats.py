@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+STATISTICS = ('count', 'sum', 'mean', 'std', 'min', 'max', 'median')
+def factorize_keys(keys):
+    if isinstance(keys.dtype, pd.CategoricalDtype):
+        return keys.cat.codes.to_numpy(), pd.Index(keys.cat.categories, name=keys.name)
+    codes, uniques = pd.factorize(keys, sort=True)
+    return codes, pd.Index(uniques, name=keys.name)
+class GroupedStatistics:
+    def __init__(self, keys, values):
+        codes, labels = factorize_keys(keys)
+        values = np.asarray(values, dtype=np.float64)
+        valid = (codes >= 0) & ~np.isnan(values)
+        codes, values = codes[valid], values[valid]
+        order = np.lexsort((values, codes))
+        self.sortedValues = values[order]
+        counts = np.bincount(codes, minlength=len(labels))
+        observed = counts > 0
+        self.labels = labels[observed]
+        self.counts = counts[observed]
+        self.starts = np.cumsum(self.counts) - self.counts
+        self.table = self.compute_table()
+    def compute_table(self):
+        if len(self.counts) == 0:
+            return pd.DataFrame(columns=list(STATISTICS), index=self.labels, dtype=float)
+        sums = np.add.reduceat(self.sortedValues, self.starts)
+        means = sums / self.counts
+        deviations = self.sortedValues - np.repeat(means, self.counts)
+        squares = np.add.reduceat(deviations * deviations, self.starts)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            stds = np.where(self.counts > 1, np.sqrt(squares / (self.counts - 1)), np.nan)
+        lower = self.sortedValues[self.starts + (self.counts - 1) // 2]
+        upper = self.sortedValues[self.starts + self.counts // 2]
+        return pd.DataFrame({
+            'count': self.counts,
+            'sum': sums,
+            'mean': means,
+            'std': stds,
+            'min': self.sortedValues[self.starts],
+            'max': self.sortedValues[self.starts + self.counts - 1],
+            'median': (lower + upper) / 2
+        }, index=self.labels)
+    def group_arrays(self):
+        return np.split(self.sortedValues, self.starts[1:])
+    def __getitem__(self, statistic):
+        return self.table[statistic]
@@ -0,0 +1,256 @@
+import hashlib
+import io
+import json
+import os
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from src.utils.aggregation import AggregationCache
+from src.utils.data_cache import cache_paths, schema_version
+from src.utils.ingestion import read_breach_csv
+from src.utils.quantile_sketch import DEFAULT_RELATIVE_ACCURACY, QuantileSketch
+from src.utils.schema import AFFECTED_USERS, BREACH_SCHEMA, FINANCIAL_LOSS, RESOLUTION_HOURS
+ALL_KEY = '__all__'
+CHECK_BYTES = 4096
+MEASURES = [FINANCIAL_LOSS, AFFECTED_USERS, RESOLUTION_HOURS]
+SINGLE_KEYS = [
+    'Target Industry Standardized',
+    'Attack Type',
+    'Attack Type Detailed',
+    'Attack Source',
+    'Country',
+    'Security Vulnerability Type',
+    'Defense Mechanism Used',
+    'Year',
+    'Resolution Time Category'
+]
+PAIR_KEYS = [
+    ('Target Industry Standardized', 'Attack Type'),
+    ('Target Industry Standardized', 'Security Vulnerability Type'),
+    ('Target Industry Standardized', 'Attack Source'),
+    ('Attack Type', 'Attack Source'),
+    ('Attack Type', 'Security Vulnerability Type'),
+    ('Attack Source', 'Security Vulnerability Type'),
+    ('Year', 'Attack Type'),
+    ('Year', 'Target Industry Standardized'),
+    ('Year', 'Security Vulnerability Type'),
+    ('Defense Mechanism Used', 'Attack Type')
+]
+TRACKED_KEYS = [()] + [(key,) for key in SINGLE_KEYS] + PAIR_KEYS
+SKETCH_KEYS = [()] + [(key,) for key in SINGLE_KEYS]
+STORE_AGGREGATIONS = ('size', 'count', 'sum', 'mean', 'std', 'min', 'max', 'median')
+def store_path(dataPath, cacheDir=None):
+    cachePath, _ = cache_paths(dataPath, cacheDir)
+    return cachePath.with_name(f'{Path(dataPath).stem}.aggregates.json')
+def key_columns(keys):
+    return list(keys) if keys else [ALL_KEY]
+def summarize_rows(df, keys):
+    frame = pd.DataFrame(index=df.index)
+    for key in keys:
+        frame[key] = df[key]
+    if not keys:
+        frame[ALL_KEY] = 'All'
+    spec = {'size': (key_columns(keys)[0], 'size')}
+    for measure in MEASURES:
+        values = df[measure].astype('float64')
+        frame[measure] = values
+        frame[f'sq:{measure}'] = values * values
+        spec[f'count:{measure}'] = (measure, 'count')
+        spec[f'sum:{measure}'] = (measure, 'sum')
+        spec[f'sumsq:{measure}'] = (f'sq:{measure}', 'sum')
+        spec[f'min:{measure}'] = (measure, 'min')
+        spec[f'max:{measure}'] = (measure, 'max')
+    table = frame.groupby(key_columns(keys), observed=True, sort=False).agg(**spec).reset_index()
+    for key in keys:
+        table[key] = table[key].astype(object) if isinstance(table[key].dtype, pd.CategoricalDtype) else table[key].astype('int64')
+    return table
+def merge_tables(old, new, keys):
+    if old is None or old.empty:
+        return new
+    combined = pd.concat([old, new], ignore_index=True)
+    spec = {
+        col: 'min' if col.startswith('min:') else 'max' if col.startswith('max:') else 'sum'
+        for col in combined.columns if col not in key_columns(keys)
+    }
+    return combined.groupby(key_columns(keys), sort=False).agg(spec).reset_index()
+def label_index(table, keys):
+    if not keys:
+        return pd.Index(table[ALL_KEY])
+    arrays = []
+    for key in keys:
+        dtype = BREACH_SCHEMA.get(key)
+        if isinstance(dtype, pd.CategoricalDtype):
+            arrays.append(pd.Categorical(table[key], dtype=dtype))
+        elif dtype == 'category':
+            arrays.append(pd.Categorical(table[key]))
+        else:
+            arrays.append(table[key].astype(dtype).to_numpy())
+    if len(keys) == 1:
+        return pd.Index(arrays[0], name=keys[0])
+    return pd.MultiIndex.from_arrays(arrays, names=list(keys))
+def block_digest(f, start, end):
+    f.seek(start)
+    return hashlib.sha256(f.read(end - start)).hexdigest()
+def boundary_digests(f, offset):
+    return block_digest(f, 0, min(offset, CHECK_BYTES)), block_digest(f, max(0, offset - CHECK_BYTES), offset)
+class AggregateStore:
+    def __init__(self, relativeAccuracy=DEFAULT_RELATIVE_ACCURACY):
+        self.schema = schema_version()
+        self.relativeAccuracy = relativeAccuracy
+        self.offset = 0
+        self.rows = 0
+        self.header = None
+        self.head = None
+        self.tail = None
+        self.tables = {}
+        self.sketches = {}
+    def fingerprint(self):
+        return hashlib.sha256(f'{self.schema}:{self.offset}:{self.tail}'.encode()).hexdigest()[:16]
+    def fold(self, df):
+        for keys in TRACKED_KEYS:
+            self.tables[keys] = merge_tables(self.tables.get(keys), summarize_rows(df, keys), keys)
+        for keys in SKETCH_KEYS:
+            sketches = self.sketches.setdefault(keys, {})
+            positions = {'All': np.arange(len(df))} if not keys else df.groupby(keys[0], observed=True).indices
+            for label, rows in positions.items():
+                labelSketches = sketches.setdefault(str(label), {})
+                for measure in MEASURES:
+                    sketch = labelSketches.setdefault(measure, QuantileSketch(self.relativeAccuracy))
+                    sketch.add(df[measure].to_numpy()[rows])
+        self.rows += len(df)
+    def tracks(self, keys, measure, agg):
+        keys = tuple(keys)
+        if agg not in STORE_AGGREGATIONS or (measure is not None and measure not in MEASURES):
+            return False
+        if measure is None:
+            return agg == 'size' and (keys in self.tables or keys[::-1] in self.tables)
+        if agg == 'median':
+            return keys in SKETCH_KEYS
+        return agg != 'size' and (keys in self.tables or keys[::-1] in self.tables)
+    def groupby(self, keys, measure=None, agg='size'):
+        keys = tuple(keys)
+        if keys not in self.tables:
+            return self.groupby(keys[::-1], measure, agg).reorder_levels(list(keys)).sort_index()
+        table = self.tables[keys]
+        if measure is None:
+            values = table['size']
+        elif agg == 'median':
+            labels = table[key_columns(keys)[0]]
+            values = [self.sketches[keys][str(label)][measure].quantile(0.5) for label in labels]
+        elif agg == 'mean':
+            values = table[f'sum:{measure}'] / table[f'count:{measure}']
+        elif agg == 'std':
+            count = table[f'count:{measure}']
+            total = table[f'sum:{measure}']
+            variance = ((table[f'sumsq:{measure}'] - total * total / count) / (count - 1)).clip(lower=0)
+            values = np.sqrt(variance.where(count > 1))
+        else:
+            values = table[f'{agg}:{measure}']
+        series = pd.Series(np.asarray(values), index=label_index(table, keys), name=measure)
+        return series.sort_index() if keys else series
+    def to_dict(self):
+        return {
+            'schema': self.schema,
+            'relativeAccuracy': self.relativeAccuracy,
+            'offset': self.offset,
+            'rows': self.rows,
+            'header': self.header,
+            'head': self.head,
+            'tail': self.tail,
+            'tables': {'|'.join(keys): table.to_dict(orient='split', index=False) for keys, table in self.tables.items()},
+            'sketches': {
+                '|'.join(keys): {
+                    label: {measure: sketch.to_dict() for measure, sketch in labelSketches.items()}
+                    for label, labelSketches in groups.items()
+                }
+                for keys, groups in self.sketches.items()
+            }
+        }
+    @classmethod
+    def from_dict(cls, data):
+        store = cls(data['relativeAccuracy'])
+        store.schema = data['schema']
+        store.offset = data['offset']
+        store.rows = data['rows']
+        store.header = data['header']
+        store.head = data['head']
+        store.tail = data['tail']
+        for name, table in data['tables'].items():
+            store.tables[tuple(name.split('|')) if name else ()] = pd.DataFrame(table['data'], columns=table['columns'])
+        for name, groups in data['sketches'].items():
+            store.sketches[tuple(name.split('|')) if name else ()] = {
+                label: {measure: QuantileSketch.from_dict(sketch) for measure, sketch in labelSketches.items()}
+                for label, labelSketches in groups.items()
+            }
+        return store
+    @classmethod
+    def load(cls, path):
+        try:
+            with open(path) as f:
+                return cls.from_dict(json.load(f))
+        except (OSError, ValueError, KeyError):
+            return None
+    def save(self, path):
+        path = Path(path)
+        path.parent.mkdir(exist_ok=True, parents=True)
+        tmpPath = path.with_suffix('.json.tmp')
+        with open(tmpPath, 'w') as f:
+            json.dump(self.to_dict(), f)
+        os.replace(tmpPath, path)
+def read_appended_bytes(dataPath, store):
+    with open(dataPath, 'rb') as f:
+        if store.offset:
+            if os.path.getsize(dataPath) < store.offset or boundary_digests(f, store.offset) != (store.head, store.tail):
+                return None
+        f.seek(store.offset)
+        data = f.read()
+    return data[:data.rfind(b'\n') + 1]
+def update_aggregate_store(dataPath, rebuild=False, cacheDir=None):
+    path = store_path(dataPath, cacheDir)
+    store = None if rebuild else AggregateStore.load(path)
+    if store is not None and store.schema != schema_version():
+        store = None
+    delta = read_appended_bytes(dataPath, store) if store is not None else None
+    if delta is None:
+        store = AggregateStore()
+        delta = read_appended_bytes(dataPath, store)
+        print(f"Rebuilding aggregate store from {dataPath}")
+    body = delta
+    if store.header is None:
+        headerEnd = delta.find(b'\n') + 1
+        store.header = delta[:headerEnd].decode('utf-8')
+        body = delta[headerEnd:]
+    previousRows = store.rows
+    if body:
+        store.fold(read_breach_csv(io.BytesIO(store.header.encode('utf-8') + body)))
+    store.offset += len(delta)
+    with open(dataPath, 'rb') as f:
+        store.head, store.tail = boundary_digests(f, store.offset)
+    store.save(path)
+    print(f"Aggregate store: folded {store.rows - previousRows} new rows ({store.rows} total, offset {store.offset})")
+    return store
+class StoreAggregates(AggregationCache):
+    def __init__(self, store, frameLoader=None):
+        super().__init__(None, store.fingerprint())
+        self.store = store
+        self.frameLoader = frameLoader
+    def frame(self):
+        if self.df is None and self.frameLoader is not None:
+            self.df = self.frameLoader()
+        if self.df is None:
+            raise ValueError("This aggregation is not tracked by the aggregate store and needs the full data frame")
+        return self.df
+    def compute_groupby(self, keys, measure, agg):
+        if self.store.tracks(keys, measure, agg):
+            return self.store.groupby(keys, measure, agg)
+        self.frame()
+        return super().compute_groupby(keys, measure, agg)
+    def compute_total(self, measure, agg):
+        if self.store.tracks((), measure, agg):
+            return self.store.groupby((), measure, agg).iloc[0]
+        return self.frame()[measure].agg(agg)
+    def stats(self, key, measure):
+        self.frame()
+        return super().stats(key, measure)
+    def raw(self, columns):
+        return self.frame()[list(columns)]
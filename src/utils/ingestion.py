@@ -0,0 +1,15 @@
+import pandas as pd
+from src.utils.schema import BREACH_SCHEMA, schema_for
+try:
+    import pyarrow
+    CSV_ENGINE = 'pyarrow'
+except ImportError:
+    CSV_ENGINE = 'c'
+CHUNK_ROWS = 100000
+def read_breach_csv(source, usecols=None):
+    dtypes = BREACH_SCHEMA if usecols is None else schema_for(usecols)
+    return pd.read_csv(source, dtype=dtypes, usecols=usecols, engine=CSV_ENGINE)
+def iter_breach_chunks(source, chunkSize=CHUNK_ROWS, usecols=None):
+    dtypes = BREACH_SCHEMA if usecols is None else schema_for(usecols)
+    with pd.read_csv(source, dtype=dtypes, usecols=usecols, engine='c', chunksize=chunkSize) as reader:
+        yield from reader
@@ -0,0 +1,131 @@
+import csv
+import json
+import os
+import resource
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+REPORT_COLUMNS = ['stage', 'name', 'category', 'depth', 'start_seconds', 'wall_seconds', 'cpu_seconds',
+                  'rss_bytes', 'rss_delta_bytes', 'peak_rss_bytes', 'rss_growth_bytes', 'allocated_bytes', 'peak_allocated_bytes', 'pid']
+def peak_rss_bytes():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+def current_rss_bytes():
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        return peak_rss_bytes()
+def format_bytes(value):
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if abs(value) < 1024 or unit == 'GB':
+            return f"{value:.1f}{unit}" if unit != 'B' else f"{value}{unit}"
+        value /= 1024
+class Instrumentation:
+    def __init__(self, traceAllocations=False):
+        self.traceAllocations = traceAllocations
+        self.origin = time.perf_counter()
+        self.records = []
+        self.frames = []
+        self.profiler = None
+    def tracing(self):
+        if self.traceAllocations and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        return tracemalloc.is_tracing()
+    @contextmanager
+    def stage(self, name, category='stage'):
+        tracing = self.tracing()
+        if tracing and self.frames:
+            self.frames[-1]['peak'] = max(self.frames[-1]['peak'], tracemalloc.get_traced_memory()[1])
+        if tracing:
+            tracemalloc.reset_peak()
+        frame = {
+            'name': name,
+            'allocated': tracemalloc.get_traced_memory()[0] if tracing else 0,
+            'peak': 0,
+            'rss': peak_rss_bytes(),
+            'currentRss': current_rss_bytes(),
+            'cpu': time.process_time(),
+            'wall': time.perf_counter()
+        }
+        session = self.profiler.start(name) if self.profiler is not None and not self.frames else None
+        self.frames.append(frame)
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - frame['wall']
+            cpu = time.process_time() - frame['cpu']
+            rss = peak_rss_bytes()
+            currentRss = current_rss_bytes()
+            current, peak = tracemalloc.get_traced_memory() if tracing else (0, 0)
+            peak = max(frame['peak'], peak)
+            self.frames.pop()
+            if self.frames:
+                self.frames[-1]['peak'] = max(self.frames[-1]['peak'], peak)
+            self.records.append({
+                'stage': '/'.join([parent['name'] for parent in self.frames] + [name]),
+                'name': name,
+                'category': category,
+                'depth': len(self.frames),
+                'start_seconds': frame['wall'] - self.origin,
+                'wall_seconds': wall,
+                'cpu_seconds': cpu,
+                'rss_bytes': currentRss,
+                'rss_delta_bytes': currentRss - frame['currentRss'],
+                'peak_rss_bytes': rss,
+                'rss_growth_bytes': rss - frame['rss'],
+                'allocated_bytes': current - frame['allocated'] if tracing else None,
+                'peak_allocated_bytes': peak - frame['allocated'] if tracing else None,
+                'pid': os.getpid()
+            })
+            if session is not None:
+                self.profiler.stop(session)
+    def summary(self):
+        rows = {}
+        for record in self.records:
+            row = rows.setdefault((record['category'], record['name']), {'calls': 0, 'wall': 0.0, 'cpu': 0.0, 'rss': 0, 'allocated': None})
+            row['calls'] += 1
+            row['wall'] += record['wall_seconds']
+            row['cpu'] += record['cpu_seconds']
+            row['rss'] = max(row['rss'], record['peak_rss_bytes'])
+            if record['peak_allocated_bytes'] is not None:
+                row['allocated'] = max(row['allocated'] or 0, record['peak_allocated_bytes'])
+        return sorted(rows.items(), key=lambda item: item[1]['wall'], reverse=True)
+    def print_summary(self, limit=25):
+        print("\n=== INSTRUMENTATION SUMMARY ===")
+        print(f"{'category':<14} {'stage':<48} {'calls':>6} {'wall':>10} {'cpu':>10} {'peak rss':>10} {'peak alloc':>11}")
+        for (category, name), row in self.summary()[:limit]:
+            allocated = format_bytes(row['allocated']) if row['allocated'] is not None else '-'
+            print(f"{category:<14} {name[:48]:<48} {row['calls']:>6} {row['wall']:>9.3f}s {row['cpu']:>9.3f}s "
+                  f"{format_bytes(row['rss']):>10} {allocated:>11}")
+    def print_memory_report(self):
+        print("\n=== MEMORY BY STAGE ===")
+        print(f"{'stage':<48} {'rss':>10} {'rss delta':>10} {'peak rss':>10} {'peak growth':>12} {'peak alloc':>11}")
+        for record in sorted(self.records, key=lambda record: record['start_seconds']):
+            if record['depth'] > 0:
+                continue
+            allocated = format_bytes(record['peak_allocated_bytes']) if record['peak_allocated_bytes'] is not None else '-'
+            print(f"{record['stage'][:48]:<48} {format_bytes(record['rss_bytes']):>10} {format_bytes(record['rss_delta_bytes']):>10} "
+                  f"{format_bytes(record['peak_rss_bytes']):>10} {format_bytes(record['rss_growth_bytes']):>12} {allocated:>11}")
+    def write_report(self, outputDir, name='timing_report'):
+        outputDir = Path(outputDir)
+        outputDir.mkdir(exist_ok=True, parents=True)
+        records = sorted(self.records, key=lambda record: record['start_seconds'])
+        with open(outputDir / f'{name}.json', 'w') as f:
+            json.dump({'pid': os.getpid(), 'argv': sys.argv, 'peak_rss_bytes': peak_rss_bytes(), 'records': records}, f, indent=2)
+        with open(outputDir / f'{name}.csv', 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=REPORT_COLUMNS)
+            writer.writeheader()
+            writer.writerows(records)
+        self.print_summary()
+        self.print_memory_report()
+        if self.profiler is not None:
+            self.profiler.print_report()
+        print(f"Timing report written to {outputDir / name}.json and .csv")
+RECORDER = Instrumentation(traceAllocations=os.environ.get('INSTRUMENT_ALLOCATIONS') == '1')
+def stage(name, category='stage'):
+    return RECORDER.stage(name, category)
+def write_timing_report(outputDir, name='timing_report'):
+    RECORDER.write_report(outputDir, name)
@@ -0,0 +1,42 @@
+import ctypes
+import gc
+import os
+import numpy as np
+import pandas as pd
+from src.utils.schema import AFFECTED_USERS, FINANCIAL_LOSS, RESOLUTION_HOURS
+MEASURE_COLUMNS = (FINANCIAL_LOSS, AFFECTED_USERS, RESOLUTION_HOURS)
+MAX_CATEGORY_RATIO = 0.5
+try:
+    MALLOC_TRIM = ctypes.CDLL('libc.so.6').malloc_trim
+except (OSError, AttributeError):
+    MALLOC_TRIM = None
+def low_memory_default():
+    return os.environ.get('LOW_MEMORY', '').lower() in ('1', 'true', 'yes')
+def downcast_numeric(df, exclude=MEASURE_COLUMNS):
+    columns = {}
+    for col in df.select_dtypes(include=[np.integer]).columns:
+        if col not in exclude:
+            columns[col] = pd.to_numeric(df[col], downcast='integer')
+    for col in df.select_dtypes(include=[np.floating]).columns:
+        if col not in exclude:
+            columns[col] = pd.to_numeric(df[col], downcast='float')
+    return df.assign(**columns) if columns else df
+def categorize_strings(df, maxRatio=MAX_CATEGORY_RATIO):
+    columns = {}
+    for col in df.select_dtypes(include=['object', 'string']).columns:
+        if df[col].nunique(dropna=True) <= maxRatio * len(df):
+            columns[col] = df[col].astype('category')
+    return df.assign(**columns) if columns else df
+def compact_frame(df):
+    before = df.memory_usage(deep=True).sum()
+    df = categorize_strings(downcast_numeric(df))
+    after = df.memory_usage(deep=True).sum()
+    print(f"Low-memory profile: data frame compacted from {before / 2**20:.1f}MB to {after / 2**20:.1f}MB")
+    return df
+def release_memory(*caches):
+    for cache in caches:
+        if cache is not None:
+            cache.clear()
+    gc.collect()
+    if MALLOC_TRIM is not None:
+        MALLOC_TRIM(0)
@@ -0,0 +1,162 @@
+import numpy as np
+import pandas as pd
+from src.utils.aggregation import AggregationCache
+from src.utils.dataframe_backend import DataFrameEngine
+from src.utils.grouped_stats import factorize_keys
+from src.utils.schema import AFFECTED_USERS, FINANCIAL_LOSS, RESOLUTION_HOURS
+CUBE_DIMENSIONS = [
+    'Year',
+    'Country',
+    'Attack Type',
+    'Attack Type Detailed',
+    'Target Industry Standardized',
+    'Attack Source',
+    'Security Vulnerability Type',
+    'Defense Mechanism Used',
+    'Organization Size',
+    'Resolution Time Category'
+]
+CUBE_MEASURES = [FINANCIAL_LOSS, AFFECTED_USERS, RESOLUTION_HOURS]
+CUBE_AGGREGATIONS = ('count', 'sum', 'mean', 'std', 'var', 'min', 'max')
+def group_starts(groupIds):
+    return np.concatenate([[0], np.flatnonzero(np.diff(groupIds)) + 1])
+class BreachCube(DataFrameEngine):
+    name = 'cube'
+    def __init__(self, labels, dtypes, codes, cells, measures):
+        super().__init__(None)
+        self.labels = labels
+        self.dtypes = dtypes
+        self.codes = codes
+        self.cells = cells
+        self.measures = measures
+        self._cuboids = {}
+    @classmethod
+    def build(cls, df, dimensions=None, measures=None):
+        dimensions = [dim for dim in (dimensions or CUBE_DIMENSIONS) if dim in df.columns]
+        measures = [measure for measure in (measures or CUBE_MEASURES) if measure in df.columns]
+        labels, dtypes, frame = {}, {}, pd.DataFrame(index=df.index)
+        for dim in dimensions:
+            frame[dim], labels[dim] = factorize_keys(df[dim])
+            dtypes[dim] = df[dim].dtype
+        for measure in measures:
+            frame[measure] = df[measure].astype('float64')
+            dtypes[measure] = df[measure].dtype
+        grouped = frame.groupby(dimensions, sort=True)
+        table = grouped.size().rename('size').to_frame()
+        for measure in measures:
+            stats = grouped[measure].agg(['count', 'sum', 'min', 'max'])
+            deviations = frame[measure] - grouped[measure].transform('mean')
+            stats['m2'] = (deviations * deviations).groupby([frame[dim] for dim in dimensions], sort=True).sum()
+            for stat in stats.columns:
+                table[f'{stat}:{measure}'] = stats[stat]
+        table = table.reset_index()
+        codes = {dim: table[dim].to_numpy() for dim in dimensions}
+        cells = {col: table[col].to_numpy(dtype=np.float64) for col in table.columns if col not in dimensions}
+        return cls(labels, dtypes, codes, cells, measures)
+    @property
+    def dimensions(self):
+        return list(self.codes)
+    def column_dtype(self, column):
+        return self.dtypes[column]
+    def tracks(self, keys, measure=None, agg='size'):
+        if any(key not in self.codes for key in keys):
+            return False
+        if measure is None:
+            return agg == 'size'
+        return measure in self.measures and agg in CUBE_AGGREGATIONS
+    def rollup(self, keys):
+        keys = tuple(keys)
+        if keys in self._cuboids:
+            return self._cuboids[keys]
+        if keys:
+            valid = np.logical_and.reduce([self.codes[key] >= 0 for key in keys])
+            flat = np.ravel_multi_index([self.codes[key][valid] for key in keys], [len(self.labels[key]) for key in keys])
+            uniques, inverse = np.unique(flat, return_inverse=True)
+            keyCodes = dict(zip(keys, np.unravel_index(uniques, [len(self.labels[key]) for key in keys])))
+        else:
+            valid = np.ones(len(self.cells['size']), dtype=bool)
+            uniques, inverse, keyCodes = np.zeros(1), np.zeros(valid.sum(), dtype=np.int64), {}
+        order = np.argsort(inverse, kind='stable')
+        starts = group_starts(inverse[order])
+        cuboid = {'codes': keyCodes, 'size': np.bincount(inverse, self.cells['size'][valid], len(uniques))}
+        for measure in self.measures:
+            count = self.cells[f'count:{measure}'][valid]
+            total = self.cells[f'sum:{measure}'][valid]
+            groupCount = np.bincount(inverse, count, len(uniques))
+            groupSum = np.bincount(inverse, total, len(uniques))
+            with np.errstate(divide='ignore', invalid='ignore'):
+                cellMeans = total / count
+                groupMeans = groupSum / groupCount
+            shifts = np.where(count > 0, count * (cellMeans - groupMeans[inverse]) ** 2, 0.0)
+            cuboid[f'count:{measure}'] = groupCount
+            cuboid[f'sum:{measure}'] = groupSum
+            cuboid[f'm2:{measure}'] = np.bincount(inverse, self.cells[f'm2:{measure}'][valid] + shifts, len(uniques))
+            cuboid[f'min:{measure}'] = np.fmin.reduceat(self.cells[f'min:{measure}'][valid][order], starts) if len(order) else groupSum
+            cuboid[f'max:{measure}'] = np.fmax.reduceat(self.cells[f'max:{measure}'][valid][order], starts) if len(order) else groupSum
+        self._cuboids[keys] = cuboid
+        return cuboid
+    def values(self, cuboid, measure, agg):
+        if measure is None:
+            return cuboid['size']
+        count = cuboid[f'count:{measure}']
+        with np.errstate(divide='ignore', invalid='ignore'):
+            if agg == 'mean':
+                return np.where(count > 0, cuboid[f'sum:{measure}'] / count, np.nan)
+            if agg in ('std', 'var'):
+                variance = np.where(count > 1, cuboid[f'm2:{measure}'] / (count - 1), np.nan)
+                return variance if agg == 'var' else np.sqrt(variance)
+        return cuboid[f'{agg}:{measure}']
+    def groupby_table(self, keys, measure, agg):
+        cuboid = self.rollup(keys)
+        table = pd.DataFrame({key: self.labels[key].take(cuboid['codes'][key]) for key in keys})
+        table['value'] = self.values(cuboid, measure, agg)
+        return table
+    def total(self, measure, agg):
+        return self.values(self.rollup(()), measure, agg).astype(self.result_dtype(measure, agg))[0]
+    def dice(self, filters):
+        mask = np.ones(len(self.cells['size']), dtype=bool)
+        for dim, value in filters.items():
+            if dim not in self.codes:
+                raise ValueError(f"'{dim}' is not a dimension of the cube")
+            values = list(value) if isinstance(value, (list, tuple, set)) else [value]
+            mask &= np.isin(self.codes[dim], self.labels[dim].get_indexer(values))
+        return BreachCube(self.labels, self.dtypes, {dim: codes[mask] for dim, codes in self.codes.items()},
+                          {col: values[mask] for col, values in self.cells.items()}, self.measures)
+    def slice(self, dimension, value):
+        return self.dice({dimension: value})
+class CubeAggregates(AggregationCache):
+    def __init__(self, df, cube=None, fingerprint=None, frameLoader=None):
+        super().__init__(df, fingerprint)
+        self.cube = cube if cube is not None else BreachCube.build(df)
+        self.frameLoader = frameLoader
+    def frame(self):
+        if self.df is None and self.frameLoader is not None:
+            self.df = self.frameLoader()
+        if self.df is None:
+            raise ValueError("This aggregation is not covered by the cube and needs the full data frame")
+        return self.df
+    def compute_groupby(self, keys, measure, agg):
+        if self.cube.tracks(keys, measure, agg):
+            return self.engine_groupby(keys, measure, agg, self.cube)
+        self.frame()
+        return super().compute_groupby(keys, measure, agg)
+    def compute_total(self, measure, agg):
+        if self.cube.tracks((), measure, agg):
+            return self.cube.total(measure, agg)
+        return self.frame()[measure].agg(agg)
+    def stats(self, key, measure):
+        self.frame()
+        return super().stats(key, measure)
+    def raw(self, columns):
+        return self.frame()[list(columns)]
+    def dice(self, filters):
+        def frameLoader():
+            frame = self.frame()
+            mask = np.ones(len(frame), dtype=bool)
+            for dim, value in filters.items():
+                mask &= frame[dim].isin(list(value) if isinstance(value, (list, tuple, set)) else [value]).to_numpy()
+            return frame[mask]
+        fingerprint = f'{self.fingerprint}:{sorted(filters.items(), key=str)}'
+        return CubeAggregates(None, self.cube.dice(filters), fingerprint, frameLoader)
+    def slice(self, dimension, value):
+        return self.dice({dimension: value})
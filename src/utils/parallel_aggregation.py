@@ -0,0 +1,110 @@
+import os
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from src.utils.aggregation import AggregationCache
+from src.utils.dataframe_backend import DATAFRAME_ENGINES, PandasEngine, create_engine, dataframe_engine_name
+from src.utils.grouped_stats import STATISTICS
+from src.utils.olap_cube import CubeAggregates
+AGGREGATION_BACKENDS = ('pandas', 'parallel', 'cube')
+AGGREGATION_ENGINES = DATAFRAME_ENGINES + ('cube',)
+PARALLEL_MIN_ROWS = 200000
+MERGEABLE_AGGREGATIONS = ('size', 'count', 'sum', 'mean', 'std', 'var', 'min', 'max')
+def partial_statistics(frame, keys, measure):
+    grouped = frame.groupby(list(keys), observed=True)
+    if measure is None:
+        return grouped.size().to_frame('size')
+    values = frame[measure].astype('float64')
+    groupedValues = values.groupby([frame[key] for key in keys], observed=True)
+    partial = groupedValues.agg(['count', 'sum', 'min', 'max'])
+    deviations = values - groupedValues.transform('mean')
+    partial['m2'] = (deviations * deviations).groupby([frame[key] for key in keys], observed=True).sum()
+    return partial
+def reduce_partials(partials, keys):
+    levels = list(range(len(keys)))
+    combined = pd.concat(partials)
+    grouped = combined.groupby(level=levels, observed=True)
+    if 'size' in combined.columns:
+        return grouped[['size']].sum()
+    merged = grouped.agg({'count': 'sum', 'sum': 'sum', 'min': 'min', 'max': 'max'})
+    means = (combined['sum'] / combined['count']).where(combined['count'] > 0)
+    groupMeans = (merged['sum'] / merged['count']).reindex(combined.index)
+    shifts = (combined['count'] * (means - groupMeans.to_numpy()) ** 2).fillna(0)
+    merged['m2'] = (combined['m2'] + shifts).groupby(level=levels, observed=True).sum()
+    return merged
+def finalize(merged, measure, agg):
+    if agg == 'size':
+        return merged['size'].rename(None)
+    count = merged['count']
+    if agg in ('count', 'sum', 'min', 'max'):
+        values = merged[agg]
+    elif agg == 'mean':
+        values = merged['sum'] / count
+    else:
+        variance = (merged['m2'] / (count - 1)).where(count > 1)
+        values = variance if agg == 'var' else np.sqrt(variance)
+    return values.rename(measure)
+def default_aggregation_workers():
+    configured = os.environ.get('AGGREGATION_WORKERS')
+    if configured:
+        return max(1, int(configured))
+    return os.cpu_count() or 1
+class ParallelAggregationCache(AggregationCache):
+    def __init__(self, df, fingerprint=None, maxWorkers=None, minRows=PARALLEL_MIN_ROWS, engine=None):
+        super().__init__(df, fingerprint, engine)
+        self.maxWorkers = default_aggregation_workers() if maxWorkers is None else maxWorkers
+        self.minRows = minRows
+        self._pool = None
+    def pool(self):
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.maxWorkers)
+            weakref.finalize(self, self._pool.shutdown)
+        return self._pool
+    def partitions(self):
+        bounds = np.linspace(0, len(self.df), self.maxWorkers + 1).astype(int)
+        return [(start, stop) for start, stop in zip(bounds[:-1], bounds[1:]) if stop > start]
+    def partial_table(self, keys, measure):
+        def compute():
+            columns = list(keys) + ([measure] if measure is not None else [])
+            futures = [self.pool().submit(partial_statistics, self.df.iloc[start:stop][columns], keys, measure)
+                       for start, stop in self.partitions()]
+            return reduce_partials([future.result() for future in futures], keys)
+        return self.memoize('partials', (keys, measure), compute)
+    def parallel_supports(self, keys, measure, agg):
+        if self.engine is not None or len(self.df) < self.minRows or self.maxWorkers <= 1 or agg not in MERGEABLE_AGGREGATIONS:
+            return False
+        if measure is None:
+            return agg == 'size'
+        return agg != 'size' and pd.api.types.is_numeric_dtype(self.df[measure])
+    def compute_groupby(self, keys, measure, agg):
+        if not self.parallel_supports(keys, measure, agg):
+            return super().compute_groupby(keys, measure, agg)
+        result = finalize(self.partial_table(keys, measure), measure, agg)
+        if len(keys) == 1 and measure is not None and agg in STATISTICS:
+            if isinstance(result.index, pd.CategoricalIndex):
+                result.index = result.index.categories.take(result.index.codes).rename(keys[0])
+            return result.astype('int64' if agg == 'count' else 'float64')
+        return result.astype(PandasEngine(self.df).result_dtype(measure, agg, result))
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+def aggregation_backend():
+    backend = os.environ.get('AGGREGATION_BACKEND', 'pandas').lower()
+    if backend not in AGGREGATION_BACKENDS:
+        raise ValueError(f"Unknown aggregation backend '{backend}', expected one of {', '.join(AGGREGATION_BACKENDS)}")
+    return backend
+def create_aggregation_cache(df, backend=None, engine=None):
+    if (engine or os.environ.get('DATAFRAME_ENGINE', '')).lower() == 'cube':
+        backend, engine = 'cube', 'pandas'
+    backend = aggregation_backend() if backend is None else backend
+    engine = dataframe_engine_name(engine)
+    engine = create_engine(df, engine) if engine != 'pandas' else None
+    if backend == 'parallel':
+        return ParallelAggregationCache(df, engine=engine)
+    if backend == 'cube':
+        if engine is not None:
+            raise ValueError("The cube aggregation backend answers from its own cuboids and does not support a dataframe engine")
+        return CubeAggregates(df)
+    return AggregationCache(df, engine=engine)
@@ -0,0 +1,141 @@
+import cProfile
+import marshal
+import os
+import pstats
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from src.utils.instrumentation import RECORDER
+PROFILE_MODES = ('cprofile', 'sampling')
+DEFAULT_SAMPLE_INTERVAL = 0.005
+MAX_STACK_DEPTH = 256
+COLLAPSED_UNITS = 1e6
+MIN_COLLAPSED_FRACTION = 1e-4
+def profile_mode_default():
+    mode = os.environ.get('PROFILE_MODE', '').lower()
+    if mode and mode not in PROFILE_MODES:
+        raise ValueError(f"Unknown PROFILE_MODE '{mode}', expected one of {', '.join(PROFILE_MODES)}")
+    return mode or None
+def sample_interval_default():
+    return float(os.environ.get('PROFILE_INTERVAL', DEFAULT_SAMPLE_INTERVAL))
+def stage_file_stem(index, name):
+    return f"{index:03d}-{re.sub(r'[^A-Za-z0-9.-]+', '_', name).strip('_')[:80]}"
+def frame_label(function):
+    fileName, line, name = function
+    return f"{name} ({Path(fileName).name}:{line})" if line else name
+def collapsed_from_stats(stats):
+    children = {}
+    for function, (_, _, _, _, callers) in stats.items():
+        for caller, (_, _, _, cumulative) in callers.items():
+            children.setdefault(caller, []).append((function, cumulative))
+    roots = [function for function, (_, _, _, _, callers) in stats.items() if not callers]
+    minSeconds = sum(stats[function][3] for function in roots) * MIN_COLLAPSED_FRACTION
+    stacks = Counter()
+    def walk(function, stack, scale):
+        stack = stack + [frame_label(function)]
+        selfTime = stats[function][2] * scale
+        if selfTime > 0:
+            stacks[';'.join(stack)] += selfTime
+        if len(stack) >= MAX_STACK_DEPTH:
+            return
+        for child, cumulative in children.get(function, []):
+            childTotal = stats[child][3]
+            if childTotal > 0 and cumulative * scale >= minSeconds and frame_label(child) not in stack:
+                walk(child, stack, scale * cumulative / childTotal)
+    for function in roots:
+        walk(function, [], 1.0)
+    return stacks
+def write_collapsed(path, stacks):
+    with open(path, 'w') as f:
+        for stack, seconds in sorted(stacks.items()):
+            weight = int(round(seconds * COLLAPSED_UNITS))
+            if weight > 0:
+                f.write(f"{stack} {weight}\n")
+class DeterministicProfile:
+    def __init__(self):
+        self.profiler = cProfile.Profile()
+    def start(self):
+        self.profiler.enable()
+    def stop(self):
+        self.profiler.disable()
+    def write(self, path):
+        self.profiler.dump_stats(path.with_suffix('.prof'))
+        write_collapsed(path.with_suffix('.collapsed'), collapsed_from_stats(pstats.Stats(self.profiler).stats))
+class SamplingProfile:
+    def __init__(self, interval=DEFAULT_SAMPLE_INTERVAL):
+        self.interval = interval
+        self.samples = Counter()
+        self.threadId = threading.get_ident()
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.threadId)
+            if self.stopped.is_set():
+                break
+            stack = []
+            while frame is not None and len(stack) < MAX_STACK_DEPTH:
+                code = frame.f_code
+                stack.append((code.co_filename, code.co_firstlineno, code.co_name))
+                frame = frame.f_back
+            if stack:
+                self.samples[tuple(reversed(stack))] += 1
+    def start(self):
+        self.thread.start()
+    def stop(self):
+        self.stopped.set()
+        self.thread.join()
+    def write(self, path):
+        stats = self.stats()
+        with open(path.with_suffix('.prof'), 'wb') as f:
+            marshal.dump(stats, f)
+        write_collapsed(path.with_suffix('.collapsed'), Counter({
+            ';'.join(frame_label(function) for function in stack): count * self.interval
+            for stack, count in self.samples.items()
+        }))
+    def stats(self):
+        selfTimes, totalTimes, callers = Counter(), Counter(), {}
+        for stack, count in self.samples.items():
+            seconds = count * self.interval
+            selfTimes[stack[-1]] += seconds
+            for function in set(stack):
+                totalTimes[function] += seconds
+            for caller, function in set(zip(stack, stack[1:])):
+                edges = callers.setdefault(function, {})
+                hits, _, edgeSelf, edgeTotal = edges.get(caller, (0, 0, 0.0, 0.0))
+                edgeSelf += seconds if function == stack[-1] else 0.0
+                edges[caller] = (hits + count, hits + count, edgeSelf, edgeTotal + seconds)
+        return {
+            function: (int(totalTimes[function] / self.interval), int(totalTimes[function] / self.interval),
+                       selfTimes[function], totalTimes[function], callers.get(function, {}))
+            for function in totalTimes
+        }
+class StageProfiler:
+    def __init__(self, outputDir, mode='cprofile', interval=DEFAULT_SAMPLE_INTERVAL):
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"Unknown profile mode '{mode}', expected one of {', '.join(PROFILE_MODES)}")
+        self.outputDir = Path(outputDir)
+        self.mode = mode
+        self.interval = interval
+        self.profiled = []
+    def start(self, name):
+        profile = DeterministicProfile() if self.mode == 'cprofile' else SamplingProfile(self.interval)
+        profile.start()
+        return name, profile
+    def stop(self, session):
+        name, profile = session
+        profile.stop()
+        self.outputDir.mkdir(exist_ok=True, parents=True)
+        path = self.outputDir / stage_file_stem(len(self.profiled) + 1, name)
+        profile.write(path)
+        self.profiled.append(path)
+    def print_report(self):
+        print(f"Profiled {len(self.profiled)} stage(s) with {self.mode}: .prof and .collapsed files in {self.outputDir}")
+def enable_profiling(outputDir, mode='cprofile', interval=None):
+    if mode is None:
+        return None
+    RECORDER.profiler = StageProfiler(outputDir, mode, sample_interval_default() if interval is None else interval)
+    return RECORDER.profiler
@@ -0,0 +1,54 @@
+import math
+import numpy as np
+DEFAULT_RELATIVE_ACCURACY = 0.01
+class QuantileSketch:
+    def __init__(self, relativeAccuracy=DEFAULT_RELATIVE_ACCURACY, bins=None, zeroCount=0):
+        self.relativeAccuracy = relativeAccuracy
+        self.gamma = (1 + relativeAccuracy) / (1 - relativeAccuracy)
+        self.logGamma = math.log(self.gamma)
+        self.bins = dict(bins or {})
+        self.zeroCount = zeroCount
+    @property
+    def count(self):
+        return self.zeroCount + sum(self.bins.values())
+    def add(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        positive = values[values > 0]
+        self.zeroCount += len(values) - len(positive)
+        if len(positive) == 0:
+            return self
+        indexes, counts = np.unique(np.ceil(np.log(positive) / self.logGamma).astype(np.int64), return_counts=True)
+        for index, count in zip(indexes.tolist(), counts.tolist()):
+            self.bins[index] = self.bins.get(index, 0) + count
+        return self
+    def merge(self, other):
+        if other.relativeAccuracy != self.relativeAccuracy:
+            raise ValueError("Cannot merge sketches with different relative accuracy")
+        for index, count in other.bins.items():
+            self.bins[index] = self.bins.get(index, 0) + count
+        self.zeroCount += other.zeroCount
+        return self
+    def value_at_rank(self, rank):
+        cumulative = self.zeroCount
+        if rank < cumulative:
+            return 0.0
+        for index in sorted(self.bins):
+            cumulative += self.bins[index]
+            if cumulative > rank:
+                return 2 * self.gamma ** index / (self.gamma + 1)
+        return 2 * self.gamma ** max(self.bins) / (self.gamma + 1)
+    def quantile(self, q):
+        total = self.count
+        if total == 0:
+            return np.nan
+        rank = q * (total - 1)
+        lower = self.value_at_rank(math.floor(rank))
+        upper = self.value_at_rank(math.ceil(rank))
+        return lower + (upper - lower) * (rank - math.floor(rank))
+    def to_dict(self):
+        return {'relativeAccuracy': self.relativeAccuracy, 'zeroCount': self.zeroCount,
+                'bins': [[index, count] for index, count in sorted(self.bins.items())]}
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data['relativeAccuracy'], {index: count for index, count in data['bins']}, data['zeroCount'])
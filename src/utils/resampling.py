@@ -0,0 +1,92 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+DEFAULT_RESAMPLES = 10000
+DEFAULT_CONFIDENCE = 0.95
+CHUNK_ELEMENTS = 1 << 22
+MAX_GROUP_DRAWS = 2000
+_groups = None
+def _init_worker(*groups):
+    global _groups
+    _groups = groups
+def resampling_options(resamples=None, maxGroupDraws=None):
+    maxGroupDraws = int(os.environ.get('RESAMPLE_MAX_GROUP_DRAWS', MAX_GROUP_DRAWS)) if maxGroupDraws is None else maxGroupDraws
+    return {
+        'resamples': int(os.environ.get('RESAMPLE_COUNT', 0)) if resamples is None else resamples,
+        'seed': int(os.environ.get('RESAMPLE_SEED', 0)),
+        'maxWorkers': max(1, int(os.environ.get('RESAMPLE_WORKERS', 1))),
+        'maxGroupDraws': maxGroupDraws if maxGroupDraws > 0 else None
+    }
+def chunk_sizes(resamples, elements):
+    chunkSize = max(1, CHUNK_ELEMENTS // max(elements, 1))
+    return [min(chunkSize, resamples - start) for start in range(0, resamples, chunkSize)]
+def group_sums(values, starts):
+    return np.add.reduceat(values, starts, axis=1) if values.shape[1] else np.zeros((len(values), len(starts)))
+def group_draws(counts, maxGroupDraws=None):
+    return counts if maxGroupDraws is None else np.minimum(counts, maxGroupDraws)
+def subsample_note(draws, counts):
+    draws, counts = np.asarray(draws), np.asarray(counts)
+    capped = draws < counts
+    if not capped.any():
+        return None
+    return (f"Approximate: {capped.sum()} of {len(counts)} groups resampled with at most {draws[capped].max():,} draws each "
+            f"(m-out-of-n bootstrap rescaled to the full group size)")
+def bootstrap_chunk(seed, size, groups=None):
+    values, starts, counts, draws = groups if groups is not None else _groups
+    rng = np.random.default_rng(seed)
+    offsets = np.repeat(starts, draws)
+    spans = np.repeat(counts, draws)
+    indexes = offsets + (rng.random((size, draws.sum())) * spans).astype(np.int64)
+    return group_sums(values[indexes], np.cumsum(draws) - draws) / draws.reshape((-1,) + (1,) * (values.ndim - 1))
+def permutation_chunk(seed, size, groups=None):
+    values, starts, counts = groups if groups is not None else _groups
+    rng = np.random.default_rng(seed)
+    indexes = rng.permuted(np.broadcast_to(np.arange(len(values)), (size, len(values))), axis=1)
+    sums = group_sums(values[indexes], starts)
+    return (sums * sums / counts).sum(axis=1)
+def run_chunks(task, groups, resamples, seed, maxWorkers, elements=None):
+    if resamples < 1:
+        raise ValueError("Resampling needs at least one resample")
+    sizes = chunk_sizes(resamples, groups[0].size if elements is None else elements)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    if maxWorkers <= 1 or len(sizes) == 1:
+        return np.concatenate([task(childSeed, size, groups) for childSeed, size in zip(seeds, sizes)])
+    with ProcessPoolExecutor(max_workers=maxWorkers, initializer=_init_worker, initargs=groups) as pool:
+        return np.concatenate(list(pool.map(task, seeds, sizes)))
+def bootstrap_mean_samples(values, starts, counts, resamples=DEFAULT_RESAMPLES, seed=0, maxWorkers=1, maxGroupDraws=None):
+    draws = group_draws(counts, maxGroupDraws)
+    samples = run_chunks(bootstrap_chunk, (values, starts, counts, draws), resamples, seed, maxWorkers, draws.sum() * (values.size // max(len(values), 1)))
+    if (draws == counts).all():
+        return samples
+    shape = (-1,) + (1,) * (values.ndim - 1)
+    means = np.add.reduceat(values, starts, axis=0) / counts.reshape(shape)
+    return means + (samples - means) * np.sqrt(draws / counts).reshape(shape)
+def bootstrap_group_means(groupedStats, resamples=DEFAULT_RESAMPLES, confidence=DEFAULT_CONFIDENCE, seed=0, maxWorkers=1, maxGroupDraws=None):
+    counts = groupedStats.counts
+    means = bootstrap_mean_samples(groupedStats.sortedValues, groupedStats.starts, counts, resamples, seed, maxWorkers, maxGroupDraws)
+    alpha = (1 - confidence) / 2
+    lower, upper = np.quantile(means, [alpha, 1 - alpha], axis=0)
+    return pd.DataFrame({'mean': groupedStats['mean'].to_numpy(), 'ci_lower': lower, 'ci_upper': upper,
+                         'count': counts, 'draws': group_draws(counts, maxGroupDraws)}, index=groupedStats.labels)
+def f_statistic(betweenTerm, total, squares, rows, groups):
+    grandTerm = total * total / rows
+    between = betweenTerm - grandTerm
+    within = squares - betweenTerm
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return (between / (groups - 1)) / (within / (rows - groups))
+def anova_terms(groupArrays):
+    counts = np.array([len(values) for values in groupArrays])
+    values = np.concatenate(groupArrays)
+    starts = np.cumsum(counts) - counts
+    return values, starts, counts, (np.add.reduceat(values, starts) ** 2 / counts).sum()
+def permutation_anova(groupArrays, resamples=DEFAULT_RESAMPLES, seed=0, maxWorkers=1, maxGroupDraws=None):
+    groupArrays = [np.asarray(values, dtype=np.float64) for values in groupArrays]
+    if maxGroupDraws is not None:
+        rng = np.random.default_rng(seed)
+        groupArrays = [rng.choice(group, maxGroupDraws, replace=False) if len(group) > maxGroupDraws else group for group in groupArrays]
+    values, starts, counts, observedTerm = anova_terms(groupArrays)
+    fValue = f_statistic(observedTerm, values.sum(), (values * values).sum(), len(values), len(counts))
+    permutedTerms = run_chunks(permutation_chunk, (values, starts, counts), resamples, seed, maxWorkers)
+    exceed = np.count_nonzero(permutedTerms >= observedTerm * (1 - 1e-12))
+    return fValue, (exceed + 1) / (resamples + 1), len(values)
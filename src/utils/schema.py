@@ -0,0 +1,58 @@
+import pandas as pd
+FINANCIAL_LOSS = 'Financial Loss (in Million $)'
+AFFECTED_USERS = 'Number of Affected Users'
+RESOLUTION_HOURS = 'Incident Resolution Time (in Hours)'
+RESOLUTION_TIME_CATEGORIES = [
+    'Less than 24 hours',
+    '1-3 days',
+    '4-7 days',
+    '1-2 weeks',
+    '2-4 weeks',
+    '1-3 months',
+    'More than 3 months'
+]
+DETECTION_TIME_CATEGORIES = [
+    'Less than 24 hours',
+    '1-7 days',
+    '1-4 weeks',
+    '1-3 months',
+    '3-6 months',
+    'More than 6 months'
+]
+BREACH_SCHEMA = {
+    'Country': 'category',
+    'Year': 'int32',
+    'Attack Type': 'category',
+    'Target Industry': 'category',
+    FINANCIAL_LOSS: 'float32',
+    AFFECTED_USERS: 'int32',
+    'Attack Source': 'category',
+    'Security Vulnerability Type': 'category',
+    'Defense Mechanism Used': 'category',
+    RESOLUTION_HOURS: 'int32',
+    'Target Industry Standardized': 'category',
+    'Attack Type Detailed': 'category',
+    'Financial Impact Category': 'category',
+    'Affected Users Category': 'category',
+    'Resolution Time Category': pd.CategoricalDtype(RESOLUTION_TIME_CATEGORIES, ordered=True),
+    'Organization Size': 'category',
+    'Detection Time Category': pd.CategoricalDtype(DETECTION_TIME_CATEGORIES, ordered=True),
+    'Detection Method': 'category',
+    'Security Posture': 'category',
+    'Cloud Adoption Level': 'category'
+}
+BREACH_COLUMNS = list(BREACH_SCHEMA)
+NUMERIC_COLUMNS = [col for col, dtype in BREACH_SCHEMA.items() if not isinstance(dtype, pd.CategoricalDtype) and dtype != 'category']
+CATEGORICAL_COLUMNS = [col for col in BREACH_COLUMNS if col not in NUMERIC_COLUMNS]
+def schema_for(columns):
+    return {col: BREACH_SCHEMA[col] for col in columns if col in BREACH_SCHEMA}
+def requires_columns(*columns):
+    def decorator(function):
+        function.requiredColumns = list(columns)
+        return function
+    return decorator
+def required_columns(*functions):
+    columns = set()
+    for function in functions:
+        columns.update(getattr(function, 'requiredColumns', BREACH_COLUMNS))
+    return [col for col in BREACH_COLUMNS if col in columns]
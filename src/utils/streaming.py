@@ -0,0 +1,134 @@
+import os
+import numpy as np
+import pandas as pd
+from src.utils.incremental import AggregateStore, StoreAggregates, boundary_digests
+from src.utils.ingestion import CHUNK_ROWS, iter_breach_chunks
+from src.utils.schema import NUMERIC_COLUMNS, schema_for
+DEFAULT_SAMPLE_ROWS = 10000
+SAMPLING_STRATEGIES = ('uniform', 'stratified')
+SAMPLE_KEY = '__sample_key__'
+SAMPLE_POSITION = '__sample_position__'
+class SamplingPolicy:
+    def __init__(self, maxRows=DEFAULT_SAMPLE_ROWS, strategy='uniform', stratifyBy=None, seed=0):
+        if strategy not in SAMPLING_STRATEGIES:
+            raise ValueError(f"Unknown sampling strategy '{strategy}', expected one of {', '.join(SAMPLING_STRATEGIES)}")
+        if strategy == 'stratified' and stratifyBy is None:
+            raise ValueError("Stratified sampling needs a stratifyBy column")
+        self.maxRows = maxRows
+        self.strategy = strategy
+        self.stratifyBy = stratifyBy
+        self.seed = seed
+    @classmethod
+    def from_env(cls):
+        return cls(
+            maxRows=int(os.environ.get('RAW_SAMPLE_ROWS', DEFAULT_SAMPLE_ROWS)),
+            strategy=os.environ.get('RAW_SAMPLE_STRATEGY', 'uniform'),
+            stratifyBy=os.environ.get('RAW_SAMPLE_STRATIFY') or None,
+            seed=int(os.environ.get('RAW_SAMPLE_SEED', 0))
+        )
+    def describe(self):
+        if self.strategy == 'stratified':
+            return f"stratified by {self.stratifyBy}, up to {self.maxRows} rows"
+        return f"uniform, up to {self.maxRows} rows"
+class RowSampler:
+    def __init__(self, policy):
+        self.policy = policy
+        self.rng = np.random.default_rng(policy.seed)
+        self.rows = 0
+        self.sample = None
+        self.strata = None
+    def keep_smallest(self, frame):
+        if self.policy.strategy == 'uniform':
+            return frame.nsmallest(self.policy.maxRows, SAMPLE_KEY)
+        ranks = frame.groupby(self.policy.stratifyBy, observed=True)[SAMPLE_KEY].rank(method='first')
+        return frame[ranks <= self.policy.maxRows]
+    def add(self, chunk):
+        frame = chunk.reset_index(drop=True)
+        frame[SAMPLE_KEY] = self.rng.random(len(frame))
+        frame[SAMPLE_POSITION] = np.arange(self.rows, self.rows + len(frame))
+        self.rows += len(frame)
+        if self.policy.strategy == 'stratified':
+            counts = chunk[self.policy.stratifyBy].astype(object).value_counts()
+            self.strata = counts if self.strata is None else self.strata.add(counts, fill_value=0)
+        combined = frame if self.sample is None else pd.concat([self.sample, frame], ignore_index=True)
+        self.sample = self.keep_smallest(combined)
+    def result(self):
+        if self.sample is None:
+            return None
+        sample = self.sample
+        if self.policy.strategy == 'stratified':
+            quotas = (self.strata / self.rows * self.policy.maxRows).round().clip(lower=1)
+            ranks = sample.groupby(self.policy.stratifyBy, observed=True)[SAMPLE_KEY].rank(method='first')
+            sample = sample[ranks <= sample[self.policy.stratifyBy].astype(object).map(quotas).to_numpy()]
+        sample = sample.sort_values(SAMPLE_POSITION).drop(columns=[SAMPLE_KEY, SAMPLE_POSITION]).reset_index(drop=True)
+        return sample.astype(schema_for(sample.columns))
+class CoMoments:
+    def __init__(self, columns=NUMERIC_COLUMNS):
+        self.columns = list(columns)
+        size = len(self.columns)
+        self.counts = np.zeros((size, size))
+        self.means = np.zeros((size, size))
+        self.squares = np.zeros((size, size))
+        self.products = np.zeros((size, size))
+    def fold(self, chunk):
+        values = chunk[self.columns].to_numpy(dtype=np.float64)
+        valid = ~np.isnan(values)
+        for i in range(len(self.columns)):
+            for j in range(i, len(self.columns)):
+                both = valid[:, i] & valid[:, j]
+                count = np.count_nonzero(both)
+                if count == 0:
+                    continue
+                x, y = values[both, i], values[both, j]
+                dx, dy = x - x.mean(), y - y.mean()
+                self.merge((i, j), count, (x.mean(), y.mean()), ((dx * dx).sum(), (dy * dy).sum()), (dx * dy).sum())
+    def merge(self, pair, count, means, squares, product):
+        i, j = pair
+        total = self.counts[i, j] + count
+        weight = self.counts[i, j] * count / total
+        deltas = [means[0] - self.means[i, j], means[1] - self.means[j, i]]
+        for (a, b), delta, square in zip([(i, j), (j, i)][:2 if i != j else 1], deltas, squares):
+            self.means[a, b] += delta * count / total
+            self.squares[a, b] += square + delta * delta * weight
+        self.products[i, j] = self.products[j, i] = self.products[i, j] + product + deltas[0] * deltas[1] * weight
+        self.counts[i, j] = self.counts[j, i] = total
+    def corr(self, columns=None):
+        columns = self.columns if columns is None else list(columns)
+        positions = [self.columns.index(col) for col in columns]
+        index = np.ix_(positions, positions)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            corr = self.products[index] / np.sqrt(self.squares[index] * self.squares[index].T)
+        corr = np.where((self.counts[index] > 1) & np.isfinite(corr), np.clip(corr, -1, 1), np.nan)
+        return pd.DataFrame(corr, index=columns, columns=columns)
+class StreamingAggregates(StoreAggregates):
+    def __init__(self, store, sample, policy, moments=None):
+        super().__init__(store)
+        self.sample = sample
+        self.policy = policy
+        self.moments = moments
+    def raw(self, columns):
+        return self.sample[list(columns)]
+    def corr(self, columns):
+        columns = tuple(columns)
+        if self.moments is None or not set(columns) <= set(self.moments.columns):
+            return super().corr(columns)
+        return self.memoize('corr', (columns,), lambda: self.moments.corr(columns))
+    def sample_caption(self):
+        if self.sample is None or len(self.sample) >= self.store.rows:
+            return None
+        return f"Sampled: {len(self.sample):,} of {self.store.rows:,} rows ({self.policy.describe()})"
+def stream_breach_aggregates(dataPath, chunkSize=CHUNK_ROWS, policy=None):
+    policy = policy if policy is not None else SamplingPolicy.from_env()
+    store = AggregateStore()
+    sampler = RowSampler(policy)
+    moments = CoMoments()
+    for chunk in iter_breach_chunks(dataPath, chunkSize):
+        store.fold(chunk)
+        sampler.add(chunk)
+        moments.fold(chunk)
+    store.offset = os.path.getsize(dataPath)
+    with open(dataPath, 'rb') as f:
+        store.head, store.tail = boundary_digests(f, store.offset)
+    sample = sampler.result()
+    print(f"Streamed {store.rows} rows in chunks of {chunkSize}; raw-point sample keeps {len(sample) if sample is not None else 0} rows ({policy.describe()})")
+    return StreamingAggregates(store, sample, policy, moments)
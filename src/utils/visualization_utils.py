@@ -1,12 +1,18 @@
 #!/usr/bin/env python3
 import os
+import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
+from colorsys import rgb_to_hls
 from pathlib import Path
-def load_data(filename='../../data/cybersecurity_breach_data.csv'):
+from src.utils.data_cache import load_breach_data
+from src.utils.density import ViolinGeometry
+from src.utils.grouped_stats import GroupedStatistics, factorize_keys
+from src.visualization.chart_jobs import save_chart
+def load_data(filename='../../data/cybersecurity_breach_data.csv', rebuildCache=False):
     try:
-        df = pd.read_csv(filename)
+        df = load_breach_data(filename, rebuildCache=rebuildCache)
         print(f"Loaded data with {len(df)} records")
         return df
     except Exception as e:
@@ -23,4 +29,44 @@ def setup_visualization_style():
     plt.rcParams['font.family'] = 'sans-serif'
     plt.rcParams['font.sans-serif'] = 'Arial'
     plt.rcParams['axes.titlesize'] = 14
-    plt.rcParams['axes.labelsize'] = 12
\ No newline at end of file
+    plt.rcParams['axes.labelsize'] = 12
+def render_labeled_bar(series, outputPath, title='', xlabel='', ylabel='', rotateLabels=True, labelOffset=1,
+                       labelFormat='{:.2f}', figsize=(12, 8), dpi=300, palette='viridis'):
+    plt.figure(figsize=figsize)
+    ax = sns.barplot(x=series.index.astype(str), y=series.values, palette=palette)
+    plt.title(title, fontsize=16, pad=20)
+    plt.xlabel(xlabel, fontsize=14)
+    plt.ylabel(ylabel, fontsize=14)
+    if rotateLabels:
+        plt.xticks(rotation=45, ha='right')
+    plt.tight_layout()
+    for i, v in enumerate(series.values):
+        ax.text(i, v + labelOffset, labelFormat.format(v), ha='center', fontsize=10)
+    save_chart(outputPath, dpi)
+def draw_violins(data, x, y, palette='muted', width=0.8, saturation=0.75, bandwidth='scott', ax=None):
+    ax = ax if ax is not None else plt.gca()
+    _, categories = factorize_keys(data[x])
+    groupedStats = GroupedStatistics(data[x], data[y])
+    geometry = ViolinGeometry(groupedStats, width=width, bandwidth=bandwidth)
+    colors = [sns.desaturate(color, saturation) for color in sns.color_palette(palette, len(categories))]
+    lum = min(rgb_to_hls(*color)[1] for color in colors) * .6
+    lineColor = (lum, lum, lum)
+    lineWidth = 1.25 * plt.rcParams['patch.linewidth']
+    boxWidth = lineWidth * 4.5
+    positions = categories.get_indexer(geometry.labels)
+    for idx, pos in enumerate(positions):
+        if np.isnan(geometry.halfWidths[idx]).all():
+            ax.plot([pos - width / 2, pos + width / 2], [geometry.means[idx]] * 2, color=lineColor, linewidth=lineWidth)
+            continue
+        ax.fill_betweenx(geometry.support[idx], pos - geometry.halfWidths[idx], pos + geometry.halfWidths[idx],
+                         facecolor=colors[pos], edgecolor=lineColor, linewidth=lineWidth)
+        ax.plot([pos, pos], geometry.whiskers[idx], color=lineColor, linewidth=boxWidth / 3)
+        ax.plot([pos, pos], geometry.quartiles[idx, [0, 2]], color=lineColor, linewidth=boxWidth)
+        ax.plot([pos], [geometry.quartiles[idx, 1]], marker='_', markersize=boxWidth / 1.2, markeredgewidth=boxWidth / 5,
+                markeredgecolor='w', markerfacecolor='w', color=lineColor)
+    ax.set_xticks(range(len(categories)), [str(label) for label in categories])
+    ax.set_xlim(-0.5, len(categories) - 0.5)
+    ax.xaxis.grid(False)
+    ax.set_xlabel(x)
+    ax.set_ylabel(y)
+    return ax
\ No newline at end of file
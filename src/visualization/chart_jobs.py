@@ -0,0 +1,136 @@
+import hashlib
+import inspect
+import json
+import os
+import pickle
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from pathlib import Path
+import matplotlib
+import matplotlib.pyplot as plt
+import pandas as pd
+import seaborn as sns
+from src.utils.instrumentation import RECORDER, stage
+DEFAULT_RC = {'font.family': 'sans-serif'}
+CHART_RC = {'font.family': 'sans-serif', 'font.sans-serif': 'Arial'}
+MANIFEST_NAME = '.chart_manifest.json'
+_caption = None
+class ChartJob:
+    def __init__(self, fileName, render, data, rcParams=None, caption=None, **params):
+        self.fileName = fileName
+        self.render = render
+        self.data = data
+        self.rcParams = dict(DEFAULT_RC if rcParams is None else rcParams)
+        self.caption = caption
+        self.params = params
+def update_code_digest(digest, code):
+    digest.update(code.co_code)
+    digest.update(repr(code.co_names).encode())
+    for const in code.co_consts:
+        if inspect.iscode(const):
+            update_code_digest(digest, const)
+        else:
+            digest.update(repr(const).encode())
+def update_data_digest(digest, data):
+    if isinstance(data, (pd.Series, pd.DataFrame)):
+        digest.update(repr((type(data).__name__, data.shape, list(data.index.names))).encode())
+        if isinstance(data, pd.DataFrame):
+            digest.update(repr([(str(col), str(dtype)) for col, dtype in data.dtypes.items()]).encode())
+        else:
+            digest.update(repr((data.name, str(data.dtype))).encode())
+        digest.update(pd.util.hash_pandas_object(data, index=True).to_numpy().tobytes())
+    else:
+        digest.update(pickle.dumps(data))
+def chart_job_key(job):
+    digest = hashlib.sha256()
+    render = inspect.unwrap(job.render)
+    digest.update(f'{render.__module__}.{render.__qualname__}'.encode())
+    update_code_digest(digest, render.__code__)
+    defaults = {name: param.default for name, param in inspect.signature(render).parameters.items()
+                if param.default is not inspect.Parameter.empty}
+    digest.update(repr(sorted({**defaults, **job.params}.items())).encode())
+    digest.update(repr(sorted(job.rcParams.items())).encode())
+    if job.caption is not None:
+        digest.update(f'caption:{job.caption}'.encode())
+    digest.update(f'{matplotlib.__version__}:{sns.__version__}'.encode())
+    update_data_digest(digest, job.data)
+    return digest.hexdigest()
+def read_manifest(outputDir):
+    try:
+        with open(Path(outputDir) / MANIFEST_NAME) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+def write_manifest(outputDir, manifest):
+    manifestPath = Path(outputDir) / MANIFEST_NAME
+    tmpPath = manifestPath.with_suffix('.json.tmp')
+    with open(tmpPath, 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmpPath, manifestPath)
+def force_render_default():
+    return os.environ.get('CHART_FORCE_RENDER', '').lower() in ('1', 'true', 'yes')
+def save_chart(outputPath, dpi=300):
+    if _caption is not None:
+        plt.gcf().text(0.5, 0, _caption, ha='center', va='top', fontsize=10, style='italic')
+    with stage(f'savefig[{Path(outputPath).name}]', 'savefig'):
+        plt.savefig(outputPath, dpi=dpi, bbox_inches='tight')
+    plt.close('all')
+def default_worker_count():
+    configured = os.environ.get('CHART_WORKERS')
+    if configured:
+        return max(1, int(configured))
+    return os.cpu_count() or 1
+def _init_worker():
+    matplotlib.use('Agg')
+def run_chart_job(job, outputDir):
+    global _caption
+    _caption = job.caption
+    try:
+        with stage(f'chart[{job.fileName}]', 'chart'), sns.axes_style('whitegrid'), plt.rc_context(job.rcParams):
+            job.render(job.data, Path(outputDir) / job.fileName, **job.params)
+        return job.fileName, None
+    except Exception:
+        plt.close('all')
+        return job.fileName, traceback.format_exc()
+    finally:
+        _caption = None
+def _run_pooled_chart_job(job, outputDir):
+    firstRecord = len(RECORDER.records)
+    return run_chart_job(job, outputDir), RECORDER.records[firstRecord:]
+def run_chart_jobs(jobs, outputDir, maxWorkers=None, force=None):
+    fileNames = [job.fileName for job in jobs]
+    duplicates = sorted({name for name in fileNames if fileNames.count(name) > 1})
+    if duplicates:
+        raise ValueError(f"Duplicate chart output names: {', '.join(duplicates)}")
+    Path(outputDir).mkdir(exist_ok=True, parents=True)
+    force = force_render_default() if force is None else force
+    manifest = read_manifest(outputDir)
+    jobKeys = {job.fileName: chart_job_key(job) for job in jobs}
+    pending = [
+        job for job in jobs
+        if force or manifest.get(job.fileName) != jobKeys[job.fileName] or not (Path(outputDir) / job.fileName).exists()
+    ]
+    maxWorkers = default_worker_count() if maxWorkers is None else maxWorkers
+    maxWorkers = min(maxWorkers, len(pending))
+    if maxWorkers <= 1:
+        results = [run_chart_job(job, outputDir) for job in pending]
+    else:
+        with ProcessPoolExecutor(max_workers=maxWorkers, initializer=_init_worker) as pool:
+            results = []
+            for result, records in pool.map(_run_pooled_chart_job, pending, repeat(outputDir)):
+                results.append(result)
+                RECORDER.records.extend(records)
+    failures = {fileName: error for fileName, error in results if error is not None}
+    manifest = read_manifest(outputDir)
+    for fileName, error in results:
+        if error is None:
+            manifest[fileName] = jobKeys[fileName]
+        else:
+            manifest.pop(fileName, None)
+    write_manifest(outputDir, manifest)
+    print(f"Rendered {len(pending) - len(failures)}/{len(pending)} changed charts into {outputDir} using {max(maxWorkers, 1)} worker(s), "
+          f"{len(jobs) - len(pending)} unchanged")
+    for fileName, error in failures.items():
+        print(f"Chart {fileName} failed:\n{error}")
+    return failures
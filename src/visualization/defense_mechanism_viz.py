@@ -3,22 +3,25 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 import numpy as np
 from pathlib import Path
-def create_defense_mechanism_visualizations():
+from src.analysis.defense_scoring import score_defenses
+from src.utils.dataset_context import DatasetContext
+from src.utils.resampling import resampling_options
+from src.utils.schema import required_columns, requires_columns
+@requires_columns('Defense Mechanism Used', 'Attack Type', 'Financial Loss (in Million $)', 'Incident Resolution Time (in Hours)')
+def create_defense_mechanism_visualizations(context=None):
     print("Generating improved defense mechanism visualizations...")
     outputDir = Path('output/enhanced_analysis')
     outputDir.mkdir(exist_ok=True, parents=True)
-    dataPath = Path('../Enhanced_Cybersecurity_Data.csv')
-    try:
-        df = pd.read_csv(dataPath)
-        print(f"Loaded data with {len(df)} records")
-    except Exception as e:
-        print(f"Error loading data: {e}")
+    if context is None:
+        context = DatasetContext(Path('../Enhanced_Cybersecurity_Data.csv'), columns=required_columns(create_defense_mechanism_visualizations))
+    aggregates = context.aggregates
+    if aggregates is None:
         return
     sns.set_style("whitegrid")
     plt.rcParams['font.family'] = 'sans-serif'
     plt.rcParams['font.sans-serif'] = 'Arial'
     plt.figure(figsize=(12, 7))
-    defenseData = df.groupby('Defense Mechanism Used')['Incident Resolution Time (in Hours)'].mean().sort_values()
+    defenseData = aggregates.groupby('Defense Mechanism Used', 'Incident Resolution Time (in Hours)', 'mean').sort_values()
     barColors = sns.color_palette("viridis", len(defenseData))
     bars = plt.bar(
         defenseData.index,
@@ -48,7 +51,7 @@ def create_defense_mechanism_visualizations():
     plt.savefig(outputDir / 'defense_mechanism_resolution_time.png', dpi=300, bbox_inches='tight')
     plt.close()
     plt.figure(figsize=(12, 7))
-    defenseFinancialData = df.groupby('Defense Mechanism Used')['Financial Loss (in Million $)'].mean().sort_values()
+    defenseFinancialData = aggregates.groupby('Defense Mechanism Used', 'Financial Loss (in Million $)', 'mean').sort_values()
     barColors = sns.color_palette("magma", len(defenseFinancialData))
     bars = plt.bar(
         defenseFinancialData.index,
@@ -78,21 +81,20 @@ def create_defense_mechanism_visualizations():
     plt.savefig(outputDir / 'defense_mechanism_financial_loss.png', dpi=300, bbox_inches='tight')
     plt.close()
     plt.figure(figsize=(12, 7))
-    defenseStats = df.groupby('Defense Mechanism Used').agg({
-        'Incident Resolution Time (in Hours)': 'mean',
-        'Financial Loss (in Million $)': 'mean'
-    }).reset_index()
-    maxResolutionTime = defenseStats['Incident Resolution Time (in Hours)'].max()
-    maxFinancialLoss = defenseStats['Financial Loss (in Million $)'].max()
-    defenseStats['NormalizedTime'] = 1 - (defenseStats['Incident Resolution Time (in Hours)'] / maxResolutionTime)
-    defenseStats['NormalizedLoss'] = 1 - (defenseStats['Financial Loss (in Million $)'] / maxFinancialLoss)
-    defenseStats['EffectivenessScore'] = (defenseStats['NormalizedTime'] * 0.5 +
-                                         defenseStats['NormalizedLoss'] * 0.5) * 100
-    defenseStats = defenseStats.sort_values('EffectivenessScore', ascending=False)
-    scoreColors = plt.cm.RdYlGn(defenseStats['EffectivenessScore']/100)
+    defenseStats = score_defenses(
+        aggregates.raw(['Defense Mechanism Used', 'Incident Resolution Time (in Hours)', 'Financial Loss (in Million $)']),
+        **resampling_options()
+    ).reset_index()
+    defenseStats = defenseStats.sort_values('Effectiveness Score', ascending=False)
+    scoreColors = plt.cm.RdYlGn(defenseStats['Effectiveness Score']/100)
+    hasIntervals = 'Score CI Lower' in defenseStats.columns
+    labelPositions = defenseStats['Score CI Upper' if hasIntervals else 'Effectiveness Score']
     bars = plt.barh(
         defenseStats['Defense Mechanism Used'],
-        defenseStats['EffectivenessScore'],
+        defenseStats['Effectiveness Score'],
+        xerr=[defenseStats['Effectiveness Score'] - defenseStats['Score CI Lower'],
+              defenseStats['Score CI Upper'] - defenseStats['Effectiveness Score']] if hasIntervals else None,
+        capsize=4 if hasIntervals else 0,
         color=scoreColors,
         edgecolor='black',
         linewidth=1,
@@ -105,7 +107,7 @@ def create_defense_mechanism_visualizations():
     for i, bar in enumerate(bars):
         width = bar.get_width()
         plt.text(
-            width + 1,
+            labelPositions.iloc[i] + 1,
             bar.get_y() + bar.get_height()/2,
             f'{width:.1f}',
             va='center',
@@ -115,7 +117,7 @@ def create_defense_mechanism_visualizations():
     plt.figtext(
         0.5,
         0.01,
-        "Higher score = Better defense mechanism (based on resolution time and financial loss)",
+        "Higher score = Better defense mechanism (based on resolution time and financial loss, bootstrap 95% CI)",
         ha='center',
         fontsize=12,
         style='italic'
@@ -124,13 +126,7 @@ def create_defense_mechanism_visualizations():
     plt.savefig(outputDir / 'defense_mechanism_ranking.png', dpi=300, bbox_inches='tight')
     plt.close()
     plt.figure(figsize=(14, 8))
-    pivotData = pd.pivot_table(
-        data=df,
-        values='Incident Resolution Time (in Hours)',
-        index='Defense Mechanism Used',
-        columns='Attack Type',
-        aggfunc='mean'
-    )
+    pivotData = aggregates.pivot('Defense Mechanism Used', 'Attack Type', 'Incident Resolution Time (in Hours)', 'mean')
     ax = sns.heatmap(
         pivotData,
         annot=True,
@@ -0,0 +1,82 @@
+import os
+import numpy as np
+import pandas as pd
+import matplotlib.pyplot as plt
+import seaborn as sns
+LARGE_SCATTER_MODES = ('density', 'sample')
+DEFAULT_POINT_THRESHOLD = 50000
+DENSITY_BINS = (400, 300)
+OUTLIER_QUANTILE = 0.001
+def scatter_options():
+    mode = os.environ.get('SCATTER_LARGE_MODE', 'density').lower()
+    if mode not in LARGE_SCATTER_MODES:
+        raise ValueError(f"Unknown large scatter mode '{mode}', expected one of {', '.join(LARGE_SCATTER_MODES)}")
+    return {'largeMode': mode, 'pointThreshold': int(os.environ.get('SCATTER_POINT_THRESHOLD', DEFAULT_POINT_THRESHOLD))}
+def hue_levels(values):
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        return list(values.cat.categories)
+    return sorted(values.dropna().unique())
+def stratified_sample(data, x, y, hue=None, maxPoints=DEFAULT_POINT_THRESHOLD, seed=0):
+    rng = np.random.default_rng(seed)
+    outlier = np.zeros(len(data), dtype=bool)
+    for col in (x, y):
+        values = data[col].to_numpy(dtype=np.float64)
+        low, high = np.nanquantile(values, [OUTLIER_QUANTILE, 1 - OUTLIER_QUANTILE])
+        outlier |= (values < low) | (values > high)
+    outlierRows = np.flatnonzero(outlier)
+    if len(outlierRows) > maxPoints // 10:
+        outlierRows = rng.choice(outlierRows, maxPoints // 10, replace=False)
+    budget = maxPoints - len(outlierRows)
+    remaining = np.flatnonzero(~outlier)
+    keys = rng.random(len(remaining))
+    if hue is None:
+        kept = remaining[np.argsort(keys)[:budget]]
+    else:
+        groups = pd.Series(keys).groupby(data[hue].to_numpy()[remaining], observed=True)
+        quotas = (groups.transform('size') * budget / len(remaining)).round().clip(lower=1)
+        kept = remaining[(groups.rank(method='first') <= quotas).to_numpy()]
+    return data.iloc[np.sort(np.concatenate([outlierRows, kept]))]
+def density_image(data, x, y, hue=None, palette=None, bins=DENSITY_BINS):
+    xValues = data[x].to_numpy(dtype=np.float64)
+    yValues = data[y].to_numpy(dtype=np.float64)
+    valid = ~(np.isnan(xValues) | np.isnan(yValues))
+    xValues, yValues = xValues[valid], yValues[valid]
+    extent = [xValues.min(), xValues.max(), yValues.min(), yValues.max()]
+    xBins = np.clip(((xValues - extent[0]) / (extent[1] - extent[0] or 1) * bins[0]).astype(np.int64), 0, bins[0] - 1)
+    yBins = np.clip(((yValues - extent[2]) / (extent[3] - extent[2] or 1) * bins[1]).astype(np.int64), 0, bins[1] - 1)
+    if hue is None:
+        levels, codes = [None], np.zeros(len(xValues), dtype=np.int64)
+    else:
+        levels = hue_levels(data[hue])
+        codes = pd.Categorical(data[hue].to_numpy()[valid], categories=levels).codes.astype(np.int64)
+    cells = bins[0] * bins[1]
+    counts = np.bincount(codes * cells + yBins * bins[0] + xBins, minlength=len(levels) * cells)
+    counts = counts.reshape(len(levels), bins[1], bins[0]).astype(np.float64)
+    colors = np.asarray(sns.color_palette(palette, len(levels)))
+    total = counts.sum(axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        rgb = np.tensordot(counts, colors, axes=(0, 0)) / total[..., None]
+        alpha = np.where(total > 0, 0.25 + 0.75 * np.log1p(total) / np.log1p(total.max()), 0.0)
+    image = np.dstack([np.nan_to_num(rgb), alpha])
+    return image, extent, levels, colors
+def large_scatter(data, x, y, hue=None, palette=None, largeMode='density', pointThreshold=DEFAULT_POINT_THRESHOLD, **kwargs):
+    if len(data) <= pointThreshold:
+        sns.scatterplot(data=data, x=x, y=y, hue=hue, palette=palette, **kwargs)
+        return None
+    ax = plt.gca()
+    if largeMode == 'sample':
+        sample = stratified_sample(data, x, y, hue, pointThreshold)
+        sns.scatterplot(data=sample, x=x, y=y, hue=hue, palette=palette, **kwargs)
+        note = f"Stratified sample: {len(sample):,} of {len(data):,} points (outliers and {hue or 'group'} shares kept)"
+    else:
+        image, extent, levels, colors = density_image(data, x, y, hue, palette)
+        ax.imshow(image, extent=extent, origin='lower', aspect='auto', interpolation='nearest')
+        if hue is not None:
+            for level, color in zip(levels, colors):
+                ax.scatter([], [], color=color, marker='s', label=str(level))
+            ax.legend(title=hue)
+        ax.set_xlabel(x)
+        ax.set_ylabel(y)
+        note = f"Density view: {len(data):,} points binned {DENSITY_BINS[0]}x{DENSITY_BINS[1]}, log-scaled opacity"
+    ax.text(0.99, 0.01, note, transform=ax.transAxes, ha='right', va='bottom', fontsize=9, alpha=0.8)
+    return largeMode
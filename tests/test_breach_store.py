@@ -0,0 +1,94 @@
+from pathlib import Path
+import numpy as np
+import pandas as pd
+import pytest
+from src.utils.breach_store import build_breach_store, store_path
+from src.utils.ingestion import read_breach_csv
+from src.utils.schema import AFFECTED_USERS, FINANCIAL_LOSS, RESOLUTION_HOURS
+SEED_PATH = Path(__file__).resolve().parents[1] / 'data' / 'RAW-cybersecurity_breach_data.csv'
+ROWS = 600
+MEASURES = [FINANCIAL_LOSS, AFFECTED_USERS, RESOLUTION_HOURS]
+GROUPINGS = [('Attack Type',), ('Year',), ('Target Industry Standardized', 'Attack Type'), ('Country', 'Defense Mechanism Used')]
+AGGREGATIONS = ['count', 'sum', 'mean', 'std', 'var', 'min', 'max', 'median']
+FILTERS = [None, {'Year': 2019}, {'Attack Type': ['Phishing', 'Ransomware']}, {'Country': 'China', 'Year': [2018, 2020, 2022]}]
+@pytest.fixture(scope='module')
+def csv_path(tmp_path_factory):
+    df = pd.read_csv(SEED_PATH, nrows=ROWS)
+    df.loc[[3, 40, 41], FINANCIAL_LOSS] = np.nan
+    df[AFFECTED_USERS] = 2_000_000_000 + np.arange(len(df)) % 7
+    path = tmp_path_factory.mktemp('store') / 'breaches.csv'
+    df.to_csv(path, index=False)
+    return path
+@pytest.fixture(scope='module')
+def frame(csv_path):
+    return read_breach_csv(csv_path)
+@pytest.fixture(scope='module')
+def store(csv_path):
+    return build_breach_store(csv_path, cacheDir=csv_path.parent / 'cache')
+def filtered(df, filters):
+    mask = pd.Series(True, index=df.index)
+    for column, value in (filters or {}).items():
+        mask &= df[column].isin(value) if isinstance(value, list) else df[column] == value
+    return df[mask]
+def two_pass(values, agg):
+    values = values.dropna().to_numpy(dtype='float64')
+    if len(values) < 2:
+        return np.nan
+    variance = ((values - values.mean()) ** 2).sum() / (len(values) - 1)
+    return variance if agg == 'var' else np.sqrt(variance)
+def expected_groupby(df, keys, measure, agg):
+    grouped = df.groupby(list(keys), observed=True)
+    if measure is None:
+        return grouped.size()
+    if agg in ('std', 'var'):
+        return grouped[measure].agg(lambda values: two_pass(values, agg))
+    return grouped[measure].agg(agg)
+def assert_same(actual, expected):
+    actual, expected = actual.sort_index(), expected.sort_index()
+    assert [tuple(map(str, np.atleast_1d(label))) for label in actual.index] == \
+           [tuple(map(str, np.atleast_1d(label))) for label in expected.index]
+    rtol = 1e-6 if np.float32 in (actual.dtype, expected.dtype) else 1e-9
+    np.testing.assert_allclose(actual.to_numpy(dtype='float64'), expected.to_numpy(dtype='float64'), rtol=rtol, atol=1e-12)
+@pytest.mark.parametrize('filters', FILTERS, ids=['all', 'year', 'attack-list', 'country-years'])
+@pytest.mark.parametrize('keys', GROUPINGS)
+def test_group_sizes_match_pandas(store, frame, filters, keys):
+    assert_same(store.aggregates(filters).groupby(keys), expected_groupby(filtered(frame, filters), keys, None, 'size'))
+@pytest.mark.parametrize('filters', FILTERS, ids=['all', 'year', 'attack-list', 'country-years'])
+@pytest.mark.parametrize('keys', GROUPINGS)
+@pytest.mark.parametrize('measure', MEASURES)
+@pytest.mark.parametrize('agg', AGGREGATIONS)
+def test_groupby_matches_pandas(store, frame, filters, keys, measure, agg):
+    actual = store.aggregates(filters).groupby(keys, measure, agg)
+    assert_same(actual, expected_groupby(filtered(frame, filters), keys, measure, agg))
+def test_variance_is_centred(store, frame):
+    actual = store.aggregates().groupby('Attack Type', AFFECTED_USERS, 'var')
+    expected = expected_groupby(frame, ('Attack Type',), AFFECTED_USERS, 'var')
+    assert (expected > 1).all() and (expected < 5).all()
+    assert_same(actual, expected)
+@pytest.mark.parametrize('agg', ['count', 'sum', 'mean', 'std', 'min', 'max', 'median'])
+def test_totals_match_pandas(store, frame, agg):
+    filters = {'Attack Type': ['Malware', 'DDoS']}
+    expected = filtered(frame, filters)[FINANCIAL_LOSS].agg(agg)
+    assert store.aggregates(filters).total(FINANCIAL_LOSS, agg) == pytest.approx(expected, rel=1e-6)
+def test_empty_filter_returns_empty_results(store):
+    aggregates = store.aggregates({'Country': 'Atlantis'})
+    assert aggregates.row_count() == 0
+    assert aggregates.groupby('Attack Type').empty
+    assert aggregates.groupby('Attack Type', FINANCIAL_LOSS, 'std').empty
+    assert np.isnan(aggregates.total(FINANCIAL_LOSS, 'mean'))
+    assert aggregates.raw([FINANCIAL_LOSS]).empty
+def test_slice_round_trips_rows(store, frame):
+    filters = {'Year': [2016, 2017]}
+    expected = filtered(frame, filters).reset_index(drop=True)
+    pd.testing.assert_frame_equal(store.slice(filters), expected, check_categorical=False)
+def test_narrowing_filters_compose(store):
+    narrowed = store.aggregates({'Year': 2019}).where({'Attack Type': 'Phishing'})
+    assert narrowed.row_count() == store.count({'Year': 2019, 'Attack Type': 'Phishing'})
+def test_unknown_filter_column_is_rejected(store):
+    with pytest.raises(ValueError):
+        store.count({'Planet': 'Mars'})
+def test_unchanged_source_reuses_store(csv_path, store, capsys):
+    built = store_path(csv_path, csv_path.parent / 'cache').stat().st_mtime_ns
+    build_breach_store(csv_path, cacheDir=csv_path.parent / 'cache')
+    assert 'Building breach store' not in capsys.readouterr().out
+    assert store_path(csv_path, csv_path.parent / 'cache').stat().st_mtime_ns == built
@@ -0,0 +1,60 @@
+import json
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import pandas as pd
+import pytest
+from src.visualization.chart_jobs import CHART_RC, MANIFEST_NAME, ChartJob, chart_job_key, run_chart_jobs, save_chart
+DATA = pd.Series([3.0, 1.0, 2.0], index=['a', 'b', 'c'], name='value')
+def render_bars(data, outputPath, color='tab:blue', dpi=50):
+    plt.figure(figsize=(2, 2))
+    plt.bar(data.index, data.values, color=color)
+    save_chart(outputPath, dpi)
+def render_bars_edited(data, outputPath, color='tab:blue', dpi=50):
+    plt.figure(figsize=(2, 2))
+    plt.barh(data.index, data.values, color=color)
+    save_chart(outputPath, dpi)
+render_bars_edited.__qualname__ = render_bars.__qualname__
+def render_fails(data, outputPath):
+    raise RuntimeError('broken chart')
+def rendered(capsys):
+    out = capsys.readouterr().out
+    return int(out.split('Rendered ')[1].split('/')[0])
+def run(tmp_path, capsys, job, force=None):
+    failures = run_chart_jobs([job], tmp_path, maxWorkers=1, force=force)
+    return failures, rendered(capsys)
+def test_unchanged_job_is_skipped(tmp_path, capsys):
+    assert run(tmp_path, capsys, ChartJob('bars.png', render_bars, DATA)) == ({}, 1)
+    firstWrite = (tmp_path / 'bars.png').stat().st_mtime_ns
+    assert run(tmp_path, capsys, ChartJob('bars.png', render_bars, DATA.copy())) == ({}, 0)
+    assert (tmp_path / 'bars.png').stat().st_mtime_ns == firstWrite
+    with open(tmp_path / MANIFEST_NAME) as f:
+        assert json.load(f) == {'bars.png': chart_job_key(ChartJob('bars.png', render_bars, DATA))}
+@pytest.mark.parametrize('changed', [
+    ChartJob('bars.png', render_bars_edited, DATA),
+    ChartJob('bars.png', render_bars, DATA, color='tab:red'),
+    ChartJob('bars.png', render_bars, DATA, CHART_RC),
+    ChartJob('bars.png', render_bars, DATA.replace(2.0, 2.5)),
+    ChartJob('bars.png', render_bars, DATA.rename({'c': 'd'})),
+    ChartJob('bars.png', render_bars, DATA, caption='Sampled')
+], ids=['code', 'params', 'rc', 'data', 'index', 'caption'])
+def test_any_change_rerenders(tmp_path, capsys, changed):
+    run(tmp_path, capsys, ChartJob('bars.png', render_bars, DATA))
+    assert run(tmp_path, capsys, changed) == ({}, 1)
+    assert run(tmp_path, capsys, changed) == ({}, 0)
+def test_missing_output_is_rerendered(tmp_path, capsys):
+    run(tmp_path, capsys, ChartJob('bars.png', render_bars, DATA))
+    (tmp_path / 'bars.png').unlink()
+    assert run(tmp_path, capsys, ChartJob('bars.png', render_bars, DATA)) == ({}, 1)
+def test_force_rerenders_unchanged_job(tmp_path, capsys):
+    run(tmp_path, capsys, ChartJob('bars.png', render_bars, DATA))
+    assert run(tmp_path, capsys, ChartJob('bars.png', render_bars, DATA), force=True) == ({}, 1)
+def test_failed_job_is_dropped_from_manifest(tmp_path, capsys):
+    run(tmp_path, capsys, ChartJob('bars.png', render_bars, DATA))
+    failures, _ = run(tmp_path, capsys, ChartJob('bars.png', render_fails, DATA))
+    assert 'broken chart' in failures['bars.png']
+    with open(tmp_path / MANIFEST_NAME) as f:
+        assert 'bars.png' not in json.load(f)
+def test_duplicate_names_are_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        run_chart_jobs([ChartJob('bars.png', render_bars, DATA), ChartJob('bars.png', render_bars_edited, DATA)], tmp_path, maxWorkers=1)
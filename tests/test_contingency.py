@@ -0,0 +1,55 @@
+from pathlib import Path
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import stats
+from src.utils.contingency import batched_chi_square, pairwise_chi_square
+from src.utils.ingestion import read_breach_csv
+DATA_PATH = Path(__file__).resolve().parents[1] / 'data' / 'RAW-cybersecurity_breach_data.csv'
+CATEGORICAL = ['Attack Type', 'Target Industry Standardized', 'Defense Mechanism Used', 'Security Vulnerability Type']
+TABLES = [
+    np.array([[12, 5], [7, 19]]),
+    np.array([[3, 1], [1, 3]]),
+    np.array([[10, 20, 30], [25, 15, 5]]),
+    np.array([[8, 2, 4, 6], [1, 9, 3, 7], [5, 5, 5, 5]])
+]
+def cramers_v(table):
+    chi2 = stats.chi2_contingency(table, correction=False).statistic
+    return np.sqrt(chi2 / table.sum() / (min(table.shape) - 1))
+def test_tables_match_scipy():
+    statistic, pValues, dof, cramersV, totals = batched_chi_square(TABLES)
+    for i, table in enumerate(TABLES):
+        expected = stats.chi2_contingency(table, correction=True)
+        assert statistic[i] == pytest.approx(expected.statistic, rel=1e-12)
+        assert pValues[i] == pytest.approx(expected.pvalue, rel=1e-9)
+        assert dof[i] == expected.dof
+        assert cramersV[i] == pytest.approx(cramers_v(table), rel=1e-12)
+        assert totals[i] == table.sum()
+def test_two_by_two_applies_yates_only():
+    table = TABLES[0]
+    statistic = batched_chi_square([table])[0][0]
+    assert statistic == pytest.approx(stats.chi2_contingency(table, correction=True).statistic, rel=1e-12)
+    assert statistic < stats.chi2_contingency(table, correction=False).statistic
+@pytest.mark.parametrize('table', [np.array([[5, 3]]), np.array([[4], [9]]), np.array([[7]])])
+def test_degenerate_tables(table):
+    expected = stats.chi2_contingency(table)
+    statistic, pValues, dof, cramersV, _ = batched_chi_square([table])
+    assert statistic[0] == expected.statistic == 0
+    assert pValues[0] == expected.pvalue == 1
+    assert dof[0] == expected.dof == 0
+    assert cramersV[0] == 0
+def test_empty_table_has_no_association():
+    statistic, pValues, dof, cramersV, totals = batched_chi_square([np.zeros((0, 0))])
+    assert (statistic[0], pValues[0], dof[0], cramersV[0], totals[0]) == (0, 1, 0, 0, 0)
+def test_pairwise_matches_scipy_crosstabs():
+    df = read_breach_csv(DATA_PATH, usecols=CATEGORICAL)
+    results = pairwise_chi_square(df, CATEGORICAL)
+    assert len(results) == len(CATEGORICAL) * (len(CATEGORICAL) - 1) // 2
+    for _, row in results.iterrows():
+        table = pd.crosstab(df[row['Variable 1']], df[row['Variable 2']]).to_numpy()
+        expected = stats.chi2_contingency(table)
+        assert row['Chi-Square'] == pytest.approx(expected.statistic, rel=1e-9)
+        assert row['p-value'] == pytest.approx(expected.pvalue, rel=1e-6)
+        assert row['Degrees of Freedom'] == expected.dof
+        assert row["Cramér's V"] == pytest.approx(cramers_v(table), rel=1e-9)
+        assert row['Observations'] == table.sum()
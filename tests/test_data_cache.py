@@ -0,0 +1,84 @@
+import json
+import os
+from pathlib import Path
+import pandas as pd
+import pytest
+from src.utils import data_cache
+from src.utils.data_cache import cache_paths, load_breach_data, read_cached_frame, write_cached_frame
+from src.utils.ingestion import read_breach_csv
+from src.utils.schema import AFFECTED_USERS, BREACH_SCHEMA, FINANCIAL_LOSS, RESOLUTION_HOURS
+SEED_PATH = Path(__file__).resolve().parents[1] / 'data' / 'RAW-cybersecurity_breach_data.csv'
+ROWS = 300
+SUBSETS = [
+    ['Attack Type', FINANCIAL_LOSS],
+    ['Year', 'Resolution Time Category', AFFECTED_USERS],
+    ['Detection Time Category', RESOLUTION_HOURS, 'Country']
+]
+pytestmark = pytest.mark.skipif(data_cache.feather is None, reason='pyarrow is not installed')
+@pytest.fixture
+def csv_path(tmp_path):
+    path = tmp_path / 'breaches.csv'
+    pd.read_csv(SEED_PATH, nrows=ROWS).to_csv(path, index=False)
+    return path
+def cache_dir(csv_path):
+    return csv_path.parent / data_cache.CACHE_DIR_NAME
+def cached_meta(csv_path):
+    with open(cache_paths(csv_path, cache_dir(csv_path))[1]) as f:
+        return json.load(f)
+def assert_typed(df, columns):
+    assert list(df.columns) == list(columns)
+    for col in columns:
+        expected = BREACH_SCHEMA[col]
+        if expected == 'category':
+            assert isinstance(df[col].dtype, pd.CategoricalDtype), col
+        else:
+            assert df[col].dtype == expected, col
+def rewrite(csv_path, change):
+    modified = os.stat(csv_path).st_mtime_ns + 10 ** 9
+    change(pd.read_csv(csv_path)).to_csv(csv_path, index=False)
+    os.utime(csv_path, ns=(modified, modified))
+def raise_losses(df):
+    return df.assign(**{FINANCIAL_LOSS: df[FINANCIAL_LOSS] + 1})
+def drop_last_rows(df):
+    return df.iloc[:-5]
+def test_cache_round_trips_frame(csv_path):
+    expected = read_breach_csv(csv_path)
+    assert write_cached_frame(csv_path, expected, cache_dir(csv_path))
+    pd.testing.assert_frame_equal(read_cached_frame(csv_path, cache_dir(csv_path)), expected)
+@pytest.mark.parametrize('change', [raise_losses, drop_last_rows])
+def test_changed_source_invalidates_cache(csv_path, change):
+    load_breach_data(csv_path)
+    before = cached_meta(csv_path)
+    rewrite(csv_path, change)
+    stat = os.stat(csv_path)
+    assert (stat.st_size, stat.st_mtime_ns) != (before['size'], before['mtime'])
+    assert read_cached_frame(csv_path, cache_dir(csv_path)) is None
+    pd.testing.assert_frame_equal(load_breach_data(csv_path), read_breach_csv(csv_path))
+    assert cached_meta(csv_path)['sha256'] != before['sha256']
+def test_touched_source_reuses_cache(csv_path):
+    expected = load_breach_data(csv_path)
+    before = cached_meta(csv_path)
+    os.utime(csv_path, ns=(before['mtime'] + 10 ** 9, before['mtime'] + 10 ** 9))
+    pd.testing.assert_frame_equal(read_cached_frame(csv_path, cache_dir(csv_path)), expected)
+    assert cached_meta(csv_path) == dict(before, mtime=before['mtime'] + 10 ** 9)
+def test_schema_change_invalidates_cache(csv_path, monkeypatch):
+    load_breach_data(csv_path)
+    monkeypatch.setattr(data_cache, 'schema_version', lambda: 'changed')
+    assert read_cached_frame(csv_path, cache_dir(csv_path)) is None
+@pytest.mark.parametrize('columns', SUBSETS, ids=['loss', 'users', 'hours'])
+def test_column_subset_is_typed(csv_path, columns):
+    first = load_breach_data(csv_path, columns=columns)
+    assert_typed(first, columns)
+    assert_typed(read_cached_frame(csv_path, cache_dir(csv_path), columns), columns)
+    assert_typed(load_breach_data(csv_path, columns=columns), columns)
+    pd.testing.assert_frame_equal(first, read_breach_csv(csv_path)[columns])
+def test_column_subsets_accumulate_in_cache(csv_path):
+    for columns in SUBSETS:
+        load_breach_data(csv_path, columns=columns)
+    full = read_breach_csv(csv_path)
+    for columns in SUBSETS:
+        cached = read_cached_frame(csv_path, cache_dir(csv_path), columns)
+        assert_typed(cached, columns)
+        pd.testing.assert_frame_equal(cached, full[columns])
+    assert read_cached_frame(csv_path, cache_dir(csv_path)) is None
+    assert read_cached_frame(csv_path, cache_dir(csv_path), ['Country', 'Organization Size']) is None
@@ -0,0 +1,71 @@
+from pathlib import Path
+import numpy as np
+import pandas as pd
+import pytest
+from src.utils.aggregation import AggregationCache
+from src.utils.dataframe_backend import DATAFRAME_ENGINES, DataFrameEngine, available_engines, create_engine
+from src.utils.ingestion import read_breach_csv
+from src.utils.parallel_aggregation import create_aggregation_cache
+DATA_PATH = Path(__file__).resolve().parents[1] / 'data' / 'RAW-cybersecurity_breach_data.csv'
+GROUPINGS = [
+    ('Attack Type',),
+    ('Year',),
+    ('Resolution Time Category',),
+    ('Target Industry Standardized', 'Attack Type'),
+    ('Year', 'Security Vulnerability Type')
+]
+AGGREGATIONS = [
+    (None, 'size'),
+    ('Financial Loss (in Million $)', 'mean'),
+    ('Financial Loss (in Million $)', 'std'),
+    ('Financial Loss (in Million $)', 'sum'),
+    ('Number of Affected Users', 'min'),
+    ('Number of Affected Users', 'max'),
+    ('Incident Resolution Time (in Hours)', 'median'),
+    ('Incident Resolution Time (in Hours)', 'count')
+]
+ENGINES = [pytest.param(name, marks=pytest.mark.skipif(name not in available_engines(), reason=f'{name} is not installed'))
+           for name in DATAFRAME_ENGINES]
+@pytest.fixture(scope='module')
+def breach_data():
+    return read_breach_csv(DATA_PATH)
+@pytest.fixture(scope='module')
+def numeric_columns(breach_data):
+    return breach_data.select_dtypes(include=[np.number]).columns.tolist()
+@pytest.fixture(scope='module')
+def reference(breach_data):
+    return AggregationCache(breach_data)
+@pytest.fixture(scope='module', params=ENGINES)
+def candidate(request, breach_data):
+    return AggregationCache(breach_data, engine=create_engine(breach_data, request.param))
+def assert_matches(actual, expected):
+    if isinstance(expected, pd.Series):
+        pd.testing.assert_series_equal(actual, expected, rtol=1e-6, check_index_type=False)
+    else:
+        pd.testing.assert_frame_equal(actual, expected, rtol=1e-6, check_index_type=False)
+@pytest.mark.parametrize('keys', GROUPINGS)
+@pytest.mark.parametrize('measure, agg', AGGREGATIONS)
+def test_groupby_matches_pandas(candidate, reference, keys, measure, agg):
+    assert_matches(candidate.groupby(keys, measure, agg), reference.groupby(keys, measure, agg))
+def test_crosstab_matches_pandas(candidate, reference):
+    assert_matches(candidate.crosstab('Target Industry Standardized', 'Attack Type'),
+                   reference.crosstab('Target Industry Standardized', 'Attack Type'))
+def test_pivot_matches_pandas(candidate, reference):
+    assert_matches(candidate.pivot('Year', 'Attack Type', 'Financial Loss (in Million $)', 'mean'),
+                   reference.pivot('Year', 'Attack Type', 'Financial Loss (in Million $)', 'mean'))
+def test_value_counts_matches_pandas(candidate, reference):
+    assert_matches(candidate.value_counts('Country'), reference.value_counts('Country'))
+def test_describe_matches_pandas(candidate, reference, numeric_columns):
+    assert_matches(candidate.describe(numeric_columns), reference.describe(numeric_columns))
+def test_corr_matches_pandas(candidate, reference, numeric_columns):
+    assert_matches(candidate.corr(numeric_columns), reference.corr(numeric_columns))
+def test_unknown_engine_is_rejected(breach_data):
+    with pytest.raises(ValueError):
+        create_engine(breach_data, 'spark')
+def test_engine_base_class_is_abstract():
+    with pytest.raises(TypeError):
+        DataFrameEngine(None)
+@pytest.mark.parametrize('name', ENGINES[1:])
+def test_cube_backend_rejects_engine(breach_data, name):
+    with pytest.raises(ValueError):
+        create_aggregation_cache(breach_data, backend='cube', engine=name)
@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import stats
+from src.analysis.defense_scoring import normalize_lower_better, score_defenses
+from src.utils.schema import FINANCIAL_LOSS, RESOLUTION_HOURS
+VALUES = np.array([4.0, 2.0, 2.0, 8.0, 5.0, 1.0, 3.0])
+SEGMENT_STARTS = np.array([0, 4, 5])
+def test_max_scales_by_segment_maximum():
+    expected = [0.5, 0.75, 0.75, 0.0, 0.0, 2 / 3, 0.0]
+    np.testing.assert_allclose(normalize_lower_better(VALUES, SEGMENT_STARTS, 'max'), expected)
+def test_minmax_scales_by_segment_span():
+    expected = [2 / 3, 1.0, 1.0, 0.0, 0.5, 1.0, 0.0]
+    np.testing.assert_allclose(normalize_lower_better(VALUES, SEGMENT_STARTS, 'minmax'), expected)
+def test_rank_averages_ties():
+    expected = [1 - 2 / 3, 1 - 0.5 / 3, 1 - 0.5 / 3, 0.0, 1.0, 1.0, 0.0]
+    np.testing.assert_allclose(normalize_lower_better(VALUES, SEGMENT_STARTS, 'rank'), expected)
+def test_rank_of_all_ties_is_neutral():
+    np.testing.assert_allclose(normalize_lower_better(np.array([3.0, 3.0, 3.0]), np.array([0]), 'rank'), [0.5, 0.5, 0.5])
+def test_zscore_uses_sample_standard_deviation():
+    first = VALUES[:4]
+    spread = np.sqrt(((first - 4.0) ** 2).sum() / 3)
+    expected = np.r_[stats.norm.cdf(-(first - 4.0) / spread), 0.5, stats.norm.cdf([1 / np.sqrt(2), -1 / np.sqrt(2)])]
+    np.testing.assert_allclose(normalize_lower_better(VALUES, SEGMENT_STARTS, 'zscore'), expected)
+    assert spread == pytest.approx(np.std(first, ddof=1))
+def test_strategies_apply_per_resample_row():
+    samples = np.vstack([VALUES, VALUES[::-1]])
+    for strategy in ('max', 'minmax', 'rank', 'zscore'):
+        result = normalize_lower_better(samples, SEGMENT_STARTS, strategy)
+        np.testing.assert_allclose(result[0], normalize_lower_better(VALUES, SEGMENT_STARTS, strategy))
+        np.testing.assert_allclose(result[1], normalize_lower_better(VALUES[::-1], SEGMENT_STARTS, strategy))
+def test_unknown_strategy_is_rejected():
+    with pytest.raises(ValueError):
+        normalize_lower_better(VALUES, SEGMENT_STARTS, 'percentile')
+def test_tied_defenses_share_rank_score():
+    df = pd.DataFrame({
+        'Defense Mechanism Used': ['A', 'A', 'B', 'B', 'C', 'C'],
+        RESOLUTION_HOURS: [10.0, 20.0, 15.0, 15.0, 40.0, 40.0],
+        FINANCIAL_LOSS: [1.0, 3.0, 2.0, 2.0, 9.0, 9.0]
+    })
+    scores = score_defenses(df, normalization='rank')
+    assert scores.loc['A', 'Effectiveness Score'] == scores.loc['B', 'Effectiveness Score'] == 75.0
+    assert scores.loc['C', 'Effectiveness Score'] == 0.0
+    assert scores['Rank'].tolist() == [1, 1, 3]
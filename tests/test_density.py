@@ -0,0 +1,71 @@
+from pathlib import Path
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import integrate, stats
+from src.utils.density import ViolinGeometry, binned_kde, grouped_histograms, sorted_quantiles
+from src.utils.grouped_stats import GroupedStatistics, factorize_keys
+from src.utils.ingestion import read_breach_csv
+DATA_PATH = Path(__file__).resolve().parents[1] / 'data' / 'RAW-cybersecurity_breach_data.csv'
+rng = np.random.default_rng(7)
+SAMPLE = np.r_[rng.normal(0, 1, 500), rng.normal(5, 2, 300)]
+SAMPLE_IDS = np.repeat([0, 1], [500, 300])
+@pytest.fixture(scope='module')
+def facets():
+    df = read_breach_csv(DATA_PATH, usecols=['Attack Source', 'Security Vulnerability Type', 'Financial Loss (in Million $)'])
+    rowCodes, rowLabels = factorize_keys(df['Security Vulnerability Type'])
+    colCodes, colLabels = factorize_keys(df['Attack Source'])
+    facetIds = pd.Series(rowCodes * len(colLabels) + colCodes)
+    return GroupedStatistics(facetIds, df['Financial Loss (in Million $)'])
+def group_ids(groupedStats):
+    return np.repeat(np.arange(len(groupedStats.counts)), groupedStats.counts)
+def group_values(groupedStats, group):
+    start = groupedStats.starts[group]
+    return groupedStats.sortedValues[start:start + groupedStats.counts[group]]
+@pytest.mark.parametrize('bins', [1, 7, 20])
+def test_facet_histograms_match_numpy(facets, bins):
+    table = facets.table
+    edges, counts = grouped_histograms(facets.sortedValues, group_ids(facets), table['min'].to_numpy(), table['max'].to_numpy(), bins)
+    for group in range(len(table)):
+        expected, expectedEdges = np.histogram(group_values(facets, group), bins, range=(table['min'].iloc[group], table['max'].iloc[group]))
+        np.testing.assert_array_equal(counts[group], expected)
+        np.testing.assert_allclose(edges[group], expectedEdges, rtol=1e-12)
+    assert counts.sum() == len(facets.sortedValues)
+def test_histograms_widen_constant_groups():
+    values = np.array([3.0, 3.0, 3.0, 1.0, 2.0])
+    edges, counts = grouped_histograms(values, np.array([0, 0, 0, 1, 1]), np.array([3.0, 1.0]), np.array([3.0, 2.0]), 4)
+    np.testing.assert_array_equal(counts[0], np.histogram(values[:3], 4, range=(2.5, 3.5))[0])
+    np.testing.assert_array_equal(counts[1], np.histogram(values[3:], 4, range=(1.0, 2.0))[0])
+    np.testing.assert_allclose(edges[0], [2.5, 2.75, 3.0, 3.25, 3.5])
+def test_facet_kde_keeps_the_mass_inside_the_data_range(facets):
+    table = facets.table
+    support, density = binned_kde(facets.sortedValues, group_ids(facets), facets.counts, table['std'].to_numpy(),
+                                  table['min'].to_numpy(), table['max'].to_numpy())
+    for group in range(len(table)):
+        reference = stats.gaussian_kde(group_values(facets, group))
+        expected = reference.integrate_box_1d(support[group, 0], support[group, -1])
+        assert integrate.trapezoid(density[group], support[group]) == pytest.approx(expected, abs=0.01)
+def test_kde_of_single_row_or_constant_group_is_undefined():
+    values = np.array([1.0, 4.0, 4.0, 4.0])
+    _, density = binned_kde(values, np.array([0, 1, 1, 1]), np.array([1, 3]), np.array([np.nan, 0.0]), np.array([1.0, 4.0]), np.array([1.0, 4.0]))
+    assert np.isnan(density).all()
+def sample_kde(**kwargs):
+    groups = [SAMPLE[SAMPLE_IDS == group] for group in (0, 1)]
+    stds = np.array([np.std(group, ddof=1) for group in groups])
+    lower, upper = np.array([group.min() for group in groups]), np.array([group.max() for group in groups])
+    return groups, binned_kde(SAMPLE, SAMPLE_IDS, np.array([500, 300]), stds, lower, upper, **kwargs)
+@pytest.mark.parametrize('bandwidth', ['scott', 'silverman', 0.3])
+def test_kde_integrates_to_one_and_matches_scipy(bandwidth):
+    groups, (support, density) = sample_kde(cut=3, bandwidth=bandwidth)
+    for group, values in enumerate(groups):
+        expected = stats.gaussian_kde(values, bw_method=bandwidth)(support[group])
+        assert integrate.trapezoid(density[group], support[group]) == pytest.approx(1, abs=1e-3)
+        np.testing.assert_allclose(density[group], expected, atol=0.01 * expected.max())
+def test_unknown_bandwidth_is_rejected():
+    with pytest.raises(ValueError):
+        sample_kde(bandwidth='widest')
+def test_violin_quartiles_match_numpy(facets):
+    violins = ViolinGeometry(facets)
+    for group in range(len(facets.counts)):
+        np.testing.assert_allclose(violins.quartiles[group], np.quantile(group_values(facets, group), [0.25, 0.5, 0.75]))
+    np.testing.assert_allclose(sorted_quantiles(facets, [0, 1]), facets.table[['min', 'max']].to_numpy())
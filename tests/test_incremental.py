@@ -0,0 +1,124 @@
+from pathlib import Path
+import numpy as np
+import pandas as pd
+import pytest
+from src.utils.incremental import MEASURES, TRACKED_KEYS, SKETCH_KEYS, AggregateStore, store_path, update_aggregate_store
+from src.utils.ingestion import read_breach_csv
+from src.utils.quantile_sketch import DEFAULT_RELATIVE_ACCURACY, QuantileSketch
+SEED_PATH = Path(__file__).resolve().parents[1] / 'data' / 'RAW-cybersecurity_breach_data.csv'
+FIRST_ROWS = 2000
+AGGREGATIONS = ('size', 'count', 'sum', 'mean', 'std', 'min', 'max')
+@pytest.fixture(scope='module')
+def seed_lines():
+    with open(SEED_PATH, 'rb') as f:
+        return f.read().splitlines(keepends=True)
+def write_lines(path, lines):
+    with open(path, 'wb') as f:
+        f.writelines(lines)
+def append_lines(path, lines):
+    with open(path, 'ab') as f:
+        f.writelines(lines)
+def expected_groupby(df, keys, measure, agg):
+    frame = df.assign(**{measure: df[measure].astype('float64')})
+    if not keys:
+        frame = frame.assign(__all__='All')
+        keys = ('__all__',)
+    grouped = frame.groupby(list(keys), observed=True)
+    return (grouped.size() if agg == 'size' else grouped[measure].agg(agg)).sort_index()
+def assert_store_matches(store, df):
+    for keys in TRACKED_KEYS:
+        for measure in MEASURES:
+            for agg in AGGREGATIONS:
+                expected = expected_groupby(df, keys, measure, agg)
+                actual = store.groupby(keys, None if agg == 'size' else measure, agg)
+                np.testing.assert_allclose(actual.to_numpy(dtype='float64'), expected.to_numpy(dtype='float64'), rtol=1e-9,
+                                           err_msg=f'{keys} {measure} {agg}')
+                assert [tuple(map(str, label)) if isinstance(label, tuple) else str(label) for label in actual.index] == \
+                       [tuple(map(str, label)) if isinstance(label, tuple) else str(label) for label in expected.index]
+def test_appended_rows_are_folded(tmp_path, seed_lines):
+    dataPath = tmp_path / 'breaches.csv'
+    write_lines(dataPath, seed_lines[:FIRST_ROWS + 1])
+    store = update_aggregate_store(dataPath, cacheDir=tmp_path / 'cache')
+    assert store.rows == FIRST_ROWS
+    append_lines(dataPath, seed_lines[FIRST_ROWS + 1:])
+    store = update_aggregate_store(dataPath, cacheDir=tmp_path / 'cache')
+    assert store.rows == len(seed_lines) - 1
+    assert store.offset == dataPath.stat().st_size
+    assert_store_matches(store, read_breach_csv(dataPath))
+def test_unchanged_file_folds_nothing(tmp_path, seed_lines, capsys):
+    dataPath = tmp_path / 'breaches.csv'
+    write_lines(dataPath, seed_lines)
+    first = update_aggregate_store(dataPath, cacheDir=tmp_path / 'cache')
+    capsys.readouterr()
+    second = update_aggregate_store(dataPath, cacheDir=tmp_path / 'cache')
+    assert 'Rebuilding aggregate store' not in capsys.readouterr().out
+    assert second.rows == first.rows == len(seed_lines) - 1
+    assert second.fingerprint() == first.fingerprint()
+def test_partial_trailing_line_waits_for_newline(tmp_path, seed_lines):
+    dataPath = tmp_path / 'breaches.csv'
+    write_lines(dataPath, seed_lines[:FIRST_ROWS + 1])
+    update_aggregate_store(dataPath, cacheDir=tmp_path / 'cache')
+    partial = seed_lines[FIRST_ROWS + 1]
+    append_lines(dataPath, [partial[:20]])
+    assert update_aggregate_store(dataPath, cacheDir=tmp_path / 'cache').rows == FIRST_ROWS
+    append_lines(dataPath, [partial[20:]] + seed_lines[FIRST_ROWS + 2:])
+    store = update_aggregate_store(dataPath, cacheDir=tmp_path / 'cache')
+    assert store.rows == len(seed_lines) - 1
+    assert_store_matches(store, read_breach_csv(dataPath))
+def test_rewritten_file_forces_rebuild(tmp_path, seed_lines, capsys):
+    dataPath = tmp_path / 'breaches.csv'
+    write_lines(dataPath, seed_lines[:FIRST_ROWS + 1])
+    update_aggregate_store(dataPath, cacheDir=tmp_path / 'cache')
+    write_lines(dataPath, seed_lines[:1] + seed_lines[2:FIRST_ROWS + 1] + seed_lines[1:2] + seed_lines[FIRST_ROWS + 1:FIRST_ROWS + 101])
+    capsys.readouterr()
+    store = update_aggregate_store(dataPath, cacheDir=tmp_path / 'cache')
+    assert 'Rebuilding aggregate store' in capsys.readouterr().out
+    assert store.rows == FIRST_ROWS + 100
+    assert_store_matches(store, read_breach_csv(dataPath))
+def test_truncated_file_forces_rebuild(tmp_path, seed_lines, capsys):
+    dataPath = tmp_path / 'breaches.csv'
+    write_lines(dataPath, seed_lines)
+    update_aggregate_store(dataPath, cacheDir=tmp_path / 'cache')
+    write_lines(dataPath, seed_lines[:FIRST_ROWS + 1])
+    capsys.readouterr()
+    store = update_aggregate_store(dataPath, cacheDir=tmp_path / 'cache')
+    assert 'Rebuilding aggregate store' in capsys.readouterr().out
+    assert store.rows == FIRST_ROWS
+    assert_store_matches(store, read_breach_csv(dataPath))
+def test_store_round_trips_through_json(tmp_path, seed_lines):
+    dataPath = tmp_path / 'breaches.csv'
+    write_lines(dataPath, seed_lines)
+    store = update_aggregate_store(dataPath, cacheDir=tmp_path / 'cache')
+    loaded = AggregateStore.load(store_path(dataPath, tmp_path / 'cache'))
+    assert loaded.fingerprint() == store.fingerprint()
+    assert_store_matches(loaded, read_breach_csv(dataPath))
+def test_sketch_medians_stay_within_relative_accuracy(tmp_path, seed_lines):
+    dataPath = tmp_path / 'breaches.csv'
+    write_lines(dataPath, seed_lines[:FIRST_ROWS + 1])
+    update_aggregate_store(dataPath, cacheDir=tmp_path / 'cache')
+    append_lines(dataPath, seed_lines[FIRST_ROWS + 1:])
+    store = update_aggregate_store(dataPath, cacheDir=tmp_path / 'cache')
+    df = read_breach_csv(dataPath)
+    for keys in SKETCH_KEYS:
+        for measure in MEASURES:
+            expected = expected_groupby(df, keys, measure, 'median').to_numpy(dtype='float64')
+            actual = store.groupby(keys, measure, 'median').to_numpy(dtype='float64')
+            assert np.all(np.abs(actual - expected) <= DEFAULT_RELATIVE_ACCURACY * np.abs(expected) + 1e-12), (keys, measure)
+@pytest.mark.parametrize('relativeAccuracy', [0.01, 0.05])
+def test_sketch_quantiles_stay_within_relative_accuracy(relativeAccuracy):
+    values = np.random.default_rng(0).lognormal(3, 1.5, 20001)
+    sketch = QuantileSketch(relativeAccuracy)
+    for chunk in np.array_split(values, 7):
+        sketch.merge(QuantileSketch(relativeAccuracy).add(chunk))
+    assert sketch.count == len(values)
+    for q in (0.01, 0.25, 0.5, 0.75, 0.99):
+        expected = np.quantile(values, q)
+        assert abs(sketch.quantile(q) - expected) <= relativeAccuracy * expected
+def test_sketch_counts_zeros_and_skips_missing():
+    sketch = QuantileSketch().add([0, 0, np.nan, 5, 10])
+    assert sketch.count == 4
+    assert sketch.quantile(0) == 0
+    assert np.isnan(QuantileSketch().quantile(0.5))
+def test_sketches_with_different_accuracy_do_not_merge():
+    with pytest.raises(ValueError):
+        QuantileSketch(0.01).merge(QuantileSketch(0.02))
@@ -0,0 +1,76 @@
+from pathlib import Path
+import numpy as np
+import pandas as pd
+import pytest
+from src.utils.aggregation import AggregationCache
+from src.utils.ingestion import read_breach_csv
+from src.utils.olap_cube import CUBE_AGGREGATIONS, CUBE_MEASURES, BreachCube, CubeAggregates
+from src.utils.parallel_aggregation import create_aggregation_cache
+DATA_PATH = Path(__file__).resolve().parents[1] / 'data' / 'RAW-cybersecurity_breach_data.csv'
+ROLLUPS = [('Year',), ('Attack Type',), ('Target Industry Standardized', 'Attack Type'), ('Country', 'Year', 'Defense Mechanism Used')]
+DICES = [{'Year': 2019}, {'Attack Type': ['Phishing', 'Malware'], 'Country': ['China', 'USA', 'India']}, {'Country': 'Atlantis'}]
+@pytest.fixture(scope='module')
+def breach_data():
+    df = read_breach_csv(DATA_PATH)
+    df.loc[df.index[[2, 50]], 'Financial Loss (in Million $)'] = np.nan
+    return df
+@pytest.fixture(scope='module')
+def cube(breach_data):
+    return CubeAggregates(breach_data)
+def expected_groupby(df, keys, measure, agg):
+    grouped = df.groupby(list(keys), observed=True)
+    if measure is None:
+        return grouped.size()
+    return df[measure].astype('float64').groupby([df[key] for key in keys], observed=True).agg(agg)
+def assert_same(actual, expected):
+    actual, expected = actual.sort_index(), expected.sort_index()
+    assert list(map(str, actual.index)) == list(map(str, expected.index))
+    rtol = 1e-6 if actual.dtype == np.float32 else 1e-9
+    np.testing.assert_allclose(actual.to_numpy(dtype='float64'), expected.to_numpy(dtype='float64'), rtol=rtol, atol=1e-9)
+def filtered(df, filters):
+    mask = np.ones(len(df), dtype=bool)
+    for dim, value in filters.items():
+        mask &= df[dim].isin(value if isinstance(value, list) else [value]).to_numpy()
+    return df[mask]
+@pytest.mark.parametrize('keys', ROLLUPS)
+@pytest.mark.parametrize('measure', CUBE_MEASURES)
+@pytest.mark.parametrize('agg', CUBE_AGGREGATIONS)
+def test_rollup_matches_pandas(cube, breach_data, keys, measure, agg):
+    assert_same(cube.groupby(keys, measure, agg), expected_groupby(breach_data, keys, measure, agg))
+@pytest.mark.parametrize('keys', ROLLUPS)
+def test_rollup_sizes_match_pandas(cube, breach_data, keys):
+    pd.testing.assert_series_equal(cube.groupby(keys).sort_index(), AggregationCache(breach_data).groupby(keys).sort_index(),
+                                   check_index_type=False)
+@pytest.mark.parametrize('agg', CUBE_AGGREGATIONS)
+def test_grand_total_matches_pandas(cube, breach_data, agg):
+    measure = 'Financial Loss (in Million $)'
+    assert cube.total(measure, agg) == pytest.approx(breach_data[measure].astype('float64').agg(agg), rel=1e-6)
+@pytest.mark.parametrize('agg', ['size', 'mean', 'std', 'max'])
+def test_slice_matches_pandas(cube, breach_data, agg):
+    measure = None if agg == 'size' else 'Incident Resolution Time (in Hours)'
+    sliced = cube.slice('Target Industry Standardized', breach_data['Target Industry Standardized'].iloc[0])
+    expected = filtered(breach_data, {'Target Industry Standardized': breach_data['Target Industry Standardized'].iloc[0]})
+    assert_same(sliced.groupby(('Attack Type', 'Year'), measure, agg), expected_groupby(expected, ('Attack Type', 'Year'), measure, agg))
+@pytest.mark.parametrize('filters', DICES, ids=['year', 'attack-country', 'empty'])
+@pytest.mark.parametrize('measure, agg', [(None, 'size'), ('Financial Loss (in Million $)', 'mean'), ('Number of Affected Users', 'var'),
+                                          ('Financial Loss (in Million $)', 'min')])
+def test_dice_matches_pandas(cube, breach_data, filters, measure, agg):
+    diced = cube.dice(filters)
+    expected = filtered(breach_data, filters)
+    assert_same(diced.groupby('Security Vulnerability Type', measure, agg), expected_groupby(expected, ('Security Vulnerability Type',), measure, agg))
+def test_dice_falls_back_to_rows_for_uncovered_aggregations(cube, breach_data):
+    filters = {'Year': [2020, 2021]}
+    expected = filtered(breach_data, filters)
+    actual = cube.dice(filters).groupby('Attack Type', 'Financial Loss (in Million $)', 'median')
+    assert_same(actual, expected_groupby(expected, ('Attack Type',), 'Financial Loss (in Million $)', 'median'))
+def test_unknown_dimension_is_rejected(breach_data):
+    with pytest.raises(ValueError):
+        BreachCube.build(breach_data).dice({'Planet': 'Mars'})
+def test_engine_flag_selects_cube(breach_data, monkeypatch):
+    monkeypatch.delenv('AGGREGATION_BACKEND', raising=False)
+    monkeypatch.delenv('DATAFRAME_ENGINE', raising=False)
+    assert isinstance(create_aggregation_cache(breach_data, engine='cube'), CubeAggregates)
+    monkeypatch.setenv('DATAFRAME_ENGINE', 'cube')
+    assert isinstance(create_aggregation_cache(breach_data), CubeAggregates)
+    monkeypatch.setenv('DATAFRAME_ENGINE', 'pandas')
+    assert not isinstance(create_aggregation_cache(breach_data), CubeAggregates)
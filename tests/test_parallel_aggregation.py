@@ -0,0 +1,56 @@
+from pathlib import Path
+import numpy as np
+import pandas as pd
+import pytest
+from src.utils.aggregation import AggregationCache
+from src.utils.ingestion import read_breach_csv
+from src.utils.parallel_aggregation import ParallelAggregationCache
+DATA_PATH = Path(__file__).resolve().parents[1] / 'data' / 'RAW-cybersecurity_breach_data.csv'
+MEASURES = ['Financial Loss (in Million $)', 'Number of Affected Users', 'Incident Resolution Time (in Hours)']
+GROUPINGS = [('Attack Type',), ('Year',), ('Target Industry Standardized', 'Attack Type'), ('Late Group',), ('Late Group', 'Attack Type')]
+AGGREGATIONS = ['count', 'sum', 'mean', 'std', 'var', 'min', 'max']
+@pytest.fixture(scope='module')
+def breach_data():
+    df = read_breach_csv(DATA_PATH)
+    lateGroup = np.where(np.arange(len(df)) < len(df) - 3, 'Early', 'Late')
+    df['Late Group'] = pd.Categorical(lateGroup)
+    df.loc[df.index[5], 'Financial Loss (in Million $)'] = np.nan
+    return df
+@pytest.fixture(scope='module')
+def caches(breach_data):
+    parallel = ParallelAggregationCache(breach_data, maxWorkers=2, minRows=0)
+    yield AggregationCache(breach_data), AggregationCache(breach_data.astype({measure: 'float64' for measure in MEASURES})), parallel
+    parallel.close()
+def test_late_group_only_appears_in_last_partition(caches, breach_data):
+    parallel = caches[-1]
+    (_, firstStop), (lastStart, _) = parallel.partitions()
+    late = np.flatnonzero(breach_data['Late Group'] == 'Late')
+    assert late.min() >= lastStart and firstStop == lastStart
+@pytest.mark.parametrize('keys', GROUPINGS)
+@pytest.mark.parametrize('measure', MEASURES)
+@pytest.mark.parametrize('agg', AGGREGATIONS)
+def test_parallel_groupby_matches_pandas(caches, keys, measure, agg):
+    inProcess, reference, parallel = caches
+    assert parallel.parallel_supports(keys, measure, agg)
+    expected = reference.groupby(keys, measure, agg).sort_index()
+    actual = parallel.groupby(keys, measure, agg).sort_index()
+    assert actual.dtype == inProcess.groupby(keys, measure, agg).dtype
+    rtol = 1e-12 if actual.dtype == 'float64' else np.finfo(actual.dtype).eps if actual.dtype.kind == 'f' else 0
+    pd.testing.assert_series_equal(actual, expected, check_dtype=False, check_index_type=False, rtol=rtol, atol=0)
+@pytest.mark.parametrize('keys', GROUPINGS)
+def test_parallel_size_matches_pandas(caches, keys):
+    inProcess, _, parallel = caches
+    pd.testing.assert_series_equal(parallel.groupby(keys).sort_index(), inProcess.groupby(keys).sort_index(), check_index_type=False)
+def test_single_row_group_has_no_spread(breach_data):
+    df = breach_data.iloc[:10].copy()
+    df['Late Group'] = pd.Categorical(['Early'] * 9 + ['Late'])
+    parallel = ParallelAggregationCache(df, maxWorkers=2, minRows=0)
+    try:
+        std = parallel.groupby(('Late Group',), 'Number of Affected Users', 'std')
+        assert np.isnan(std['Late']) and not np.isnan(std['Early'])
+    finally:
+        parallel.close()
+def test_small_frames_stay_in_process(breach_data):
+    parallel = ParallelAggregationCache(breach_data, maxWorkers=2)
+    assert not parallel.parallel_supports(('Attack Type',), 'Financial Loss (in Million $)', 'mean')
+    assert parallel._pool is None
@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import stats
+from src.utils.grouped_stats import GroupedStatistics
+from src.utils.resampling import (MAX_GROUP_DRAWS, bootstrap_group_means, bootstrap_mean_samples, permutation_anova, resampling_options,
+                                  run_chunks, bootstrap_chunk, subsample_note)
+@pytest.fixture(scope='module')
+def groups():
+    rng = np.random.default_rng(1)
+    return [rng.normal(10, 3, 40), rng.normal(11, 3, 55), rng.normal(12.5, 3, 35)]
+@pytest.fixture(scope='module')
+def large_sample():
+    rng = np.random.default_rng(2)
+    return pd.DataFrame({'Group': np.repeat(['A', 'B'], [20000, 8000]),
+                         'Value': np.concatenate([rng.normal(50, 10, 20000), rng.exponential(5, 8000)])})
+def normal_interval(values, confidence=0.95):
+    z = stats.norm.ppf(0.5 + confidence / 2)
+    halfWidth = z * np.std(values, ddof=1) / np.sqrt(len(values))
+    return np.mean(values) - halfWidth, np.mean(values) + halfWidth
+def test_permutation_f_matches_scipy(groups):
+    fValue, _, rows = permutation_anova(groups, resamples=10)
+    assert fValue == pytest.approx(stats.f_oneway(*groups).statistic, rel=1e-12)
+    assert rows == sum(len(group) for group in groups)
+def test_permutation_p_value_tracks_f_distribution(groups):
+    _, pValue, _ = permutation_anova(groups, resamples=20000, seed=3)
+    assert pValue == pytest.approx(stats.f_oneway(*groups).pvalue, abs=0.01)
+def test_capped_permutation_tests_the_subsample(groups):
+    fValue, pValue, rows = permutation_anova(groups, resamples=2000, seed=4, maxGroupDraws=30)
+    assert rows == 90
+    rng = np.random.default_rng(4)
+    subsample = [rng.choice(group, 30, replace=False) for group in groups]
+    assert fValue == pytest.approx(stats.f_oneway(*subsample).statistic, rel=1e-12)
+    assert 1 / 2001 <= pValue <= 1
+@pytest.mark.parametrize('maxGroupDraws', [None, 2000])
+def test_bootstrap_interval_matches_normal_theory(large_sample, maxGroupDraws):
+    groupedStats = GroupedStatistics(large_sample['Group'], large_sample['Value'])
+    intervals = bootstrap_group_means(groupedStats, resamples=4000, seed=5, maxGroupDraws=maxGroupDraws)
+    for label, values in large_sample.groupby('Group')['Value']:
+        lower, upper = normal_interval(values.to_numpy())
+        width = upper - lower
+        assert intervals.loc[label, 'mean'] == pytest.approx(values.mean(), rel=1e-12)
+        assert intervals.loc[label, 'ci_lower'] == pytest.approx(lower, abs=0.1 * width)
+        assert intervals.loc[label, 'ci_upper'] == pytest.approx(upper, abs=0.1 * width)
+def test_bootstrap_reports_draws_per_group(large_sample):
+    groupedStats = GroupedStatistics(large_sample['Group'], large_sample['Value'])
+    capped = bootstrap_group_means(groupedStats, resamples=10, maxGroupDraws=10000)
+    assert capped['count'].tolist() == [20000, 8000]
+    assert capped['draws'].tolist() == [10000, 8000]
+    assert subsample_note(capped['draws'], capped['count']).startswith('Approximate: 1 of 2 groups')
+    exact = bootstrap_group_means(groupedStats, resamples=10)
+    assert (exact['draws'] == exact['count']).all()
+    assert subsample_note(exact['draws'], exact['count']) is None
+def test_bootstrap_samples_are_reproducible():
+    values = np.arange(10, dtype=np.float64)
+    starts, counts = np.array([0, 4]), np.array([4, 6])
+    first = bootstrap_mean_samples(values, starts, counts, resamples=50, seed=7)
+    second = bootstrap_mean_samples(values, starts, counts, resamples=50, seed=7)
+    np.testing.assert_array_equal(first, second)
+    assert first.shape == (50, 2)
+    assert first[:, 0].min() >= 0 and first[:, 0].max() <= 3
+def test_run_chunks_requires_resamples():
+    values = np.arange(4, dtype=np.float64)
+    with pytest.raises(ValueError):
+        run_chunks(bootstrap_chunk, (values, np.array([0]), np.array([4]), np.array([4])), 0, 0, 1)
+def test_resampling_options_read_environment(monkeypatch):
+    monkeypatch.delenv('RESAMPLE_COUNT', raising=False)
+    monkeypatch.delenv('RESAMPLE_MAX_GROUP_DRAWS', raising=False)
+    assert resampling_options() == {'resamples': 0, 'seed': 0, 'maxWorkers': 1, 'maxGroupDraws': MAX_GROUP_DRAWS}
+    monkeypatch.setenv('RESAMPLE_COUNT', '500')
+    monkeypatch.setenv('RESAMPLE_MAX_GROUP_DRAWS', '0')
+    options = resampling_options()
+    assert options['resamples'] == 500 and options['maxGroupDraws'] is None
+    assert resampling_options(10, 300)['maxGroupDraws'] == 300
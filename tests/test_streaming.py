@@ -0,0 +1,86 @@
+from pathlib import Path
+import numpy as np
+import pandas as pd
+import pytest
+from src.analysis.enhanced_analysis import build_correlation_jobs, build_vulnerability_jobs
+from src.utils.ingestion import read_breach_csv
+from src.utils.schema import NUMERIC_COLUMNS
+from src.utils.streaming import CoMoments, RowSampler, SamplingPolicy, stream_breach_aggregates
+DATA_PATH = Path(__file__).resolve().parents[1] / 'data' / 'RAW-cybersecurity_breach_data.csv'
+@pytest.fixture(scope='module')
+def breach_data():
+    return read_breach_csv(DATA_PATH)
+@pytest.fixture(scope='module')
+def streamed():
+    return stream_breach_aggregates(DATA_PATH, chunkSize=700, policy=SamplingPolicy(500))
+def sample_rows(df, policy, chunkSize):
+    sampler = RowSampler(policy)
+    for start in range(0, len(df), chunkSize):
+        sampler.add(df.iloc[start:start + chunkSize])
+    return sampler.result()
+def test_policy_rejects_bad_configuration():
+    with pytest.raises(ValueError):
+        SamplingPolicy(strategy='reservoir')
+    with pytest.raises(ValueError):
+        SamplingPolicy(strategy='stratified')
+def test_policy_reads_environment(monkeypatch):
+    monkeypatch.setenv('RAW_SAMPLE_ROWS', '250')
+    monkeypatch.setenv('RAW_SAMPLE_STRATEGY', 'stratified')
+    monkeypatch.setenv('RAW_SAMPLE_STRATIFY', 'Attack Type')
+    monkeypatch.setenv('RAW_SAMPLE_SEED', '3')
+    policy = SamplingPolicy.from_env()
+    assert (policy.maxRows, policy.strategy, policy.stratifyBy, policy.seed) == (250, 'stratified', 'Attack Type', 3)
+    assert policy.describe() == 'stratified by Attack Type, up to 250 rows'
+def test_uniform_sample_is_a_subset_in_file_order(breach_data):
+    sample = sample_rows(breach_data, SamplingPolicy(400, seed=1), 700)
+    assert len(sample) == 400
+    assert list(sample.columns) == list(breach_data.columns)
+    assert (sample.dtypes == breach_data.dtypes).all()
+    merged = sample.merge(breach_data.reset_index(), how='left', on=list(breach_data.columns))
+    assert merged['index'].notna().all() and merged['index'].is_monotonic_increasing
+def test_uniform_sample_does_not_depend_on_chunk_size(breach_data):
+    policy = SamplingPolicy(300, seed=2)
+    pd.testing.assert_frame_equal(sample_rows(breach_data, policy, 250), sample_rows(breach_data, policy, 3000))
+def test_small_input_is_kept_whole(breach_data):
+    sample = sample_rows(breach_data.iloc[:50], SamplingPolicy(100), 20)
+    pd.testing.assert_frame_equal(sample, breach_data.iloc[:50].reset_index(drop=True))
+def test_stratified_sample_keeps_stratum_shares(breach_data):
+    df = breach_data.copy()
+    df['Stratum'] = pd.Categorical(np.where(np.arange(len(df)) % 10 == 0, 'Rare', 'Common'))
+    df.loc[df.index[7], 'Stratum'] = 'Rare'
+    sample = sample_rows(df, SamplingPolicy(200, 'stratified', 'Stratum'), 500)
+    shares = df['Stratum'].value_counts() / len(df)
+    counts = sample['Stratum'].value_counts()
+    for stratum, share in shares.items():
+        assert counts[stratum] == max(1, round(share * 200))
+def test_streamed_store_matches_pandas(streamed, breach_data):
+    assert streamed.row_count() == len(breach_data)
+    expected = breach_data['Financial Loss (in Million $)'].astype('float64').groupby(breach_data['Attack Type'], observed=True).mean()
+    actual = streamed.groupby('Attack Type', 'Financial Loss (in Million $)', 'mean')
+    np.testing.assert_allclose(actual.sort_index().to_numpy(), expected.sort_index().to_numpy(dtype='float64'), rtol=1e-9)
+def test_streamed_correlation_uses_every_row(streamed, breach_data):
+    expected = breach_data[NUMERIC_COLUMNS].astype('float64').corr()
+    pd.testing.assert_frame_equal(streamed.corr(NUMERIC_COLUMNS), expected, rtol=1e-9, atol=1e-12)
+def test_co_moments_match_pairwise_pandas_correlation():
+    rng = np.random.default_rng(4)
+    df = pd.DataFrame(rng.normal(size=(1000, 3)) @ np.array([[1, 0.5, 0], [0, 1, 0.3], [0, 0, 1]]), columns=['a', 'b', 'c'])
+    df.loc[rng.choice(1000, 80, replace=False), 'a'] = np.nan
+    df.loc[rng.choice(1000, 40, replace=False), 'c'] = np.nan
+    df['constant'] = 1.0
+    moments = CoMoments(df.columns)
+    for chunk in np.array_split(np.arange(len(df)), 7):
+        moments.fold(df.iloc[chunk])
+    pd.testing.assert_frame_equal(moments.corr(), df.corr(), rtol=1e-9, atol=1e-12)
+    pd.testing.assert_frame_equal(moments.corr(['c', 'a']), df[['c', 'a']].corr(), rtol=1e-9, atol=1e-12)
+def test_sampled_charts_are_captioned(streamed):
+    caption = streamed.sample_caption()
+    assert caption == 'Sampled: 500 of 3,000 rows (uniform, up to 500 rows)'
+    jobs = {job.fileName: job for job in build_vulnerability_jobs(aggregates=streamed) + build_correlation_jobs(aggregates=streamed)}
+    assert jobs['correlation_matrix.png'].caption is None
+    assert jobs['vulnerability_distribution.png'].caption is None
+    for fileName in ['defense_mechanism_effectiveness.png', 'resolution_vs_loss_hexbin.png', 'loss_by_source_vulnerability.png',
+                     'users_vs_resolution.png']:
+        assert jobs[fileName].caption == caption
+        assert len(jobs[fileName].data) == 500
+def test_whole_file_sample_is_not_captioned():
+    assert stream_breach_aggregates(DATA_PATH, chunkSize=1000, policy=SamplingPolicy(5000)).sample_caption() is None
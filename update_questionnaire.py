@@ -1,6 +1,9 @@
+import argparse
 from fpdf import FPDF
 import os
 from datetime import datetime
+from src.utils.instrumentation import stage
+from src.utils.profiling import PROFILE_MODES, enable_profiling, profile_mode_default
 
 class PDF(FPDF):
     def header(self):
@@ -51,7 +54,7 @@ class PDF(FPDF):
             self.cell(0, 7, "_" * 90, 0, 1)
         self.ln(3)
 
-def generate_cybersecurity_questionnaire():
+def build_questionnaire_pdf():
     # Initialize PDF
     pdf = PDF()
     pdf.set_auto_page_break(auto=True, margin=15)
@@ -252,15 +255,26 @@ def generate_cybersecurity_questionnaire():
     pdf.create_question("Signature:")
     pdf.create_text_field(1)
     
+    return pdf
+
+def generate_cybersecurity_questionnaire(profile=None):
+    # Profile the build and save stages separately when --profile is given
+    profiler = enable_profiling(os.path.join('docs', 'profiles'), profile)
+    with stage('build_pdf', 'pipeline'):
+        pdf = build_questionnaire_pdf()
+    
     # Save the PDF
     docsPath = os.path.join(os.getcwd(), 'docs')
     if not os.path.exists(docsPath):
         os.makedirs(docsPath)
     
     pdfPath = os.path.join(docsPath, 'questionnaire.pdf')
-    pdf.output(pdfPath)
+    with stage('pdf_output', 'pipeline'):
+        pdf.output(pdfPath)
     
     print(f"Updated questionnaire created: {pdfPath}")
+    if profiler is not None:
+        profiler.print_report()
     
     # Move script to trash-bin after execution
     script_path = os.path.realpath(__file__)
@@ -286,4 +300,8 @@ def generate_cybersecurity_questionnaire():
         print(f"Note: Could not move script to trash-bin: {e}")
 
 if __name__ == "__main__":
-    generate_cybersecurity_questionnaire()
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--profile', nargs='?', const='cprofile', choices=PROFILE_MODES, default=profile_mode_default(),
+                        help='Profile each top-level stage with cProfile (default) or a low-overhead sampler; writes .prof and collapsed-stack files (default: PROFILE_MODE)')
+    args = parser.parse_args()
+    generate_cybersecurity_questionnaire(profile=args.profile)